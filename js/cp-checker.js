@@ -38,9 +38,11 @@ export function initializeCpChecker() {
     }
 
     // ---- CP 反查 IV：由 CP（可選 HP）反推所有可能的等級與 IV 組合 --------------
-    // 遊戲內寶可夢常在半等級（Lv X.5），整數等級 CPM 用官方公式內插出半等級：
+    // 遊戲內寶可夢常在半等級（Lv X.5）。半等級 CPM 由 refresh_cp_data.py 預先算好放在 CP_MULTIPLIER_HALF；
+    // 資料檔還是舊版（沒有這張表）時，才用官方公式從整數等級內插：
     // cpm(L+0.5) = √((cpm(L)² + cpm(L+1)²) / 2)
     const FULL_CPM = (() => {
+        if (typeof CP_MULTIPLIER_HALF !== 'undefined') return CP_MULTIPLIER_HALF.map((m, i) => ({ lv: 1 + i / 2, m }));
         if (!CPM) return [];
         const out = [];
         for (let i = 0; i < CPM.length; i++) {
@@ -55,12 +57,56 @@ export function initializeCpChecker() {
     function hpAtM(p, m, s) {
         return Math.max(10, Math.floor((p.sta + s) * m));
     }
+    // 反查索引（scripts/cp_reverse.py build 產生的 data/cp-reverse/）：有給 CP 時只看該 CP 那一段 IV，
+    // 不必把 101 個等級 × 4096 種 IV 全掃一遍。沒有索引檔、或瀏覽器沒有 DecompressionStream 時照舊逐一計算。
+    let RV_FILES;               // undefined = 還沒讀；null = 沒有可用的索引
+    const RV_INDEX = new Map();  // 檔名 → 解開的索引
+    async function loadReverseIndex(p) {
+        if (typeof DecompressionStream === 'undefined' || RV_FILES === null) return;
+        try {
+            if (RV_FILES === undefined) {
+                const r = await fetch('data/cp-reverse/index.json');
+                const j = r.ok ? await r.json() : null;
+                RV_FILES = j && j.levels === FULL_CPM.length ? j.files : null;   // 等級數不同代表 CPM 表版本不一致
+            }
+            const key = RV_FILES && RV_FILES[p.name];
+            if (!key || RV_INDEX.has(key)) return;
+            const r = await fetch(`data/cp-reverse/${key}.bin`);
+            if (!r.ok) return;
+            const buf = await new Response(r.body.pipeThrough(new DecompressionStream('deflate'))).arrayBuffer();
+            const maxCp = new DataView(buf).getUint32(0, true);
+            const off = new Uint32Array(buf, 4, maxCp + 2), base = 4 + 4 * (maxCp + 2), n = off[maxCp + 1];
+            RV_INDEX.set(key, { maxCp, off, hi: new Uint8Array(buf, base, n), lo: new Uint8Array(buf, base + n, n) });
+        } catch (e) {
+            if (RV_FILES === undefined) RV_FILES = null;
+        }
+    }
     // f：{cp, hp, a, d, s, lv} 每個可為 null（不限）。至少要有一個條件。
     function reverseIV(p, f) {
         const res = [];
         const aLo = f.a != null ? f.a : 0, aHi = f.a != null ? f.a : 15;
         const dLo = f.d != null ? f.d : 0, dHi = f.d != null ? f.d : 15;
         const sLo = f.s != null ? f.s : 0, sHi = f.s != null ? f.s : 15;
+        const idx = f.cp != null && RV_FILES && RV_INDEX.get(RV_FILES[p.name]);
+        if (idx) {
+            if (f.cp > idx.maxCp) return res;
+            const start = idx.off[f.cp], end = idx.off[f.cp + 1];
+            for (let j = start, iv = 0; j < end; j++) {
+                iv = (j === start ? 0 : iv) + idx.hi[j] * 256 + idx.lo[j];   // 同一個 CP 內存的是 IV index 的差值
+                const a = iv >> 8, d = (iv >> 4) & 15, s = iv & 15;
+                if (a < aLo || a > aHi || d < dLo || d > dHi || s < sLo || s > sHi) continue;
+                // 低等級 CP 被 10 擋住時，同一個 IV 會有好幾個等級都是這個 CP；CP 隨等級遞增，超過就可以停
+                for (const { lv, m } of FULL_CPM) {
+                    const cp = cpAtM(p, m, a, d, s);
+                    if (cp > f.cp) break;
+                    if (cp !== f.cp || (f.lv != null && lv !== f.lv)) continue;
+                    if (f.hp != null && hpAtM(p, m, s) !== f.hp) continue;
+                    res.push({ lv, a, d, s, cp, hp: hpAtM(p, m, s), pct: (a + d + s) / 45 });
+                }
+            }
+            res.sort((x, y) => x.lv - y.lv || y.pct - x.pct);
+            return res;
+        }
         for (const { lv, m } of FULL_CPM) {
             if (f.lv != null && lv !== f.lv) continue;
             for (let a = aLo; a <= aHi; a++)
@@ -146,6 +192,7 @@ export function initializeCpChecker() {
         const title = document.getElementById('cpReverseTitle'), box = document.getElementById('cpReverseResult');
         if (currentMon) {
             sec.hidden = false;
+            loadReverseIndex(currentMon);   // 先在背景載入反查索引，載到之前照舊逐一計算
             if (title) title.textContent = currentMon.name + ' CP 反查 IV 組合';
             // 換寶可夢時，若已填任何條件就即時重算
             const anyVal = RV_FIELDS.some(id => { const el = document.getElementById(id); return el && el.value; });
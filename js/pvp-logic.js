@@ -1,6 +1,8 @@
 // js/pvp-logic.js
 // --- Start of cpm.js content ---
-const CPMs = [
+// 優先用 data/precomputed_pokemon_cp.js 的 CP_MULTIPLIER_HALF（refresh_cp_data.py 由 GAME_MASTER 產生），
+// 跟 CP 查詢器共用同一張表；下面寫死的只在資料檔還是舊版時當後備。
+const CPMs = (typeof CP_MULTIPLIER_HALF !== 'undefined') ? CP_MULTIPLIER_HALF : [
   0.0939999967813491, 0.135137430784308, 0.166397869586944, 0.192650914456886,
   0.215732470154762, 0.236572655026622, 0.255720049142837, 0.273530381100769,
   0.29024988412857, 0.306057381335773, 0.321087598800659, 0.335445032295077,
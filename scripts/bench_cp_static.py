@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""build_cp_static.py 每頁產生時間的小型 benchmark:高 IV 對照表的新舊寫法對照。
+
+「舊」是原本的 build_iv_table():每頁算完整的 51 等級 × 16³ CP 方塊,再用 Python 迴圈列舉、
+排序 4096 種 IV、重組表頭;「新」是目前的版本(列、排序基準、表頭只算一次,每頁只算 CP/HP 格子)。
+兩者輸出會先逐頁比對,確定一字不差才計時。
+
+用法:python scripts/bench_cp_static.py [--pages N] [--repeat N]
+"""
+import argparse, sys, time
+
+import numpy as np
+
+import build_cp_static as B
+from cp_engine import cp_grid, hp_iv
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+
+def legacy_iv_table(p):
+    """改寫前的 build_iv_table()(連同當時每頁都要算的完整 CP 方塊),只留在這裡當比較基準。"""
+    st = (p["atk"], p["def"], p["sta"])
+    cube, hp = cp_grid(st, B.CPM), hp_iv(st, B.CPM, np.arange(16))
+    combos = []
+    for a in range(15, -1, -1):
+        for d in range(15, -1, -1):
+            for s in range(15, -1, -1):
+                tot = a + d + s
+                if tot >= B.IV_MIN_SUM:
+                    combos.append((tot, a, d, s, int(cube[39, a, d, s])))
+    combos.sort(key=lambda c: (-c[0], -c[4]))
+    body = ""
+    for tot, a, d, s, _ in combos:
+        pct = tot / 45 * 100
+        cells = "".join(f'<td>{cube[L - 1, a, d, s]}</td><td class="hp">{hp[L - 1, s]}</td>' for L in B.IV_TABLE_LEVELS)
+        ivc = (f'<td class="iv v{a}">{a}</td><td class="iv v{d}">{d}</td><td class="iv v{s}">{s}</td>')
+        hundo = ' class="hundo"' if tot == 45 else ''
+        body += f'<tr{hundo}><td class="pct">{pct:.2f}%</td>{ivc}{cells}</tr>'
+    heads1 = "".join(f'<th colspan="2">L{L}</th>' for L in B.IV_TABLE_LEVELS)
+    heads2 = "".join('<th>CP</th><th>HP</th>' for _ in B.IV_TABLE_LEVELS)
+    return (f'<table class="iv"><thead>'
+            f'<tr><th rowspan="2">IV%</th><th colspan="3">個體值 攻/防/耐</th>{heads1}</tr>'
+            f'<tr><th>攻</th><th>防</th><th>耐</th>{heads2}</tr>'
+            f'</thead><tbody>{body}</tbody></table>')
+
+
+def per_page(fn, rows, repeat):
+    """fn 對每一列跑一次的平均時間(毫秒/頁),取 repeat 次裡最快的一次。"""
+    best = float("inf")
+    for _ in range(repeat):
+        B._diag.cache_clear()
+        t = time.perf_counter()
+        for p in rows:
+            fn(p)
+        best = min(best, time.perf_counter() - t)
+    return best / len(rows) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=200, help="取 CP_DATA 前幾隻(預設 200)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    names = [n for n, p in B.CP_DATA.items() if p.get("atk") is not None][:args.pages]
+    rows = [B.CP_DATA[n] for n in names]
+    diff = [n for n in names if legacy_iv_table(B.CP_DATA[n]) != B.build_iv_table(B.CP_DATA[n])]
+    if diff:
+        sys.exit(f"新舊輸出不同:{'、'.join(diff[:10])}")
+
+    old = per_page(legacy_iv_table, rows, args.repeat)
+    new = per_page(B.build_iv_table, rows, args.repeat)
+    page_new = per_page(lambda p: B.build(p["name"]), rows, args.repeat)
+    B.build_iv_table, current = legacy_iv_table, B.build_iv_table   # build() 換回舊的 IV 表再量一次
+    try:
+        page_old = per_page(lambda p: B.build(p["name"]), rows, args.repeat)
+    finally:
+        B.build_iv_table = current
+    print(f"{len(rows)} 頁,輸出一致")
+    print(f"  IV 對照表    舊 {old:6.3f} ms/頁 → 新 {new:6.3f} ms/頁  ({old / new:.1f}×)")
+    print(f"  整頁 build() 舊 {page_old:6.3f} ms/頁 → 新 {page_new:6.3f} ms/頁  ({page_old / page_new:.1f}×)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""official_translate() 的小型 benchmark:句型模板逐一比對(舊)與 _TemplateIndex(新)對照。
+
+語料是 data/special_research.json 裡的全部字串(標題、步驟、任務、獎勵),再加上每個模板代入數字的句子。
+前者大多是已經翻好的中文或 LeekDuck/Serebii 的專有名詞 —— 正好是查不到、舊寫法要把上千個模板全部試完的情況;
+後者是一定配得上模板的句子。兩種寫法的輸出會先逐句比對,確定一字不差才計時。
+
+官方文本用 build_official_translation_db() 載入(經 http_cache,第一次要網路)。
+
+另外比對 translate_item_resource() 的字典後援:舊的每次排序 + 逐一 startswith 與 _item_prefix_re() 的最長前綴。
+語料是 data/research.json 的道具獎勵(LeekDuck 圖檔名就是英文道具名,加上數量)再加上字典每個鍵的變化,不需要官方文本。
+
+用法:python scripts/bench_translate.py [--repeat N]
+"""
+import argparse, json, os, re, sys, time
+
+import translator as T
+import translation_db as S
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS = os.path.join(ROOT, "data", "special_research.json")
+ITEM_CORPUS = os.path.join(ROOT, "data", "research.json")
+
+
+def legacy_official_translate(text):
+    """改寫前的 official_translate():查不到精確對照就把全部模板依序 re.match 一次,只留在這裡當比較基準。"""
+    if not text:
+        return None
+    t = S._normalize_text(text)
+    hit = S._OFFICIAL["exact"].get(t.lower())
+    if hit:
+        return hit
+    lk = re.sub(r"[^a-z0-9]", "", t.lower())
+    if len(lk) >= 8:
+        hit = S._OFFICIAL["loose"].get(lk) \
+            or (S._OFFICIAL["loose"].get(lk[:-1]) if lk.endswith("s") else S._OFFICIAL["loose"].get(lk + "s"))
+        if hit:
+            return hit
+    for pattern, zh_tmpl, placeholders, _, _ in S._OFFICIAL["templates"]:
+        m = S._template_re(pattern).match(t)
+        if m:
+            out = zh_tmpl
+            for i, n in enumerate(placeholders):
+                val = m.group(i + 1)
+                val = S._OFFICIAL["exact"].get(S._normalize_text(val).lower(), val)
+                out = out.replace("{%s}" % n, val)
+            return out
+    return None
+
+
+def legacy_item_key(eng_name, general_map):
+    """改寫前 translate_item_resource() 的字典後援:每次把鍵依長度排序再逐一 startswith,回傳配到的鍵。"""
+    for item_key in sorted(general_map.keys(), key=len, reverse=True):
+        if eng_name.startswith(item_key):
+            return item_key
+    return None
+
+
+def item_key(eng_name, general_map):
+    m = T._item_prefix_re(general_map).match(eng_name)
+    return m.group() if m else None
+
+
+def item_corpus(path=ITEM_CORPUS, general_map=T.GENERAL_TRANSLATIONS):
+    """research.json 的道具獎勵還原成英文(圖檔名 + 數量),再加上每個字典鍵的完整、帶數量、少一字、多一字版本。"""
+    out = {}
+    with open(path, encoding="utf-8") as f:
+        for cat in json.load(f):
+            for task in cat["tasks"]:
+                for r in task["rewards"]:
+                    if r.get("type") == "item" and r.get("imageUrl"):
+                        name = os.path.splitext(os.path.basename(r["imageUrl"]))[0]
+                        out.setdefault(f"{name} {r.get('quantity') or ''}".strip(), None)
+    for k in general_map:
+        for s in (k, f"{k} ×5", k[:-1], k + "s", k.lower()):
+            out.setdefault(s, None)
+    return list(out)
+
+
+def corpus_strings(path=CORPUS):
+    """special_research.json 裡所有顯示用的字串(不含網址),去重後依出現順序。"""
+    out = {}
+
+    def walk(x, key=None):
+        if isinstance(x, dict):
+            for k, v in x.items():
+                walk(v, k)
+        elif isinstance(x, list):
+            for v in x:
+                walk(v, key)
+        elif isinstance(x, str) and x and not (key or "").endswith(("url", "urls")):
+            out.setdefault(x, None)
+
+    with open(path, encoding="utf-8") as f:
+        walk(json.load(f))
+    return list(out)
+
+
+def per_string(fn, strings, repeat):
+    """fn 對每個字串跑一次的平均時間(微秒/句),取 repeat 次裡最快的一次。"""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for s in strings:
+            fn(s)
+        best = min(best, time.perf_counter() - t)
+    return best / len(strings) * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    items = item_corpus()
+    diff = [s for s in items if legacy_item_key(s, T.GENERAL_TRANSLATIONS) != item_key(s, T.GENERAL_TRANSLATIONS)]
+    if diff:
+        sys.exit(f"道具字典後援:新舊結果不同:{diff[:5]}")
+    old = per_string(lambda s: legacy_item_key(s, T.GENERAL_TRANSLATIONS), items, args.repeat)
+    new = per_string(lambda s: item_key(s, T.GENERAL_TRANSLATIONS), items, args.repeat)
+    print(f"道具字典後援:{len(items)} 句,結果一致(字典 {len(T.GENERAL_TRANSLATIONS)} 個鍵)")
+    print(f"  排序 + 逐一 startswith {old:8.1f} µs/句 → 前綴正則 {new:8.1f} µs/句  ({old / new:.1f}×)")
+
+    S.build_official_translation_db()
+    if not S._OFFICIAL["templates"]:
+        sys.exit("官方文本沒有載入(需要網路,或 http_cache 裡已有副本)")
+    misses = corpus_strings()
+    hits = [re.sub(r"\{\d+\}", "5", t[4]) for t in S._OFFICIAL["templates"]]
+    for label, strings in (("special_research.json", misses), ("模板代入數字", hits)):
+        diff = [s for s in strings if legacy_official_translate(s) != S.official_translate(s)]
+        if diff:
+            sys.exit(f"{label}:新舊輸出不同:{diff[:5]}")
+        cands = sum(len(S._OFFICIAL["index"].candidates(S._normalize_text(s))) for s in strings) / len(strings)
+        old = per_string(legacy_official_translate, strings, args.repeat)
+        new = per_string(S.official_translate, strings, args.repeat)
+        print(f"{label}:{len(strings)} 句,輸出一致;每句平均試 {cands:.1f} 個模板"
+              f"(全部 {len(S._OFFICIAL['templates'])} 個)")
+        print(f"  逐一比對 {old:8.1f} µs/句 → 索引 {new:8.1f} µs/句  ({old / new:.1f}×)")
+
+
+if __name__ == "__main__":
+    main()
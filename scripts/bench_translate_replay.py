@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""翻譯管線的吞吐量 benchmark：固定語料 × 固定官方文本，重播一遍量每個翻譯函式的速度與快取命中率。
+
+bench_translate.py 只比較單一函式的新舊寫法；這裡量的是四支爬蟲實際走的整條路（官方對照 → 組合規則 →
+手動字典 → translation_cache），換 commit 再跑一次就看得出哪裡變慢。要比得起來，兩個輸入都要固定：
+
+  語料  scripts/translation_bench_corpus.json（進版控）。--freeze 從 repo 裡的資料重建：
+        LeekDuck 的寶可夢英文名（raids.json）、道具圖檔名（research.json）、手動字典的鍵，
+        以及 special_research.json —— 還是英文的標題 / 獎勵原樣收錄，已經翻成中文的獎勵與日期
+        用手動字典反查、依 Serebii 的寫法還原成英文（「{名} 遭遇」→「{Name} Encounter」、
+        「2024年3月5日 - 12日」→「March 5th - 12th 2024」）。
+  官方文本  --pin 把 build_official_translation_db() 的快照複製一份到 PINNED，之後只讀這份，
+        不連網、不會因為上游文字更新而換掉；格式版本（translation_db.DB_VERSION）變了要重新 pin。
+
+每個函式逐句計時（perf_counter_ns），報告 句/秒、p50、p99。有記憶層的函式（translation_cache.memoize）量三輪：
+  冷  空的快取，每句都實際翻譯
+  磁碟  冷的結果存檔後清掉記憶體，再讀回來（= 下一次執行爬蟲的情況）
+  熱  行程內 LRU 命中（= 同一次執行裡重複出現的字串）
+快取另用暫存檔，不動 CACHE_DIR 裡真正的 translations.json。
+
+    python scripts/bench_translate_replay.py --freeze            # 重建語料（資料更新後）
+    python scripts/bench_translate_replay.py --pin               # 固定目前的官方文本（要網路或 http_cache）
+    python scripts/bench_translate_replay.py [--repeat N] [--json out.json] [--compare base.json]
+"""
+import argparse, hashlib, json, os, re, shutil, subprocess, sys, tempfile, time
+
+import translation_cache
+import translation_db as S
+import translator as T
+import scrape_special_research as SR
+from data_snapshot import CACHE_DIR
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS = os.path.join(ROOT, "scripts", "translation_bench_corpus.json")
+PINNED = os.path.join(CACHE_DIR, "bench", "translation_db.pickle")
+CORPUS_VERSION = 1
+
+_CJK = re.compile(r"[㐀-鿿]")
+_QTY = re.compile(r"^(.*?) \* ([\d,]+)$")
+MONTH_EN = ["January", "February", "March", "April", "May", "June",
+            "July", "August", "September", "October", "November", "December"]
+
+
+def _read(rel):
+    with open(os.path.join(ROOT, rel), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _inverse(m):
+    """中文 → 英文（同一個中文有好幾個英文時取第一個）。"""
+    out = {}
+    for en, zh in m.items():
+        out.setdefault(zh, en)
+    return out
+
+
+def _ordinal(d):
+    d = int(d)
+    return f"{d}{'th' if 10 <= d % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(d % 10, 'th')}"
+
+
+def _date_en(zh, i):
+    """special_research.json 的中文日期 → Serebii 的英文寫法；單雙數交錯帶序數尾，兩種輸入都量到。"""
+    day = _ordinal if i % 2 else str
+    mon = lambda m: MONTH_EN[int(m) - 1]
+    m = re.fullmatch(r"(\d{4})年(\d+)月(\d+)日 - (\d{4})年(\d+)月(\d+)日", zh)
+    if m:
+        return f"{mon(m[2])} {day(m[3])} {m[1]} - {mon(m[5])} {day(m[6])} {m[4]}"
+    m = re.fullmatch(r"(\d{4})年(\d+)月(\d+)日 - (\d+)月(\d+)日", zh)
+    if m:
+        return f"{mon(m[2])} {day(m[3])} - {mon(m[4])} {day(m[5])} {m[1]}"
+    m = re.fullmatch(r"(\d{4})年(\d+)月(\d+)日 - (\d+)日", zh)
+    if m:
+        return f"{mon(m[2])} {day(m[3])} - {day(m[4])} {m[1]}"
+    m = re.fullmatch(r"(\d{4})年(\d+)月(\d+)日", zh)
+    if m:
+        return f"{mon(m[2])} {day(m[3])} {m[1]}"
+    m = re.fullmatch(r"(\d{4})年(\d+)月", zh)
+    if m:
+        return f"{mon(m[2])} {m[1]}"
+    return None if _CJK.search(zh) else zh
+
+
+def _reward_en(zh, names, items, manual):
+    """中文獎勵 → Serebii 的英文寫法；還原不了回傳 None。英文的（"500 XP"、沒翻到的）原樣回傳。"""
+    if not _CJK.search(zh):
+        return zh
+    if zh in manual:
+        return manual[zh]
+    m = _QTY.match(zh)
+    body, qty = (m[1], m[2]) if m else (zh, None)
+    en = None
+    m = re.fullmatch(r"(.+) 遭遇", body)
+    if m and m[1] in names:
+        en = f"{names[m[1]]} Encounter"
+    m = re.fullmatch(r"(.+) 的糖果(XL)?", body)
+    if m and m[1] in names:
+        en = f"{names[m[1]]} {'XL ' if m[2] else ''}Candy"
+    if body in items:
+        en = items[body]
+    if en is None:
+        return None
+    return f"{en} * {qty}" if qty else en
+
+
+def freeze(path=CORPUS):
+    """從 repo 裡的資料重建語料（見模組說明），依出現順序去重。"""
+    pokemon_map = _read("data/pokemon_translation_map.json")
+    task_map = _read("scripts/task_translation_map.json")
+    names, items, manual = _inverse(pokemon_map), _inverse(T.GENERAL_TRANSLATIONS), _inverse(task_map)
+    out = {k: {} for k in ("name", "item", "task", "reward", "release_date")}
+
+    for boss in _read("data/raids.json")["bosses"]:
+        out["name"].setdefault(boss["englishName"], None)
+    for en in pokemon_map:
+        out["name"].setdefault(en, None)
+    for cat in _read("data/research.json"):
+        for task in cat["tasks"]:
+            for r in task["rewards"]:
+                if r.get("type") == "item" and r.get("imageUrl"):
+                    name = os.path.splitext(os.path.basename(r["imageUrl"]))[0]
+                    out["item"].setdefault(f"{name} {r.get('quantity') or ''}".strip(), None)
+    for en in task_map:
+        out["task"].setdefault(en, None)
+
+    skipped = 0
+    for i, e in enumerate(_read("data/special_research.json")):
+        en = _date_en(e.get("release_date", ""), i)
+        if en:
+            out["release_date"].setdefault(en, None)
+        if e.get("title") and not _CJK.search(e["title"]):
+            out["task"].setdefault(e["title"], None)
+        for step in e["steps"]:
+            rewards = [t["reward"]["text"] for t in step["tasks"]] + [r["text"] for r in step["total_rewards"]]
+            for t in step["tasks"]:
+                if not _CJK.search(t["description"]):
+                    out["task"].setdefault(t["description"], None)
+                elif t["description"] in manual:
+                    out["task"].setdefault(manual[t["description"]], None)
+            for zh in rewards:
+                en = _reward_en(zh, names, items, manual)
+                if en:
+                    out["reward"].setdefault(en, None)
+                else:
+                    skipped += 1
+
+    corpus = {"version": CORPUS_VERSION, **{k: list(v) for k, v in out.items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    print("語料 → " + os.path.relpath(path, ROOT) + "：" + "、".join(f"{k} {len(v)} 句" for k, v in out.items())
+          + f"（{skipped} 條中文獎勵還原不了，略過）")
+
+
+def pin(path=PINNED):
+    """把目前的官方對照庫快照複製到 path，之後的 benchmark 都讀這份。"""
+    S.build_official_translation_db()
+    if not os.path.exists(S.SNAPSHOT):
+        sys.exit("沒有官方文本快照可以 pin（需要網路，或 http_cache 裡已有副本）")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    shutil.copyfile(S.SNAPSHOT, path)
+    print(f"已固定官方文本 {S.DB_KEY[:16]}… → {path}")
+
+
+def _pct(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))] / 1e3
+
+
+def _reset_cache():
+    """清掉 translation_cache 的記憶體與計數；下一次呼叫會重新讀 CACHE_FILE（這裡指到暫存檔）。"""
+    translation_cache._lru.clear()
+    translation_cache._disk.update(scope=None, db_key=None, entries={}, dirty=False)
+    for s in translation_cache.STATS.values():
+        s.clear()
+
+
+def _hit_rates():
+    out = {}
+    for kind, s in translation_cache.STATS.items():
+        total = s["memo"] + s["disk"] + s["miss"]
+        if total:
+            out[kind] = round((s["memo"] + s["disk"]) / total, 4)
+    return out
+
+
+def replay(fn, strings, repeat=1):
+    """fn 對每個字串各跑 repeat 次 → (句/秒, p50 µs, p99 µs)。"""
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for s in strings:
+            t0 = clock()
+            fn(s)
+            samples.append(clock() - t0)
+    samples.sort()
+    return {"n": len(samples), "per_sec": round(len(samples) / (sum(samples) / 1e9)),
+            "p50_us": round(_pct(samples, 0.50), 2), "p99_us": round(_pct(samples, 0.99), 2)}
+
+
+def run(corpus, repeat):
+    pokemon_map = T.load_json_map(os.path.join(ROOT, "data", "pokemon_translation_map.json"))
+    task_map = T.load_json_map(os.path.join(ROOT, "scripts", "task_translation_map.json"))
+    SR.MANUAL_MAP.update(task_map)
+    general = T.GENERAL_TRANSLATIONS
+    official = list(dict.fromkeys(corpus["task"] + corpus["name"] + corpus["item"] + corpus["reward"]))
+    cases = [
+        ("official_translate", S.official_translate, official),
+        ("compose_translate", T.compose_translate, corpus["task"]),
+        ("translate_task_description", lambda s: T.translate_task_description(s, task_map), corpus["task"]),
+        ("translate_reward_text", lambda s: SR.translate_reward_text(s, pokemon_map), corpus["reward"]),
+        ("translate_release_date", SR.translate_release_date, corpus["release_date"]),
+        ("translate_name", lambda s: T.translate_name(s, pokemon_map, general), corpus["name"]),
+        ("translate_item_resource", lambda s: T.translate_item_resource(s, general, pokemon_map), corpus["item"]),
+    ]
+    memoized = {"translate_task_description", "translate_reward_text", "translate_name", "translate_item_resource"}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        translation_cache.CACHE_FILE = os.path.join(tmp, "translations.json")
+        for label, fn, strings in cases:
+            row = {}
+            if label in memoized:
+                if os.path.exists(translation_cache.CACHE_FILE):
+                    os.remove(translation_cache.CACHE_FILE)
+                _reset_cache()
+                row["cold"] = dict(replay(fn, strings), hit=_hit_rates())
+                translation_cache.save()
+                _reset_cache()
+                row["disk"] = dict(replay(fn, strings), hit=_hit_rates())
+                _reset_cache()
+                replay(fn, strings)          # 先填滿 LRU（這一輪是磁碟命中，不算）
+                for s in translation_cache.STATS.values():
+                    s.clear()
+                row["warm"] = dict(replay(fn, strings, repeat), hit=_hit_rates())
+            else:
+                S.STATS.clear()
+                row["run"] = replay(fn, strings, repeat)
+                if label == "official_translate":
+                    row["run"]["tiers"] = {k: round(S.STATS[k] / row["run"]["n"], 4)
+                                           for k in ("exact", "loose", "template", "miss")}
+            results[label] = row
+    for table in T.RULE_TABLES:
+        table.reset()                       # 不寫進規則報告
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _print(report, base=None):
+    print(f"commit {report['commit']}，語料 {report['corpus_sha1'][:12]}，官方文本 {report['db_key'][:14]}…，"
+          f"重複 {report['repeat']} 次")
+    if base and (base["corpus_sha1"], base["db_key"]) != (report["corpus_sha1"], report["db_key"]):
+        print(f"⚠️ 比較基準（commit {base['commit']}）用的語料或官方文本不同，數字不能直接比")
+    print(f"{'函式':<28}{'輪':<6}{'句數':>7}{'句/秒':>11}{'p50 µs':>9}{'p99 µs':>9}  快取命中")
+    for label, row in report["results"].items():
+        for mode, r in row.items():
+            hit = "、".join(f"{k} {v:.0%}" for k, v in r.get("hit", r.get("tiers", {})).items())
+            line = f"{label:<28}{mode:<6}{r['n']:>7}{r['per_sec']:>11,}{r['p50_us']:>9.2f}{r['p99_us']:>9.2f}  {hit}"
+            old = (base or {}).get("results", {}).get(label, {}).get(mode)
+            if old:
+                line += f"  [{r['per_sec'] / old['per_sec']:.2f}× 句/秒，p99 {old['p99_us']:.2f}→{r['p99_us']:.2f}]"
+            print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--freeze", action="store_true", help="從 repo 的資料重建語料")
+    ap.add_argument("--pin", action="store_true", help="固定目前的官方文本（要網路或 http_cache）")
+    ap.add_argument("--db", default=PINNED, help=f"固定的官方文本快照（預設 {PINNED}）")
+    ap.add_argument("--corpus", default=CORPUS)
+    ap.add_argument("--repeat", type=int, default=3, help="非冷啟動的輪次每句重複幾次")
+    ap.add_argument("--json", metavar="OUT", help="結果另存成 JSON（給之後 --compare 用）")
+    ap.add_argument("--compare", metavar="BASE", help="跟之前 --json 存的結果比較")
+    args = ap.parse_args()
+    if args.freeze:
+        return freeze(args.corpus)
+    if args.pin:
+        return pin(args.db)
+
+    try:
+        db_key = S.load_pinned(args.db)
+    except FileNotFoundError:
+        sys.exit(f"沒有固定的官方文本（{args.db}），先跑一次 --pin")
+    except ValueError as e:
+        sys.exit(str(e))
+    with open(args.corpus, "rb") as f:
+        raw = f.read()
+    corpus = json.loads(raw)
+    if corpus.get("version") != CORPUS_VERSION:
+        sys.exit(f"語料是第 {corpus.get('version')} 版，目前是第 {CORPUS_VERSION} 版，請重跑 --freeze")
+
+    report = {"commit": _commit(), "python": sys.version.split()[0], "corpus_sha1": hashlib.sha1(raw).hexdigest(),
+              "db_key": db_key, "repeat": args.repeat, "results": run(corpus, args.repeat)}
+    base = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+    _print(report, base)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+        print(f"→ {args.json}")
+
+
+if __name__ == "__main__":
+    main()
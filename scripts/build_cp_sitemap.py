@@ -22,7 +22,6 @@ data/sitemap_cp_lastmod.json；指紋沒變就沿用上次的 lastmod，只有
 狀態檔放在 data/ 底下是刻意的：deploy.yml 的回寫步驟只 `git add data/`，
 放在別的地方下一輪 checkout 就讀不到，等於沒記。
 """
-import ast
 import hashlib
 import json
 import os
@@ -30,9 +29,10 @@ from datetime import date
 from urllib.parse import quote
 from xml.sax.saxutils import escape
 
+from data_snapshot import load_cp_data
+
 SITE = "https://pogokit.com/"
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SRC = os.path.join(ROOT, "data", "precomputed_pokemon_cp.js")
 OUT = os.path.join(ROOT, "sitemap-cp.xml")
 STATE = os.path.join(ROOT, "data", "sitemap_cp_lastmod.json")
 
@@ -44,10 +44,7 @@ FP_FIELDS = ("id", "name", "imageUrl", "cp15", "cp20", "cp25", "atk", "def", "st
 
 def load_entries():
     """回傳 [(名稱, 內容指紋)]，名稱去重且保持原順序。"""
-    text = open(SRC, encoding="utf-8").read()
-    # 只取第一個陣列(POKEMON_CP_DATA)。檔案後面還有 CP_MULTIPLIER 陣列,
-    # 用 rindex("]") 會抓到那個的結尾、把兩個陣列連同中間的 JS 一起餵進 literal_eval → 直接爆。
-    arr = ast.literal_eval(text[text.index("["):text.index("];") + 1])  # 單引號字典 → Python 字面值
+    arr = load_cp_data().rows
     out, seen = [], set()
     for p in arr:
         n = (p.get("name") or "").strip()
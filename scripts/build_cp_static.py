@@ -10,70 +10,93 @@ canonical 收斂到 ?tab=cp-checker-app，判為重複而不收錄（GSC 實測
 解法：每隻輸出一個真正獨立的檔案（不同路徑、內容寫死在原始 HTML、自帶 self-canonical），
 Google 一抓就看得到不同文件，才有機會收錄。
 
-目前只做「烈空坐」一隻做收錄測試。確認有效後，把 ENRICH 改成用
-data/pokemon_data_and_rankings.js 的 POKEDEX / rankings 自動生成全部。
+預設只產生 TARGETS 裡挑過的幾隻；--all 會把 CP_DATA 每一隻都產生出來（auto_enrich 自動生成說明）。
+每頁要算 51 等級表、4096 種 IV 的對照表與 auto_enrich，一千多頁逐頁跑太久，
+所以改用 process pool 平行產生（數量預設等於 CPU 核心數）。頁面內容在子行程產生，
+寫檔與輸出訊息一律由主行程依 CP_DATA 的順序進行，不論幾個行程結果都一樣。
 
-用法：  python scripts/build_cp_static.py
+增量產生：每頁的輸入（CP 資料列、enrich 與排名、圖鑑相鄰、CPM、模板版本）算一個指紋，
+記在 data/cp_static_manifest.json（slug → 名稱與指紋）。指紋沒變、檔案也還在就不重寫，
+git 不會出現一整片沒意義的變動，Pages 也不必為此重新部署。manifest 記過但已經不會再產生的
+slug（那隻從 CP_DATA 消失、或 slug 改了）會連同目錄一起刪掉。--force 無視 manifest 全部重產。
+
+樣式：CSS 只輸出一份 cp/cp.<內容雜湊>.css，所有頁面共用（見 CSS_FILE）。
+
+用法：  python scripts/build_cp_static.py [--all] [--only 名稱 ...] [--jobs N] [--force]
 輸出：  cp/<slug>/index.html
 """
-import os, re, math, html, json
+import argparse, hashlib, os, re, html, json, shutil, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from cp_engine import cp_iv, hp_iv as _hp_iv, pick
+from data_snapshot import load_cp_data, load_rankings
+from type_chart import TYPE_COLOR, TYPE_ZH, matchups, weathers_of
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ORIGIN = "https://pogokit.com"
-
-# ---- 讀 CP 資料與 CPM ----
-cp_js = open(os.path.join(ROOT, "data", "precomputed_pokemon_cp.js"), encoding="utf-8").read()
-CPM = [float(x) for x in re.search(r"CP_MULTIPLIER\s*=\s*\[([^\]]+)\]", cp_js).group(1).split(",")]
-CP_DATA = {}
-for o in re.findall(r"\{[^{}]*\}", re.search(r"POKEMON_CP_DATA\s*=\s*(\[.*?\]);", cp_js, re.S).group(1)):
-    d = {}
-    for k, v in re.findall(r"'(\w+)':\s*(\"[^\"]*\"|[0-9]+)", o):
-        d[k] = v[1:-1] if v.startswith('"') else int(v)
-    if "name" in d:
-        CP_DATA[d["name"]] = d
+MANIFEST = os.path.join(ROOT, "data", "cp_static_manifest.json")
+# 模板版本：HTML 模板、CSS、auto_enrich 的文字都寫在這支腳本裡，CP 公式在 cp_engine.py、相剋表在 type_chart.py；
+# 任一個檔的內容改了，所有頁面的指紋都會變、全部重新產生。
+TEMPLATE_VERSION = hashlib.sha1(b"".join(
+    open(os.path.join(os.path.dirname(os.path.abspath(__file__)), f), "rb").read()
+    for f in ("build_cp_static.py", "cp_engine.py", "type_chart.py"))).hexdigest()[:12]
+
+# ---- 讀 CP 資料與 CPM（data_snapshot 有快照就不必重新解析）----
+_cp = load_cp_data()
+CPM = [float(x) for x in _cp.cpm]
+CP_DATA = {d["name"]: d for d in _cp.rows if "name" in d}
 
 MAX_LEVEL, BB = 50, 51
 KEY = {15: "🔬 田野調查 · 🤝 小隊合作",
        20: "⚔️ 團體戰（無天氣加成）· 🥚 孵化的蛋",
        25: "☀️ 團體戰（天氣加成）"}
 
+# 一隻寶可夢 51 個等級 × 「三項 IV 相同」(0/0/0～15/15/15)的 CP,用 cp_engine 一次算好;
+# 等級表與 auto_enrich 只會用到這條對角線,不必算完整的 16³ 方塊。
+# 以基礎數值當 key:同一頁 build()/auto_enrich() 會重複用到同一隻。
+@lru_cache(maxsize=8)
+def _diag(atk, dfe, sta):
+    iv = np.arange(16)
+    return cp_iv((atk, dfe, sta), CPM, iv, iv, iv)
+
 def cp_at(p, L, iv):
-    m = CPM[L - 1]
-    return max(10, int((p["atk"] + iv) * math.sqrt(p["def"] + iv) * math.sqrt(p["sta"] + iv) * m * m / 10))
+    return int(_diag(p["atk"], p["def"], p["sta"])[L - 1, iv])
 
 # ---- 高 IV CP·HP 對照表（IV 100%～91.1%，仿使用者附圖）----
 IV_TABLE_LEVELS = [15, 20, 25, 40]   # 與參考圖一致
 IV_MIN_SUM = 41                       # IV 總和 41/45 = 91.11%
-
-def cp_iv(p, L, a, d, s):
-    m = CPM[L - 1]
-    return max(10, int((p["atk"] + a) * math.sqrt(p["def"] + d) * math.sqrt(p["sta"] + s) * m * m / 10))
-
-def hp_iv(p, L, s):
-    return max(10, int((p["sta"] + s) * CPM[L - 1]))
+IV_SORT_LEVEL = 40                    # 同 IV% 內依這個等級的 CP 排序
+
+# 跟物種無關的部分整個 build 只算一次：哪 35 種 IV 組合（攻→防→耐 由大到小列舉）、
+# 每列開頭的 IV% 與 IV 格子、表頭。每頁只剩向量化算 CP/HP 格子，再依 IV%、L40 CP 穩定排序。
+_IV_ROWS = [(a, d, s) for a in range(15, -1, -1) for d in range(15, -1, -1) for s in range(15, -1, -1)
+            if a + d + s >= IV_MIN_SUM]
+_IV_A, _IV_D, _IV_S = (np.array(x) for x in zip(*_IV_ROWS))
+_IV_TOT = _IV_A + _IV_D + _IV_S
+_IV_ROW_HEAD = [('<tr class="hundo">' if a + d + s == 45 else '<tr>')
+                + f'<td class="pct">{(a + d + s) / 45 * 100:.2f}%</td>'
+                f'<td class="iv v{a}">{a}</td><td class="iv v{d}">{d}</td><td class="iv v{s}">{s}</td>'
+                for a, d, s in _IV_ROWS]
+_IV_CPM = pick(CPM, IV_TABLE_LEVELS + [IV_SORT_LEVEL])
+_IV_HEAD = ('<table class="iv"><thead>'
+            '<tr><th rowspan="2">IV%</th><th colspan="3">個體值 攻/防/耐</th>'
+            + "".join(f'<th colspan="2">L{L}</th>' for L in IV_TABLE_LEVELS) + '</tr>'
+            '<tr><th>攻</th><th>防</th><th>耐</th>'
+            + "".join('<th>CP</th><th>HP</th>' for _ in IV_TABLE_LEVELS) + '</tr>'
+            '</thead><tbody>')
 
 def build_iv_table(p):
-    combos = []
-    for a in range(15, -1, -1):
-        for d in range(15, -1, -1):
-            for s in range(15, -1, -1):
-                tot = a + d + s
-                if tot >= IV_MIN_SUM:
-                    combos.append((tot, a, d, s, cp_iv(p, 40, a, d, s)))
-    combos.sort(key=lambda c: (-c[0], -c[4]))   # IV% 由高到低，同 IV% 內 CP 由高到低
-    body = ""
-    for tot, a, d, s, _ in combos:
-        pct = tot / 45 * 100
-        cells = "".join(f'<td>{cp_iv(p,L,a,d,s)}</td><td class="hp">{hp_iv(p,L,s)}</td>' for L in IV_TABLE_LEVELS)
-        ivc = (f'<td class="iv v{a}">{a}</td><td class="iv v{d}">{d}</td><td class="iv v{s}">{s}</td>')
-        hundo = ' class="hundo"' if tot == 45 else ''
-        body += f'<tr{hundo}><td class="pct">{pct:.2f}%</td>{ivc}{cells}</tr>'
-    heads1 = "".join(f'<th colspan="2">L{L}</th>' for L in IV_TABLE_LEVELS)
-    heads2 = "".join('<th>CP</th><th>HP</th>' for _ in IV_TABLE_LEVELS)
-    return (f'<table class="iv"><thead>'
-            f'<tr><th rowspan="2">IV%</th><th colspan="3">個體值 攻/防/耐</th>{heads1}</tr>'
-            f'<tr><th>攻</th><th>防</th><th>耐</th>{heads2}</tr>'
-            f'</thead><tbody>{body}</tbody></table>')
+    st = (p["atk"], p["def"], p["sta"])
+    cp = cp_iv(st, _IV_CPM, _IV_A, _IV_D, _IV_S)          # [等級, 列]，最後一個等級是排序用的
+    hp = _hp_iv(st, _IV_CPM[:-1], _IV_S)
+    order = np.lexsort((-cp[-1], -_IV_TOT))                # IV% 由高到低，同 IV% 內 CP 由高到低（穩定排序）
+    cells = [[f'<td>{c}</td><td class="hp">{h}</td>' for c, h in zip(cr, hr)]
+             for cr, hr in zip(cp[:-1].T.tolist(), hp.T.tolist())]
+    body = "".join(_IV_ROW_HEAD[i] + "".join(cells[i]) + "</tr>" for i in order.tolist())
+    return f"{_IV_HEAD}{body}</tbody></table>"
 
 def dex_neighbor(pid, step):
     d = pid + step
@@ -85,98 +108,19 @@ def dex_neighbor(pid, step):
     return None
 
 # ================= 屬性相剋 / 資料 join（自動生成差異化內容用）=================
-TYPE_ZH = {"normal": "一般", "fire": "火", "water": "水", "electric": "電", "grass": "草", "ice": "冰",
-           "fighting": "格鬥", "poison": "毒", "ground": "地面", "flying": "飛行", "psychic": "超能力",
-           "bug": "蟲", "rock": "岩石", "ghost": "幽靈", "dragon": "龍", "dark": "惡", "steel": "鋼", "fairy": "妖精"}
-TYPE_COLOR = {"normal": "#9099a1", "fire": "#ff9d55", "water": "#4d90d5", "electric": "#f4d23c",
-              "grass": "#63bc5a", "ice": "#73cec0", "fighting": "#ce4069", "poison": "#ab6ac8",
-              "ground": "#d97845", "flying": "#8fa8dd", "psychic": "#f97176", "bug": "#90c12c",
-              "rock": "#c7b78b", "ghost": "#5269ad", "dragon": "#0b6dc3", "dark": "#5a5465",
-              "steel": "#5a8ea1", "fairy": "#ec8fe6"}
-# 每個「防守屬性」被哪些屬性 剋 / 抵抗 / 免疫（標準第六世代相剋表；PoGo 免疫＝×0.390625）
-TYPE_DEF = {
-    "normal":   (["fighting"], [], ["ghost"]),
-    "fire":     (["water", "ground", "rock"], ["fire", "grass", "ice", "bug", "steel", "fairy"], []),
-    "water":    (["electric", "grass"], ["fire", "water", "ice", "steel"], []),
-    "electric": (["ground"], ["electric", "flying", "steel"], []),
-    "grass":    (["fire", "ice", "poison", "flying", "bug"], ["water", "electric", "grass", "ground"], []),
-    "ice":      (["fire", "fighting", "rock", "steel"], ["ice"], []),
-    "fighting": (["flying", "psychic", "fairy"], ["bug", "rock", "dark"], []),
-    "poison":   (["ground", "psychic"], ["grass", "fighting", "poison", "bug", "fairy"], []),
-    "ground":   (["water", "grass", "ice"], ["poison", "rock"], ["electric"]),
-    "flying":   (["electric", "ice", "rock"], ["grass", "fighting", "bug"], ["ground"]),
-    "psychic":  (["bug", "ghost", "dark"], ["fighting", "psychic"], []),
-    "bug":      (["fire", "flying", "rock"], ["grass", "fighting", "ground"], []),
-    "rock":     (["water", "grass", "fighting", "ground", "steel"], ["normal", "fire", "poison", "flying"], []),
-    "ghost":    (["ghost", "dark"], ["poison", "bug"], ["normal", "fighting"]),
-    "dragon":   (["ice", "dragon", "fairy"], ["fire", "water", "grass", "electric"], []),
-    "dark":     (["fighting", "bug", "fairy"], ["ghost", "dark"], ["psychic"]),
-    "steel":    (["fire", "fighting", "ground"], ["normal", "grass", "ice", "flying", "psychic", "bug", "rock", "dragon", "steel", "fairy"], ["poison"]),
-    "fairy":    (["poison", "steel"], ["fighting", "bug", "dark"], ["dragon"]),
-}
-WEATHER_ZH = {"clear": "晴朗", "rain": "下雨", "partlycloudy": "多雲", "cloudy": "陰天",
-              "windy": "刮風", "snow": "下雪", "fog": "濃霧"}
-TYPE_WEATHER = {"grass": "clear", "fire": "clear", "ground": "clear", "water": "rain", "electric": "rain",
-                "bug": "rain", "normal": "partlycloudy", "rock": "partlycloudy", "fairy": "cloudy",
-                "fighting": "cloudy", "poison": "cloudy", "dragon": "windy", "flying": "windy",
-                "psychic": "windy", "ice": "snow", "steel": "snow", "dark": "fog", "ghost": "fog"}
-
-def _single_mult(atk, deft):
-    weak, resist, immune = TYPE_DEF[deft]
-    if atk in weak:   return 1.6
-    if atk in resist: return 0.625
-    if atk in immune: return 0.390625
-    return 1.0
-
-def _fmt_mult(m):
-    q = math.floor(m * 100 + 0.5) / 100   # 四捨五入到小數兩位（0.625→0.63，不用銀行家捨入）
-    return "×" + f"{q:.2f}".rstrip("0").rstrip(".")
-
-def matchups(types):
-    """回傳 (weaknesses, resistances)：weak=[(zh, mult_str, is_double)]、resist=[(zh, mult_str)]。"""
-    weak, resist = [], []
-    for atk in TYPE_DEF:
-        m = 1.0
-        for dt in types:
-            m *= _single_mult(atk, dt)
-        if m > 1.0001:
-            weak.append((TYPE_ZH[atk], _fmt_mult(m), m, m >= 2.5))
-        elif m < 0.9999:
-            resist.append((TYPE_ZH[atk], _fmt_mult(m), m))
-    weak.sort(key=lambda x: -x[2])
-    resist.sort(key=lambda x: x[2])
-    return ([(z, s, d) for z, s, _, d in weak], [(z, s) for z, s, _ in resist])
-
-def weathers_of(types):
-    seen, out = set(), []
-    for t in types:
-        w = TYPE_WEATHER.get(t)
-        if w and w not in seen:
-            seen.add(w); out.append(WEATHER_ZH[w])
-    return "、".join(out)
+# 相剋表與天氣在 type_chart.py 一次預先算好，這裡只查表。
 
 # ---- 讀 POKEDEX（屬性/英文 slug）與 PvP rankings（招式/名次）----
 def _norm(s):
     return re.sub(r"[\s()（）]|形態", "", s or "")
 
-def _json_block(txt, name):
-    i = txt.find("const " + name); j = txt.find("[", i); depth = 0; k = j
-    while k < len(txt):
-        c = txt[k]
-        if c == "[": depth += 1
-        elif c == "]":
-            depth -= 1
-            if depth == 0: break
-        k += 1
-    return json.loads(txt[j:k + 1])
-
-_RANK_SRC = open(os.path.join(ROOT, "data", "pokemon_data_and_rankings.js"), encoding="utf-8").read()
-POKEDEX = _json_block(_RANK_SRC, "POKEDEX")
+_rank = load_rankings()
+POKEDEX = _rank.pokedex
 PDX_BY_NAME = {_norm(d["name"]): d for d in POKEDEX}
 LEAGUE_ZH = {"great": "超級聯盟", "ultra": "高級聯盟", "master": "大師聯盟"}
 RANKS = {}
-for _lg, _var in (("great", "POKEMON_RANKINGS_1500"), ("ultra", "POKEMON_RANKINGS_2500"), ("master", "POKEMON_RANKINGS_10000")):
-    _arr = _json_block(_RANK_SRC, _var)
+for _lg, _cap in (("great", 1500), ("ultra", 2500), ("master", 10000)):
+    _arr = _rank.rankings[_cap]
     for _i, _e in enumerate(_arr):
         RANKS.setdefault(_norm(_e["name"]), {})[_lg] = {
             "rank": _i + 1, "total": len(_arr), "score": _e["score"],
@@ -385,6 +329,11 @@ table.iv tbody tr:nth-child(even) td:not(.iv){background:#fcfcfd}
 @media (max-width:480px){.fab{padding:12px 16px}}
 """
 
+# 樣式表只輸出一份 cp/cp.<內容雜湊>.css，每頁用 <link> 引用，不再每頁內嵌一整份。
+# 檔名跟著內容變，CSS 一改就是新網址，瀏覽器與 CDN 可以放心長期快取，不會拿到舊樣式。
+CSS_FILE = f"cp.{hashlib.sha1(CSS.encode('utf-8')).hexdigest()[:10]}.css"
+CSS_LINK = f'<link rel="stylesheet" href="../{CSS_FILE}">'
+
 def esc(s): return html.escape(str(s), quote=True)
 
 def build(name):
@@ -450,7 +399,7 @@ def build(name):
 <meta property="og:image" content="{esc(p['imageUrl'])}">
 <meta property="og:locale" content="zh_TW">
 <script type="application/ld+json">{ld}</script>
-<style>{CSS}</style>
+{CSS_LINK}
 </head>
 <body>
 <div class="wrap">
@@ -549,17 +498,151 @@ def build(name):
 </body>
 </html>"""
 
+def page_fingerprint(name, p, e):
+    """一頁所有輸入的指紋：CP 資料列、enrich（含屬性、排名）、圖鑑相鄰的名稱、CPM 與模板版本。"""
+    raw = json.dumps([TEMPLATE_VERSION, CPM, p, e, dex_neighbor(p["id"], -1), dex_neighbor(p["id"], +1)],
+                     ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def load_manifest():
+    try:
+        with open(MANIFEST, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def render(name):
+    """子行程的工作：一頁的 (名稱, HTML, 是否成功)；失敗時 HTML 換成錯誤訊息。"""
+    try:
+        return name, build(name), True
+    except Exception as ex:
+        return name, f"{type(ex).__name__}: {ex}", False
+
+def write_css():
+    """寫出 cp/cp.<雜湊>.css（內容沒變就不動）。舊雜湊的樣式表由 prune_css() 在頁面寫完後處理。"""
+    cp_dir = os.path.join(ROOT, "cp")
+    os.makedirs(cp_dir, exist_ok=True)
+    path = os.path.join(cp_dir, CSS_FILE)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(CSS)
+        print("wrote", os.path.relpath(path, ROOT))
+
+def prune_css(manifest):
+    """刪掉沒有任何頁面還在用的舊樣式表。
+    只產生部分頁面（TARGETS / --only）時，沒重新產生的頁面仍連到舊雜湊，所以依 manifest 每頁記的 css 判斷；
+    manifest 裡有沒記 css 的舊條目（不知道它連到哪一份）就先都不刪。"""
+    used = {ent.get("css") for ent in manifest.values()}
+    if None in used:
+        return
+    cp_dir = os.path.join(ROOT, "cp")
+    for fn in os.listdir(cp_dir):
+        if re.fullmatch(r"cp\.[0-9a-f]{10}\.css", fn) and fn != CSS_FILE and fn not in used:
+            os.remove(os.path.join(cp_dir, fn))
+            print("移除舊樣式表:", "cp/" + fn)
+
 def main():
-    for name in TARGETS:
-        p = CP_DATA.get(name)
-        if not p:
-            print("SKIP（找不到 CP 資料）:", name); continue
-        e = get_enrich(name, p)
-        out_dir = os.path.join(ROOT, "cp", e["slug"])
-        os.makedirs(out_dir, exist_ok=True)
-        out = os.path.join(out_dir, "index.html")
-        open(out, "w", encoding="utf-8").write(build(name))
-        print("wrote", os.path.relpath(out, ROOT), "  (" + e["type_line"] + ")")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--all", action="store_true", help="產生 CP_DATA 的每一隻（預設只產生 TARGETS）")
+    ap.add_argument("--only", nargs="+", metavar="名稱", help="只產生這幾隻")
+    ap.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="平行行程數（預設 CPU 核心數）")
+    ap.add_argument("--force", action="store_true", help="忽略 manifest，全部重新產生")
+    args = ap.parse_args()
+
+    names = args.only or (list(CP_DATA) if args.all else TARGETS)
+    for name in names:
+        if name not in CP_DATA:
+            print("SKIP（找不到 CP 資料）:", name)
+    names = [n for n in dict.fromkeys(names) if n in CP_DATA]
+
+    t0 = time.time()
+    manifest = load_manifest()
+    failed, seen, todo, fps, types = [], {}, [], {}, {}
+    for name in names:
+        try:
+            e = get_enrich(name, CP_DATA[name])
+        except Exception as ex:
+            failed.append(name)
+            print("FAIL", name, "—", f"{type(ex).__name__}: {ex}")
+            continue
+        slug = e["slug"]
+        if slug in seen:
+            failed.append(name)
+            print(f"FAIL {name} — slug「{slug}」已被 {seen[slug]} 使用")
+            continue
+        seen[slug] = name
+        fps[name], types[name] = page_fingerprint(name, CP_DATA[name], e), e["type_line"]
+        old = manifest.get(slug) or {}
+        out = os.path.join(ROOT, "cp", slug, "index.html")
+        if args.force or old.get("name") != name or old.get("fp") != fps[name] or not os.path.exists(out):
+            todo.append((name, slug))
+    slug_of = {n: s for s, n in seen.items()}
+    write_css()
+
+    verbose = len(todo) <= len(TARGETS)            # 少量時逐頁列出，大量產生時只印進度
+    step = max(1, len(todo) // 20)
+    jobs = max(1, min(args.jobs, len(todo)))
+    pool = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    written = 0
+    try:
+        todo_names = [n for n, _ in todo]
+        results = (pool.map(render, todo_names, chunksize=max(1, len(todo) // (jobs * 8)))
+                   if pool else map(render, todo_names))
+        for i, (name, page, ok) in enumerate(results, 1):
+            slug = slug_of[name]
+            if not ok:
+                failed.append(name)
+                print("FAIL", name, "—", page)
+                if slug in manifest:
+                    manifest[slug]["fp"] = None   # 下次一定重新產生；舊頁面還在，保留它連到的樣式表
+            else:
+                out_dir = os.path.join(ROOT, "cp", slug)
+                os.makedirs(out_dir, exist_ok=True)
+                out = os.path.join(out_dir, "index.html")
+                open(out, "w", encoding="utf-8").write(page)
+                manifest[slug] = {"name": name, "fp": fps[name], "css": CSS_FILE}
+                written += 1
+                if verbose:
+                    print("wrote", os.path.relpath(out, ROOT), "  (" + types[name] + ")")
+            if not verbose and (i % step == 0 or i == len(todo)):
+                print(f"  [{i}/{len(todo)}] {time.time() - t0:.1f} 秒", flush=True)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    # 孤兒網址：manifest 記過、但那隻已經不在 CP_DATA，或 slug 換了（例如 POKEDEX 的 id 改了）。
+    # 只刪 manifest 記得的目錄，手寫或別處產生的 cp/ 子目錄不動。
+    removed = []
+    for slug, ent in sorted(manifest.items()):
+        n = ent.get("name")
+        if n in CP_DATA:
+            if n not in slug_of:                   # 這次沒產生到（TARGETS / --only），重算一次它現在的 slug
+                try:
+                    slug_of[n] = get_enrich(n, CP_DATA[n])["slug"]
+                except Exception:
+                    continue
+            if slug_of[n] == slug:
+                continue
+        shutil.rmtree(os.path.join(ROOT, "cp", slug), ignore_errors=True)
+        del manifest[slug]
+        removed.append(slug)
+    if removed:
+        print("移除舊網址:", "、".join("cp/" + s for s in removed))
+    prune_css(manifest)
+
+    with open(MANIFEST, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write("\n")
+
+    print(f"已產生 {written} 頁、{len(seen) - len(todo)} 頁未變動（{jobs} 個行程，"
+          f"耗時 {time.time() - t0:.1f} 秒）"
+          + (f"，移除 {len(removed)} 頁" if removed else "") + (f"，{len(failed)} 頁失敗" if failed else ""))
+    # 改用外部樣式表省下的量：每頁少了內嵌的 <style>，多了一行 <link>
+    saved = len(f"<style>{CSS}</style>".encode("utf-8")) - len(CSS_LINK.encode("utf-8"))
+    print(f"樣式表 cp/{CSS_FILE}（{len(CSS.encode('utf-8')) / 1024:.1f} KB）：每頁省 {saved / 1024:.1f} KB，"
+          f"目前 {len(manifest)} 頁共省 {saved * len(manifest) / 1024 / 1024:.1f} MB")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -14,9 +14,12 @@ import os
 import re
 import json
 import hashlib
-import requests
 from PIL import Image
 
+import http_cache
+from data_snapshot import load_rankings
+from sprite_index import parse_sprite
+
 LOCAL_DIR = r"C:\Users\qian\Desktop\poke_web\pogo_assets\Images\Pokemon - 256x256\Addressable Assets"
 IMAGE_BASE = "https://cdn.jsdelivr.net/gh/PokeMiners/pogo_assets@master/Images/Pokemon%20-%20256x256/Addressable%20Assets/"
 OUTPUT = "./data/pokedex_manifest.json"
@@ -75,7 +78,7 @@ COSTUME_FORM_RE = re.compile(
 
 
 def load_holo(url):
-    d = requests.get(url, headers=HEADERS, timeout=60).json()["data"]
+    d = http_cache.get_json(url, HEADERS, timeout=60)["data"]
     return dict(zip(d[0::2], d[1::2]))
 
 
@@ -91,20 +94,8 @@ def gen_of(dex):
 
 
 def load_pokedex_types():
-    """從現有的 POKEDEX（JS 檔）取每隻的屬性；同編號取第一個（base form）。
-    檔案含多個變數陣列，用括號配對只擷取 POKEDEX = [...] 這一段。"""
-    txt = open("./data/pokemon_data_and_rankings.js", encoding="utf-8").read()
-    start = txt.index("[", txt.index("POKEDEX"))
-    depth, end = 0, start
-    for i in range(start, len(txt)):
-        if txt[i] == "[":
-            depth += 1
-        elif txt[i] == "]":
-            depth -= 1
-            if depth == 0:
-                end = i + 1
-                break
-    arr = json.loads(txt[start:end])
+    """從現有的 POKEDEX（JS 檔，經 data_snapshot 讀取）取每隻的屬性；同編號取第一個（base form）。"""
+    arr = load_rankings().pokedex
     types = {}
     for e in arr:
         d = e.get("dexNumber")
@@ -116,6 +107,7 @@ def load_pokedex_types():
 def build_translators():
     en = load_holo(HOLO_EN)
     zht = load_holo(HOLO_ZHT)
+    print(http_cache.summary())
 
     def name_zh(dex):
         return zht.get("pokemon_name_%04d" % dex)
@@ -152,17 +144,16 @@ def pixel_hash(fn):
 
 
 def parse_filename(fn):
-    m = re.match(r"^pm(\d+)(?:\.f([A-Za-z0-9_]+))?(?:\.c([A-Za-z0-9_]+))?"
-                 r"(?:\.g(\d))?(\.s)?\.icon\.png$", fn)
-    if not m:
+    """檔名規則的解析在 sprite_index.parse_sprite（與 refresh_cp_data、trade-list 共用）；有認不得的片段就略過。"""
+    v = parse_sprite(fn)
+    if not v or v["extra"]:
         return None
-    dex, form, costume, gender, shiny = m.groups()
     return {
-        "dex": int(dex),
-        "form": form,
-        "costume": costume.upper() if costume else None,
-        "gender": int(gender) if gender else None,
-        "shiny": bool(shiny),
+        "dex": v["dex"],
+        "form": v["form"],
+        "costume": v["costume"].upper() if v["costume"] else None,
+        "gender": v["gender"],
+        "shiny": v["shiny"],
         "file": fn,
     }
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""離線預先算好每隻寶可夢在各聯盟的 PvP IV 排名表(data/pvp-ranks/)。
+
+js/pvp-logic.js 每按一次「計算」,就要對每個聯盟把 4096 種 IV 各自找出 CP 上限內的最高等級、
+算數值乘積、再整個排序一次;低階手機上會明顯卡住。這些結果只跟基礎數值與 CPM 有關,
+所以改成這裡先算好,前端只要讀一個檔、用 IV 當 index 查表。
+
+排名規則與 generateRankedSpreads(pokemon, 0, league.cp, 51, 1, 'product') 相同:
+  - 等級:CP 不超過聯盟上限的最高半等級(Lv1～Lv51);大師聯盟(10000)一律 Lv51
+  - 數值乘積:(攻×cpm) × (防×cpm) × max(10, floor(耐×cpm)),由大到小排;乘積相同比 CP,再相同維持 IV 順序
+  - 名次:乘積與前一名相同就同名次(1224 這種排法)
+  - Lv1 就超過上限的 IV 不參與排名
+
+## 檔案格式(每個基礎數值組合一個檔)
+
+檔名是 `<攻>-<防>-<耐>.bin`,用基礎數值當 key:數值相同的形態共用同一個檔,
+前端不論拿 POKEDEX 或 POKEMON_CP_DATA 的數值都能直接組出檔名。
+內容是 zlib(deflate)壓縮的 little-endian 陣列,解壓後依 LEAGUES 的順序,每個聯盟一段:
+    Uint16[4096] 名次(0 = Lv1 就超過上限)
+    Uint8[4096]  最佳等級的半等級 index(等級 = 1 + index/2;255 = 同上)
+IV 的 index = 攻×256 + 防×16 + 耐。
+
+CP 與數值乘積沒有寫進檔案:知道等級之後各只是一次公式計算,不需要任何搜尋;
+一起存的話檔案會大四倍(全部物種約 20 MB → 80 MB,整包網站每次部署都要重傳)。
+Python 端的 rank_table() 會把它們一併算出來。
+
+用法:python scripts/build_pvp_ranks.py [--only 名稱 ...] [--out 目錄]
+"""
+import argparse, json, os, sys, time, zlib
+
+import numpy as np
+
+from cp_engine import cp_grid, half_levels, stats_of
+from data_snapshot import load_cp_data
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT = os.path.join(ROOT, "data", "pvp-ranks")
+# 與 js/pvp-logic.js 的 LEAGUES 同順序(超級、高級、大師、小小盃)
+LEAGUES = (1500, 2500, 10000, 500)
+NO_CAP = 10000
+INELIGIBLE_LEVEL = 255
+
+_IV = np.arange(16, dtype=np.float64)
+IV_A, IV_D, IV_S = (x.ravel() for x in np.meshgrid(_IV, _IV, _IV, indexing="ij"))
+
+
+def load_cp():
+    """回傳 (POKEMON_CP_DATA 各列, 含半等級的 CPM)。
+
+    用 refresh_cp_data.py 寫好的 CP_MULTIPLIER_HALF;舊版資料檔沒有這張表時才自己從整數等級內插。"""
+    d = load_cp_data()
+    return d.rows, np.array(d.cpm_half, dtype=np.float64) if d.cpm_half else half_levels(d.cpm)
+
+
+def rank_table(p, cpm_half, cap):
+    """單一聯盟的 4096 種 IV 排名 → dict(rank, level, cp, product),都是 IV index 順序的陣列。"""
+    cp = cp_grid(p, cpm_half).reshape(len(cpm_half), 4096)
+    if cap == NO_CAP:
+        li = np.full(4096, len(cpm_half) - 1)
+    else:
+        li = (cp <= cap).sum(axis=0) - 1          # CP 隨等級單調遞增 → 上限內的等級數 - 1 就是最高等級
+    ok = li >= 0
+    li = np.where(ok, li, 0)
+    m = cpm_half[li]
+    atk, dfe, sta = stats_of(p)
+    product = ((atk + IV_A) * m) * ((dfe + IV_D) * m) * np.maximum(10, np.floor((sta + IV_S) * m))
+    cpv = cp[li, np.arange(4096)]
+
+    order = np.lexsort((np.arange(4096), -cpv, -product, ~ok))   # 最後一個 key 優先:先排除不合格的
+    order = order[:int(ok.sum())]
+    sp = product[order]
+    new = np.ones(len(sp), dtype=bool)
+    new[1:] = sp[1:] != sp[:-1]
+    ranks = np.zeros(4096, dtype=np.int64)
+    ranks[order] = np.maximum.accumulate(np.where(new, np.arange(1, len(sp) + 1), 0))
+    return {"rank": ranks, "level": np.where(ok, li, INELIGIBLE_LEVEL),
+            "cp": np.where(ok, cpv, 0), "product": np.where(ok, product, 0.0)}
+
+
+def pack(p, cpm_half):
+    """一隻寶可夢全部聯盟的排名表 → 壓縮後的檔案內容。"""
+    parts = []
+    for cap in LEAGUES:
+        t = rank_table(p, cpm_half, cap)
+        parts.append(t["rank"].astype("<u2").tobytes())
+        parts.append(t["level"].astype("u1").tobytes())
+    return zlib.compress(b"".join(parts), 9)
+
+
+def file_key(p):
+    return f"{p['atk']}-{p['def']}-{p['sta']}"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--only", nargs="+", metavar="名稱", help="只產生這幾隻(POKEMON_CP_DATA 的 name)")
+    ap.add_argument("--out", default=OUT, help="輸出目錄(預設 data/pvp-ranks)")
+    args = ap.parse_args()
+
+    rows, cpm_half = load_cp()
+    if args.only:
+        want = set(args.only)
+        rows = [p for p in rows if p.get("name") in want]
+        missing = want - {p["name"] for p in rows}
+        if missing:
+            print("找不到 CP 資料:", "、".join(sorted(missing)))
+    rows = [p for p in rows if p.get("atk") is not None]
+
+    os.makedirs(args.out, exist_ok=True)
+    t0 = time.time()
+    done, size = {}, 0
+    for p in rows:
+        key = file_key(p)
+        if key not in done:                       # 基礎數值相同的形態共用一個檔
+            blob = pack(p, cpm_half)
+            with open(os.path.join(args.out, key + ".bin"), "wb") as f:
+                f.write(blob)
+            done[key] = []
+            size += len(blob)
+        done[key].append(p["name"])
+
+    # index.json:名稱 → 檔名,外加格式資訊讓前端不必寫死
+    index_path = os.path.join(args.out, "index.json")
+    index = {"leagues": list(LEAGUES), "levels": len(cpm_half), "ineligibleLevel": INELIGIBLE_LEVEL,
+             "files": {}}
+    if args.only and os.path.exists(index_path):  # 只重算部分時保留其他物種的對照
+        with open(index_path, encoding="utf-8") as f:
+            index["files"] = json.load(f).get("files", {})
+    for key, names in done.items():
+        for n in names:
+            index["files"][n] = key
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
+
+    print(f"已產生 {len(done)} 個排名檔({len(rows)} 筆寶可夢,{size // 1024} KB)"
+          f" → {os.path.relpath(args.out, ROOT)}  耗時 {time.time() - t0:.1f} 秒")
+
+
+if __name__ == "__main__":
+    main()
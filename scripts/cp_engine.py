@@ -0,0 +1,86 @@
+"""CP / HP 的向量化計算(NumPy),build_cp_static.py 與 refresh_cp_data.py 共用。
+
+原本兩支腳本各自有一份純 Python 的 cp_at / cp_iv / hp_iv,每個 (IV, 等級) 組合都要呼叫一次函式;
+一隻 16×16×16 IV × 51 等級就是 20 萬次,全部 1079 筆跑下來幾乎都花在函式呼叫上。
+這裡改成一次算出整個陣列。
+
+公式與前端 js/cp-checker.js 相同:
+    CP = max(10, floor((atk+a) × √(def+d) × √(sta+s) × cpm × cpm / 10))
+    HP = max(10, floor((sta+s) × cpm))
+**運算順序刻意跟純 Python / JS 版一模一樣**(先乘兩個根號、再逐次乘 cpm、最後除 10)。
+浮點乘法換個順序最後一位就可能不同,剛好落在整數邊界時 floor 會差 1,頁面上的 CP 就對不上遊戲。
+
+陣列的軸固定是 [...物種, 等級, 攻IV, 防IV, 耐IV];等級軸跟著傳進來的 cpm 走,
+傳整張 CP_MULTIPLIER 就是 index = 等級-1。只要部分等級用 pick() 挑出來再傳。
+
+記憶體:一隻的完整方塊 51×4096 個 int32 約 0.8 MB;全部物種一次算完整方塊要 900 MB 左右,
+批次計算時請只挑需要的等級(例如 pick(cpm, (15, 20, 25)))。
+"""
+import numpy as np
+
+IV = np.arange(16, dtype=np.float64)
+
+
+def stats_of(p):
+    """基礎數值 → float64 陣列,最後一軸是 (atk, def, sta)。
+
+    可以傳單筆 CP 資料/GM 記錄(有 atk/def/sta 的 dict)、多筆 dict 的 list,或現成的陣列。"""
+    if isinstance(p, dict):
+        return np.array([p["atk"], p["def"], p["sta"]], dtype=np.float64)
+    if p and isinstance(p[0], dict):
+        return np.array([[r["atk"], r["def"], r["sta"]] for r in p], dtype=np.float64)
+    return np.asarray(p, dtype=np.float64)
+
+
+def pick(cpm, levels):
+    """從整數等級的 CPM 表挑出指定等級(1 起算)的倍率。"""
+    return np.asarray(cpm, dtype=np.float64)[np.asarray(levels, dtype=np.intp) - 1]
+
+
+def half_levels(cpm):
+    """整數等級 CPM → 含半等級的 CPM(Lv1, 1.5, 2, …),index = (等級-1)×2。
+
+    半等級用遊戲的內插公式 cpm(L+0.5) = √((cpm(L)² + cpm(L+1)²) / 2),與 js/cp-checker.js 的 FULL_CPM 相同。"""
+    m = np.asarray(cpm, dtype=np.float64)
+    out = np.empty(len(m) * 2 - 1)
+    out[0::2] = m
+    out[1::2] = np.sqrt((m[:-1] * m[:-1] + m[1:] * m[1:]) / 2)
+    return out
+
+
+def _floor10(x):
+    return np.maximum(10, np.floor(x)).astype(np.int32)
+
+
+def cp_iv(p, cpm, a, d, s):
+    """指定 IV(可以是純量或可廣播的陣列)在每個 cpm 下的 CP → [...物種, 等級, ...IV 的形狀]。"""
+    st = stats_of(p)
+    m = np.asarray(cpm, dtype=np.float64)
+    a, d, s = (np.asarray(v, dtype=np.float64) for v in (a, d, s))
+    ivs = np.broadcast_shapes(a.shape, d.shape, s.shape)
+    lead = st.shape[:-1] + (1,) * (1 + len(ivs))          # 物種軸後面留給 等級 與 IV
+    atk, dfe, sta = (st[..., i].reshape(lead) for i in range(3))
+    m = m.reshape((1,) * len(st.shape[:-1]) + m.shape + (1,) * len(ivs))
+    x = (atk + a) * np.sqrt(dfe + d) * np.sqrt(sta + s)
+    return _floor10(x * m * m / 10)
+
+
+def hp_iv(p, cpm, s):
+    """指定耐力 IV 在每個 cpm 下的 HP → [...物種, 等級, ...s 的形狀]。"""
+    st = stats_of(p)
+    m = np.asarray(cpm, dtype=np.float64)
+    s = np.asarray(s, dtype=np.float64)
+    sta = st[..., 2].reshape(st.shape[:-1] + (1,) * (1 + s.ndim))
+    m = m.reshape((1,) * len(st.shape[:-1]) + m.shape + (1,) * s.ndim)
+    return _floor10((sta + s) * m)
+
+
+def cp_grid(p, cpm):
+    """完整的 CP 方塊 → [...物種, 等級, 攻IV, 防IV, 耐IV](int32)。"""
+    return cp_iv(p, cpm, IV[:, None, None], IV[None, :, None], IV[None, None, :])
+
+
+def hp_grid(p, cpm):
+    """完整的 HP 方塊,形狀與 cp_grid() 相同(HP 只跟耐力 IV 有關,攻/防軸是廣播出來的唯讀 view)。"""
+    hp = hp_iv(p, cpm, IV)
+    return np.broadcast_to(hp[..., None, None, :], hp.shape[:-1] + (16, 16, 16))
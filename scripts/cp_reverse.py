@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""CP / HP 反查 IV 與等級:預先排好序的索引 + 二分搜尋(Python API、命令列、前端用的資料檔)。
+
+前端 js/cp-checker.js 的 reverseIV() 每次都把 101 個半等級 × 4096 種 IV 整個掃一遍(aLo..aHi 三層迴圈),
+手機上貼一次截圖的 CP/HP 就要等一下。這些組合只跟基礎數值與 CPM 有關,
+所以先把一隻寶可夢全部 (等級, IV) 的 (CP, HP) 算好、排序,查詢時用二分搜尋切出吻合的那一段。
+
+## Python API
+
+    idx = index_for(p, cpm_half)           # p 是 POKEMON_CP_DATA 的一列;同基礎數值會共用快取
+    idx.lookup(cp, hp=None)                # → [(半等級 index, IV index), …]
+    candidates(p, cp, hp=None, dust=None, iv_floor=0, min_stars=None)   # → 附 CP/HP/IV% 的 dict 列表
+
+dust 是遊戲裡「強化」按鈕上的星塵數(從目前等級升半級的花費),用 data 檔的 POWER_UP_COST 換成等級範圍;
+iv_floor 是三項 IV 的下限(團體戰/研究 10、好友交換 1~5…);min_stars 是評價的最少星數(0~4)。
+
+## 前端資料檔(data/cp-reverse/<攻>-<防>-<耐>.bin)
+
+檔名規則同 data/pvp-ranks/(build_pvp_ranks.file_key)。內容是 zlib 壓縮的 little-endian 資料:
+    Uint32      maxCP
+    Uint32[maxCP+2]  各 CP 在下面兩段的起點(CP c 的範圍是 [off[c], off[c+1]))
+    Uint8[N]    IV index 的高位元組 ┐ 同一個 CP 之內依 IV index 由小到大排,存的是與前一筆的差值
+    Uint8[N]    IV index 的低位元組 ┘ (每個 CP 的第一筆存原值)
+
+檔案只按 CP 排、不存等級與 HP:Python 端的 (CP, HP) 索引每筆都要帶等級,
+壓縮後一隻約 450 KB;只按 CP 排再存 IV 差值約 100 KB。一個 CP 平均只有一兩百種 IV,
+前端拿到之後逐筆算 HP、由低往高找等級(CP 隨等級單調遞增,超過就停),仍比整個掃一遍少兩個數量級。
+同一個 IV 在相鄰幾個等級 CP 一樣(低等級 CP 被 10 擋住時)只記一次。
+
+用法:
+    python scripts/cp_reverse.py query 名稱 --cp 2345 [--hp 150] [--dust 4000] [--floor 10] [--stars 3]
+    python scripts/cp_reverse.py build [--only 名稱 ...] [--out 目錄]
+"""
+import argparse, json, os, sys, time, zlib
+
+import numpy as np
+
+from build_pvp_ranks import file_key, load_cp
+from cp_engine import cp_grid, hp_grid
+from data_snapshot import load_cp_data
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT = os.path.join(ROOT, "data", "cp-reverse")
+# 評價星數的 IV 總和下限(0★ 0~22、1★ 23~29、2★ 30~36、3★ 37~44、4★ 45)
+STAR_FLOOR = (0, 23, 30, 37, 45)
+
+
+def load_costs():
+    """data 檔的 POWER_UP_COST(refresh_cp_data.py 產生);舊版資料檔沒有就回傳 None。"""
+    return load_cp_data().power_up_cost
+
+
+def levels_for_dust(costs, dust):
+    """強化按鈕上的星塵數 → 可能的半等級 index 集合(POWER_UP_COST 是累計值,相減就是每次的花費)。"""
+    acc = costs["stardust"]
+    return {k for k in range(len(acc) - 1) if acc[k + 1] - acc[k] == dust}
+
+
+class ReverseIndex:
+    """一組基礎數值全部 (半等級, IV) 依 (CP, HP) 排序的索引。"""
+
+    def __init__(self, p, cpm_half):
+        cp = cp_grid(p, cpm_half).ravel()
+        hp = hp_grid(p, cpm_half).ravel()
+        # 攤平後的位置就是 半等級 index × 4096 + IV index;lexsort 是穩定排序,同 (CP, HP) 會依等級、IV 排
+        order = np.lexsort((hp, cp))
+        self.combo = order.astype(np.int32)
+        self.key = (cp[order].astype(np.int64) << 16) | hp[order]
+        self.hp = hp
+
+    def lookup(self, cp, hp=None):
+        """吻合的 [(半等級 index, IV index), …];hp 不給就是該 CP 的全部組合。"""
+        lo_hp, hi_hp = (0, 0xFFFF) if hp is None else (hp, hp)
+        lo = np.searchsorted(self.key, (cp << 16) | lo_hp, "left")
+        hi = np.searchsorted(self.key, (cp << 16) | hi_hp, "right")
+        return [divmod(int(c), 4096) for c in self.combo[lo:hi]]
+
+
+_CACHE = {}
+
+
+def index_for(p, cpm_half):
+    """ReverseIndex 快取:同基礎數值的形態(與同一隻查很多次)只建一次。"""
+    key = (file_key(p), len(cpm_half))
+    if key not in _CACHE:
+        _CACHE[key] = ReverseIndex(p, cpm_half)
+    return _CACHE[key]
+
+
+def candidates(p, cp, hp=None, dust=None, iv_floor=0, min_stars=None, cpm_half=None, costs=None):
+    """CP(可選 HP、星塵、IV 下限、評價星數)→ 全部可能的組合,依等級小→大、IV% 高→低排(同 cp-checker.js)。
+
+    cpm_half / costs 不給就從 data/precomputed_pokemon_cp.js 讀;指定 dust 但資料檔沒有 POWER_UP_COST 時丟 ValueError。"""
+    if cpm_half is None:
+        cpm_half = load_cp()[1]
+    lv_ok = None
+    if dust is not None:
+        costs = costs or load_costs()
+        if not costs:
+            raise ValueError("資料檔沒有 POWER_UP_COST,請先重新執行 refresh_cp_data.py")
+        lv_ok = levels_for_dust(costs, dust)
+    floor = max(iv_floor, 0)
+    need = STAR_FLOOR[min_stars] if min_stars is not None else 0
+
+    idx = index_for(p, cpm_half)
+    out = []
+    for li, iv in idx.lookup(cp, hp):
+        if lv_ok is not None and li not in lv_ok:
+            continue
+        a, d, s = iv >> 8, (iv >> 4) & 15, iv & 15
+        if min(a, d, s) < floor or a + d + s < need:
+            continue
+        out.append({"level": 1 + li / 2, "a": a, "d": d, "s": s, "cp": cp,
+                    "hp": int(idx.hp[li * 4096 + iv]), "pct": (a + d + s) / 45})
+    out.sort(key=lambda r: (r["level"], -r["pct"]))
+    return out
+
+
+def pack(p, cpm_half):
+    """前端用的資料檔內容(格式見模組說明)。"""
+    cp = cp_grid(p, cpm_half).reshape(len(cpm_half), 4096)
+    k = np.unique(cp.astype(np.int64).ravel() * 4096 + np.tile(np.arange(4096), len(cpm_half)))
+    cps, ivs = k // 4096, k % 4096
+    max_cp = int(cps[-1])
+    off = np.searchsorted(cps, np.arange(max_cp + 2))
+    delta = np.diff(ivs, prepend=0)
+    first = np.r_[True, cps[1:] != cps[:-1]]
+    delta[first] = ivs[first]
+    blob = (np.array([max_cp], "<u4").tobytes() + off.astype("<u4").tobytes()
+            + (delta >> 8).astype("u1").tobytes() + (delta & 255).astype("u1").tobytes())
+    return zlib.compress(blob, 9)
+
+
+def cmd_query(args):
+    rows, cpm_half = load_cp()
+    p = next((r for r in rows if r.get("name") == args.name and r.get("atk") is not None), None)
+    if not p:
+        sys.exit(f"找不到 CP 資料:{args.name}")
+    try:
+        res = candidates(p, args.cp, args.hp, args.dust, args.floor, args.stars, cpm_half=cpm_half)
+    except ValueError as e:
+        sys.exit(str(e))
+    if not res:
+        sys.exit(f"找不到符合條件的 {args.name} 組合(CP 是否為天氣加成後、或是否強化過?)")
+    print(f"{args.name}  CP {args.cp}" + (f" HP {args.hp}" if args.hp else "") + f":共 {len(res)} 種組合")
+    for r in res[:args.limit]:
+        print(f"  Lv{r['level']:<5g} {r['a']:>2}/{r['d']:>2}/{r['s']:>2}  {r['pct'] * 100:5.1f}%  HP {r['hp']}")
+    if len(res) > args.limit:
+        print(f"  …還有 {len(res) - args.limit} 筆(--limit 調整)")
+
+
+def cmd_build(args):
+    rows, cpm_half = load_cp()
+    if args.only:
+        want = set(args.only)
+        rows = [p for p in rows if p.get("name") in want]
+        missing = want - {p["name"] for p in rows}
+        if missing:
+            print("找不到 CP 資料:", "、".join(sorted(missing)))
+    rows = [p for p in rows if p.get("atk") is not None]
+
+    os.makedirs(args.out, exist_ok=True)
+    t0 = time.time()
+    done, size = {}, 0
+    for p in rows:
+        key = file_key(p)
+        if key not in done:                       # 基礎數值相同的形態共用一個檔
+            blob = pack(p, cpm_half)
+            with open(os.path.join(args.out, key + ".bin"), "wb") as f:
+                f.write(blob)
+            done[key] = []
+            size += len(blob)
+        done[key].append(p["name"])
+
+    index_path = os.path.join(args.out, "index.json")
+    index = {"levels": len(cpm_half), "files": {}}
+    if args.only and os.path.exists(index_path):  # 只重算部分時保留其他物種的對照
+        with open(index_path, encoding="utf-8") as f:
+            index["files"] = json.load(f).get("files", {})
+    for key, names in done.items():
+        for n in names:
+            index["files"][n] = key
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
+
+    print(f"已產生 {len(done)} 個反查檔({len(rows)} 筆寶可夢,{size // 1024} KB)"
+          f" → {os.path.relpath(args.out, ROOT)}  耗時 {time.time() - t0:.1f} 秒")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    q = sub.add_parser("query", help="反查一隻寶可夢的 IV/等級")
+    q.add_argument("name", help="POKEMON_CP_DATA 的 name")
+    q.add_argument("--cp", type=int, required=True)
+    q.add_argument("--hp", type=int)
+    q.add_argument("--dust", type=int, help="強化一次要的星塵")
+    q.add_argument("--floor", type=int, default=0, help="三項 IV 的下限(團體戰 10)")
+    q.add_argument("--stars", type=int, choices=range(5), help="評價至少幾星")
+    q.add_argument("--limit", type=int, default=30, help="最多列出幾筆")
+    q.set_defaults(func=cmd_query)
+    b = sub.add_parser("build", help="產生前端用的反查資料檔")
+    b.add_argument("--only", nargs="+", metavar="名稱", help="只產生這幾隻(POKEMON_CP_DATA 的 name)")
+    b.add_argument("--out", default=OUT, help="輸出目錄(預設 data/cp-reverse)")
+    b.set_defaults(func=cmd_build)
+    args = ap.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""data/ 底下大型 JS 資料檔的共用讀取器,附 pickle 快照。
+
+precomputed_pokemon_cp.js(約 0.5 MB)與 pokemon_data_and_rankings.js(約 1.4 MB)是給前端 <script> 載入的,
+Python 這邊原本每支腳本各自用 regex、ast.literal_eval 或括號配對解析一次,一次就要幾百毫秒。
+這裡統一解析,並把結果 pickle 到快取目錄;下次只要檔案的 mtime 與大小都沒變就直接讀快照。
+
+快取目錄:環境變數 POGO_CACHE_DIR,預設 <repo>/.cache(已列在 .gitignore)。
+CI 會把它指到 runner 的暫存目錄 —— deploy.yml 把整個 repo 目錄上傳成 Pages,放在 repo 裡會一起被部署。
+快照寫入失敗(唯讀目錄等)不影響結果,只是每次都重新解析。
+
+POKEMON_CP_DATA 另有 refresh_cp_data.py 一起寫出的 data/precomputed_pokemon_cp.json(內容同 CpData),
+load_cp_data() 優先讀它,不必 ast.literal_eval 那一大段 JS。JSON 裡記著對應 JS 檔的 sha1,
+JS 被手動改過(跟 JSON 對不上)就退回解析 JS。沒有網路也能補產生:python scripts/data_snapshot.py
+
+呼叫端拿到的是新的物件(pickle 每次都重建),可以放心修改,不會互相影響。
+"""
+import ast, hashlib, json, os, pickle, re
+from typing import NamedTuple, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, "data")
+CP_SRC = os.path.join(DATA, "precomputed_pokemon_cp.js")
+CP_JSON = os.path.join(DATA, "precomputed_pokemon_cp.json")
+RANK_SRC = os.path.join(DATA, "pokemon_data_and_rankings.js")
+CACHE_DIR = os.environ.get("POGO_CACHE_DIR") or os.path.join(ROOT, ".cache")
+# 解析結果的格式改了就加一,舊快照自動作廢
+SNAPSHOT_VERSION = 1
+
+
+class CpData(NamedTuple):
+    """precomputed_pokemon_cp.js 的內容。"""
+    rows: list                              # POKEMON_CP_DATA 各列(dict:id、name、atk/def/sta、gm…)
+    cpm: list                               # CP_MULTIPLIER,index = 等級-1
+    cpm_half: Optional[list] = None         # CP_MULTIPLIER_HALF,index = (等級-1)×2;舊版資料檔沒有
+    power_up_cost: Optional[dict] = None    # POWER_UP_COST;舊版資料檔沒有
+
+
+class RankData(NamedTuple):
+    """pokemon_data_and_rankings.js 的內容。"""
+    pokedex: list                           # POKEDEX
+    rankings: dict                          # 聯盟 CP 上限(1500/2500/10000)→ POKEMON_RANKINGS_<上限>
+
+
+def js_block(text, name, open_ch="["):
+    """`const <name> = [...]`(或 {...})那一段的原始文字,用括號配對找結尾;找不到回傳 None。
+
+    字串裡出現括號會配錯,但這幾個檔的字串(名稱、網址、招式代號)都不含括號。"""
+    m = re.search(rf"const {name}\s*=\s*", text)
+    if not m:
+        return None
+    close_ch = "]" if open_ch == "[" else "}"
+    j = m.end()
+    depth = 0
+    for k in range(j, len(text)):
+        c = text[k]
+        if c == open_ch:
+            depth += 1
+        elif c == close_ch:
+            depth -= 1
+            if depth == 0:
+                return text[j:k + 1]
+    return None
+
+
+def _parse_cp(text):
+    # POKEMON_CP_DATA 是單引號 key 的 JS 物件,剛好是合法的 Python 字面值;其他幾個都是 json.dumps 寫的
+    rows = ast.literal_eval(js_block(text, "POKEMON_CP_DATA"))
+    cpm = json.loads(js_block(text, "CP_MULTIPLIER"))
+    half = js_block(text, "CP_MULTIPLIER_HALF")
+    cost = js_block(text, "POWER_UP_COST", "{")
+    return CpData(rows, cpm, json.loads(half) if half else None, json.loads(cost) if cost else None)
+
+
+def _parse_rank(text):
+    return RankData(json.loads(js_block(text, "POKEDEX")),
+                    {cap: json.loads(js_block(text, f"POKEMON_RANKINGS_{cap}")) for cap in (1500, 2500, 10000)})
+
+
+def _snapshot(path, parse):
+    """解析 path(有快照就用快照)。快照以 (mtime, 大小, 格式版本) 判斷是否還有效。"""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size, SNAPSHOT_VERSION)
+    snap = os.path.join(CACHE_DIR, f"{os.path.basename(path)}.pickle")
+    try:
+        with open(snap, "rb") as f:
+            saved = pickle.load(f)
+        if saved["key"] == key:
+            return saved["data"]
+    except Exception:
+        pass
+    with open(path, encoding="utf-8") as f:
+        data = parse(f.read())
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{snap}.{os.getpid()}.tmp"          # 先寫暫存檔再換名,平行執行時不會讀到寫一半的快照
+        with open(tmp, "wb") as f:
+            pickle.dump({"key": key, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snap)
+    except OSError:
+        pass
+    return data
+
+
+def _sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def write_cp_json(data, js_sha1=None, path=CP_JSON):
+    """CpData → JSON 副本(refresh_cp_data.py 寫完 JS 之後呼叫)。js_sha1 不給就算目前 JS 檔的。"""
+    doc = {"source_sha1": js_sha1 or _sha1(CP_SRC), **data._asdict()}
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+
+
+def _load_cp_json():
+    """JSON 副本 → CpData;沒有檔案或跟目前的 JS 對不上回傳 None。"""
+    try:
+        with open(CP_JSON, encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if doc.pop("source_sha1", None) != _sha1(CP_SRC):
+        return None
+    return CpData(**doc)
+
+
+def load_cp_data():
+    """data/precomputed_pokemon_cp.js → CpData(有對得上的 JSON 副本就讀副本)。"""
+    return _load_cp_json() or _snapshot(CP_SRC, _parse_cp)
+
+
+def load_rankings():
+    """data/pokemon_data_and_rankings.js → RankData。"""
+    return _snapshot(RANK_SRC, _parse_rank)
+
+
+if __name__ == "__main__":
+    write_cp_json(_snapshot(CP_SRC, _parse_cp))
+    print(f"已寫入 {os.path.relpath(CP_JSON, ROOT)}")
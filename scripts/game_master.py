@@ -0,0 +1,145 @@
+"""PokeMiners GAME_MASTER(latest.json)的串流解析,refresh_cp_data.py 與 trade-list/build_data.py 共用。
+
+latest.json 約 10 MB、上萬個 template,兩支腳本原本都是整份 json.loads 成一個大 list,
+再各自用 regex 掃 templateId 找 pokemonSettings / formSettings。這裡改成一次讀一段、
+用 JSONDecoder.raw_decode 逐個 template 解碼,只留呼叫端要的那幾種;記憶體只跟留下來的記錄有關,
+第一筆記錄也不必等整個檔案下載完。
+
+    gm = game_master.fetch()                  # 下載(經 http_cache,沒變就是 304)+ 解析 → GameMaster
+    gm = game_master.read(open(path, "rb"))   # 本機檔案
+    for tid, kind, payload in game_master.iter_templates(f, {"pokemonSettings"}): ...
+
+GameMaster.pokemon 的每一筆(依 GM 裡的順序):
+    tid        templateId(V0025_POKEMON_PIKACHU…)
+    dex        全國圖鑑編號
+    species    pokemonId(PIKACHU)
+    form       去掉物種前綴的 form 代碼;基本型為 None
+    raw_form   GM 原本的 form 值(sprite 檔名有時保留物種前綴)
+    atk / def / sta   基礎數值;GM 沒寫就是 None
+    tradable   True / False / None(None = GM 沒講,見 _tradable())
+    class      pokemonClass(POKEMON_CLASS_LEGENDARY…);一般寶可夢是 None
+GameMaster.forms 的每一筆:dex、species、forms = {form 代碼: 是否為造型(isCostume)}。
+"""
+import codecs, json, re
+from typing import NamedTuple, Optional
+
+import http_cache
+
+GM_URL = "https://raw.githubusercontent.com/PokeMiners/game_masters/master/latest/latest.json"
+# 預設只留這幾種 template(data 底下的 key)
+KINDS = frozenset({"pokemonSettings", "formSettings", "playerLevel", "pokemonUpgrades"})
+
+_POKEMON_TID = re.compile(r"V(\d+)_POKEMON_")
+_FORMS_TID = re.compile(r"FORMS_V(\d+)_POKEMON_(.+)")
+_SEP = re.compile(r"[\s,]*")
+
+
+class GameMaster(NamedTuple):
+    pokemon: list                            # pokemon_record() 的結果
+    forms: list                              # form_record() 的結果
+    cp_multiplier: Optional[list] = None     # PLAYER_LEVEL_SETTINGS 的 cpMultiplier(GM 原始值)
+    upgrades: Optional[dict] = None          # POKEMON_UPGRADE_SETTINGS 的 pokemonUpgrades
+
+
+def iter_templates(f, kinds=KINDS, chunk_size=1 << 20):
+    """從檔案(文字或二進位串流)逐個解碼 GAME_MASTER 的 template → (templateId, data 的 key, 內容)。
+
+    只產出 data 底下的 key 在 kinds 裡的 template;kinds=None 就全部產出。"""
+    dec = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")("ignore")   # 一段的結尾可能切在多位元組字元中間
+
+    def read():
+        part = f.read(chunk_size)
+        return utf8.decode(part, final=not part) if isinstance(part, bytes) else part
+
+    buf, pos, eof = read(), 0, False
+    pos = _SEP.match(buf, pos).end()
+    if not buf.startswith("[", pos):
+        raise ValueError("GAME_MASTER 應該是 JSON 陣列")
+    pos += 1
+    while True:
+        pos = _SEP.match(buf, pos).end()
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        try:
+            if pos >= len(buf):
+                raise json.JSONDecodeError("", buf, pos)
+            e, pos = dec.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # 這個 template 還沒讀完整:丟掉已經處理完的部分,再讀一段
+            if eof:
+                raise ValueError("GAME_MASTER 不完整(檔案在陣列結束前就斷了)")
+            more = read()
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        data = e.get("data") or {}
+        for kind, payload in data.items():
+            if kinds is None or kind in kinds:
+                yield e.get("templateId", ""), kind, payload
+
+
+def _form_code(species, form):
+    """GM 的 form 值 → 去掉物種前綴的代碼(PIKACHU_FLYING_5TH_ANNIV → FLYING_5TH_ANNIV);沒有 form 是 None。"""
+    if form and form.startswith(species + "_"):
+        return form[len(species) + 1:]
+    return form or None
+
+
+def _tradable(ps):
+    """單一型態的 isTradable。GM 對某些型態根本沒寫這個欄位,不能一律當成 False ——
+    王之劍蒼響 / 王之盾藏瑪然特就是這樣(欄位缺席,但 isTransferable 是 true),實際遊戲裡可以交換。
+    真正鎖住的合體型態(黑白酋雷姆、基格爾德、奈克洛茲瑪合體、無極汰那)是「兩個欄位一起缺席」。
+    → 缺席但可轉移 = GM 只是沒重寫,回 None 讓呼叫端退回該 dex 基本型的值。"""
+    t = ps.get("isTradable")
+    if t is not None:
+        return bool(t)
+    return None if ps.get("isTransferable") else False
+
+
+def pokemon_record(tid, ps):
+    """pokemonSettings template → 正規化的 dict(欄位見模組說明);templateId 不是 V####_POKEMON_ 開頭回傳 None。"""
+    m = _POKEMON_TID.match(tid)
+    if not (m and ps):
+        return None
+    st = ps.get("stats") or {}
+    species = ps.get("pokemonId", "")
+    return {"tid": tid, "dex": int(m.group(1)), "species": species,
+            "form": _form_code(species, ps.get("form") or ""), "raw_form": ps.get("form") or None,
+            "atk": st.get("baseAttack"), "def": st.get("baseDefense"), "sta": st.get("baseStamina"),
+            "tradable": _tradable(ps), "class": ps.get("pokemonClass")}
+
+
+def form_record(tid, fs):
+    """formSettings template → dict(dex, species, forms={代碼: isCostume});不是 FORMS_V####_POKEMON_ 回傳 None。"""
+    m = _FORMS_TID.fullmatch(tid)
+    if not (m and fs):
+        return None
+    species = fs.get("pokemon", "")
+    return {"dex": int(m.group(1)), "species": species,
+            "forms": {_form_code(species, f["form"]): bool(f.get("isCostume")) for f in fs.get("forms", [])}}
+
+
+def read(f):
+    """整份 GAME_MASTER 串流 → GameMaster(只留寶可夢、形態、CP 倍率、強化花費)。"""
+    pokemon, forms, cpm, upgrades = [], [], None, None
+    for tid, kind, payload in iter_templates(f):
+        if kind == "pokemonSettings":
+            rec = pokemon_record(tid, payload)
+            if rec:
+                pokemon.append(rec)
+        elif kind == "formSettings":
+            rec = form_record(tid, payload)
+            if rec:
+                forms.append(rec)
+        elif kind == "playerLevel" and tid == "PLAYER_LEVEL_SETTINGS":
+            cpm = payload.get("cpMultiplier")
+        elif kind == "pokemonUpgrades" and tid == "POKEMON_UPGRADE_SETTINGS":
+            upgrades = payload
+    return GameMaster(pokemon, forms, cpm, upgrades)
+
+
+def fetch(url=GM_URL, headers=None, timeout=180):
+    """下載並解析 GAME_MASTER(邊下載邊解析;經 http_cache,沒變就直接讀磁碟)。"""
+    with http_cache.open_url(url, headers, timeout) as f:
+        return read(f)
@@ -1,4 +1,4 @@
-import requests
+import http_cache
 import json
 import os
 import math
@@ -156,7 +156,7 @@ def fetch_and_generate_data():
     try:
         print("正在獲取遊戲主數據 (gamemaster.json)...")
         gm_url = "https://pvpoketw.com/data/gamemaster.json"
-        game_master = requests.get(gm_url, timeout=15).json()
+        game_master = http_cache.get_json(gm_url, timeout=15)
         print("主數據獲取成功。")
 
         leagues_to_fetch = ['1500', '2500', '10000']
@@ -164,16 +164,17 @@ def fetch_and_generate_data():
         for cp in leagues_to_fetch:
             print(f"正在獲取 CP {cp} 的排名數據...")
             rankings_url = f"https://pvpoketw.com/data/rankings/all/overall/rankings-{cp}.json"
-            rankings_json = requests.get(rankings_url, timeout=15).json()
+            rankings_json = http_cache.get_json(rankings_url, timeout=15)
             all_rankings_data[cp] = rankings_json
             print(f"CP {cp} 排名數據獲取成功。")
 
-    except requests.exceptions.RequestException as e:
-        print(f"錯誤：數據獲取失敗。 {e}")
-        return
     except json.JSONDecodeError as e:
         print(f"錯誤：解析 JSON 失敗。 {e}")
         return
+    except OSError as e:   # urllib 的 URLError / HTTPError / timeout 都是 OSError
+        print(f"錯誤：數據獲取失敗。 {e}")
+        return
+    print(http_cache.summary())
         
     pokedex_data = process_gamemaster(game_master)
     
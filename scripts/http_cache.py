@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""上游 JSON / 文字檔的 HTTP 磁碟快取:存下內容與 ETag / Last-Modified,下次帶條件式請求。
+
+GAME_MASTER(約 10 MB)、holoholo-text 的英/繁文本、APK 語系檔這些每 8 小時就整包重抓一次,
+但大部分時候內容根本沒變。這裡第一次抓到時把內容連同驗證資訊存進快取目錄;
+之後送 If-None-Match / If-Modified-Since,伺服器回 304 就直接讀磁碟上的那份。
+GitHub API 的 304 回應也不算進每小時的額度。
+
+    import http_cache
+    gm = http_cache.get_json(GM_URL, timeout=180)
+    text = http_cache.get_text(url, headers=HEADERS)
+    with http_cache.open_url(GM_URL) as f:   # 大檔用串流讀,不必整份放進記憶體(game_master.py)
+        ...
+    print(http_cache.summary())      # 命中/未命中/省下多少流量
+
+快取目錄:POGO_CACHE_DIR(同 data_snapshot.py)底下的 http/,每個網址一個 <sha1>.body + <sha1>.json。
+只用標準函式庫,refresh_cp_data.py 不必多裝 requests。網路錯誤照原樣丟出(urllib.error.URLError、
+HTTPError,都是 OSError),快取不會拿舊資料頂替 —— 呼叫端原本怎麼處理下載失敗就怎麼處理。
+
+    python scripts/http_cache.py             # 列出目前快取的網址
+    python scripts/http_cache.py --selftest  # 起一個本機的 HTTP 伺服器,驗證 200 → 304 → 內容更新
+"""
+import argparse, gzip, hashlib, io, json, os, sys, threading, time, urllib.error, urllib.request, zlib
+
+from data_snapshot import CACHE_DIR
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+
+class _Download(io.RawIOBase):
+    """200 回應的內容:邊讀邊解 gzip,同時寫進快取的暫存檔;讀到結尾才換名成正式快取,
+    讀一半就關掉不會留下不完整的檔。"""
+
+    def __init__(self, cache, url, resp):
+        self._cache, self._url, self._resp = cache, url, resp
+        gz = resp.headers.get("Content-Encoding") == "gzip"
+        self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if gz else None
+        self._pending, self._eof, self._size = b"", False, 0
+        self._meta = {"url": url, "etag": resp.headers.get("ETag"),
+                      "last_modified": resp.headers.get("Last-Modified")}
+        self._out = self._tmp = None
+        if self._meta["etag"] or self._meta["last_modified"]:   # 沒有驗證資訊,存了下次也沒辦法問
+            body_path, _ = cache._paths(url)
+            self._tmp = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(cache.root, exist_ok=True)
+                self._out = open(self._tmp, "wb")
+            except OSError:
+                self._out = None
+
+    def readable(self):
+        return True
+
+    def _write(self, data):
+        self._size += len(data)
+        self._pending += data
+        if self._out:
+            try:
+                self._out.write(data)
+            except OSError:
+                self._drop()
+
+    def _drop(self):
+        if self._out:
+            self._out.close()
+            self._out = None
+            try:
+                os.remove(self._tmp)
+            except OSError:
+                pass
+
+    def _finish(self):
+        """整份讀完:內容換名成正式快取,再寫 meta(_load() 會核對大小,中途失敗就當作沒快取)。"""
+        if not self._out:
+            return
+        self._out.close()
+        self._out = None
+        body_path, meta_path = self._cache._paths(self._url)
+        meta = dict(self._meta, size=self._size, fetched=int(time.time()))
+        try:
+            os.replace(self._tmp, body_path)
+            tmp = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp, meta_path)
+        except OSError:
+            pass
+
+    def readinto(self, b):
+        while not self._pending and not self._eof:
+            chunk = self._resp.read(1 << 16)
+            self._cache._add(fetched=len(chunk))
+            if chunk:
+                self._write(self._inflate.decompress(chunk) if self._inflate else chunk)
+            else:
+                if self._inflate:
+                    self._write(self._inflate.flush())
+                self._eof = True
+                self._finish()
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._drop()
+            self._resp.close()
+        super().close()
+
+
+class HttpCache:
+    """一個快取目錄。模組層級的 open_url() / get_bytes() / get_text() / get_json() 用的是預設的那一個(DEFAULT)。"""
+
+    def __init__(self, root):
+        self.root = root
+        self.stats = {"hit": 0, "miss": 0, "saved": 0, "fetched": 0}
+        self._lock = threading.Lock()      # refresh_cp_data.py 會從多個執行緒同時下載
+
+    def _add(self, **counts):
+        with self._lock:
+            for k, v in counts.items():
+                self.stats[k] += v
+
+    def _paths(self, url):
+        h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, h + ".body"), os.path.join(self.root, h + ".json")
+
+    def _load(self, url):
+        """快取裡這個網址的 meta;沒有或內容檔不完整回傳 None。"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            size = os.path.getsize(body_path)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or meta.get("size") != size:
+            return None
+        return meta
+
+    def open(self, url, headers=None, timeout=60):
+        """url 內容的二進位串流(用 with 包起來)。快取裡有且伺服器回 304 就是開磁碟上的檔;
+        否則邊下載邊讀,讀完同時存進快取 —— 大檔不必整份先放進記憶體。"""
+        meta = self._load(url)
+        h = {"Accept-Encoding": "gzip", **(headers or {})}
+        if meta:
+            if meta.get("etag"):
+                h["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                h["If-Modified-Since"] = meta["last_modified"]
+        try:
+            resp = urllib.request.urlopen(urllib.request.Request(url, headers=h), timeout=timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and meta:
+                self._add(hit=1, saved=meta["size"])
+                return open(self._paths(url)[0], "rb")
+            raise
+        self._add(miss=1)
+        return io.BufferedReader(_Download(self, url, resp), 1 << 16)
+
+    def get_bytes(self, url, headers=None, timeout=60):
+        """下載 url 的內容;快取裡有且伺服器回 304 就用快取。"""
+        with self.open(url, headers, timeout) as f:
+            return f.read()
+
+    def get_text(self, url, headers=None, timeout=60, errors="strict"):
+        return self.get_bytes(url, headers, timeout).decode("utf-8", errors)
+
+    def get_json(self, url, headers=None, timeout=60):
+        return json.loads(self.get_text(url, headers, timeout, errors="ignore"))
+
+    def summary(self):
+        s = self.stats
+        return (f"HTTP 快取:命中 {s['hit']}、未命中 {s['miss']},"
+                f"省下 {s['saved'] / 1e6:.1f} MB(實際下載 {s['fetched'] / 1e6:.1f} MB)")
+
+
+DEFAULT = HttpCache(os.path.join(CACHE_DIR, "http"))
+open_url, get_bytes, get_text, get_json = DEFAULT.open, DEFAULT.get_bytes, DEFAULT.get_text, DEFAULT.get_json
+summary = DEFAULT.summary
+
+
+def selftest():
+    """本機起一個會回 ETag 的 HTTP 伺服器,確認第一次是 miss、第二次 304 命中、內容換了會重新下載。"""
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    state = {"body": b'{"v": 1}', "requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            etag = '"%s"' % hashlib.sha1(state["body"]).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = state["body"]
+            gz = "gzip" in (self.headers.get("Accept-Encoding") or "")
+            if gz:
+                body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            if gz:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{srv.server_address[1]}/gm.json"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            c = HttpCache(tmp)
+            assert c.get_json(url) == {"v": 1} and c.stats["miss"] == 1, ("第一次", c.stats)
+            assert c.get_json(url) == {"v": 1} and c.stats["hit"] == 1, ("沒變", c.stats)
+            state["body"] = b'{"v": 2}'
+            assert c.get_json(url) == {"v": 2} and c.stats["miss"] == 2, ("內容更新", c.stats)
+            assert HttpCache(tmp).get_json(url) == {"v": 2}, "新的 HttpCache 讀不到磁碟上的快取"
+            state["body"] = b'{"v": 3}'
+            etag = c._load(url)["etag"]
+            with c.open(url) as f:                  # 讀一半就關掉:快取要維持原樣,不能存進不完整的內容
+                f.read(3)
+            assert c._load(url)["etag"] == etag and not any(fn.endswith(".tmp") for fn in os.listdir(tmp)), "讀一半"
+            assert c.get_json(url) == {"v": 3} and c.stats["miss"] == 4, ("讀一半之後", c.stats)
+            print(f"selftest OK({state['requests']} 次請求)  {c.summary()}")
+    finally:
+        srv.shutdown()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--selftest", action="store_true", help="用本機伺服器驗證快取流程")
+    args = ap.parse_args()
+    if args.selftest:
+        return selftest()
+    root = DEFAULT.root
+    metas = []
+    for fn in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        if fn.endswith(".json"):
+            with open(os.path.join(root, fn), encoding="utf-8") as f:
+                metas.append(json.load(f))
+    for m in sorted(metas, key=lambda m: m["url"]):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(m["fetched"]))
+        print(f"{m['size'] / 1e6:7.2f} MB  {when}  {m['url']}")
+    print(f"共 {len(metas)} 個網址 → {root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""對同一個網站一次抓很多頁：同時下載、每個主機各自限速（token bucket），失敗退避重試，連線重複使用。
+
+scrape_special_research.py 原本一頁一頁 requests.get，每頁之間再 time.sleep(1)，
+第一次跑（或快取清掉）要抓幾百頁，總時間 = 每頁延遲 + 1 秒 的總和。這裡改成：
+
+  * 每個主機一個 TokenBucket：平均每秒最多 rate 個請求，可以一次連發 burst 個。
+    對 Serebii 的禮貌由它負責，不再靠 sleep —— 總時間接近「頁數 ÷ rate」。
+  * workers 個執行緒共用一個 requests.Session（keep-alive，不必每頁重新握手）。
+  * 連線錯誤、逾時、429 / 5xx 會退避重試（backoff × 2ⁿ，加一點亂數；429/503 有 Retry-After 就照它）；
+    重試一樣要先拿 token。其他 4xx 直接當失敗。
+  * map() 依完成順序交回結果，呼叫端在主執行緒解析、翻譯的同時，其他頁還在下載。
+    翻譯那一層（translation_cache、未翻譯報告）不是執行緒安全的，所以只有下載在背景。
+
+    fetcher = Fetcher(HEADERS, rate=1.0, burst=2, workers=4)
+    html = fetcher.get(INDEX_URL)
+    for url, html, err in fetcher.map(urls):   # 完成一頁交回一頁；err 是最後一次的例外
+        ...
+    print(fetcher.summary())
+
+    python scripts/polite_fetch.py --selftest  # 起一個本機的 HTTP 伺服器，驗證限速與重試
+"""
+import argparse, random, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """平均每秒 rate 個、最多累積 burst 個的 token。acquire() 拿一個，沒有就睡到輪到自己為止。
+
+    token 可以預支成負數：同時來搶的執行緒各自記下要等多久再一起去睡，不必在鎖裡排隊，先到先拿。"""
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate 要大於 0")
+        self.rate, self.burst = float(rate), max(1, int(burst))
+        self.tokens, self.stamp = float(self.burst), time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """拿一個 token → 實際等了幾秒。"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate) - 1
+            self.stamp = now
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class Fetcher:
+    """一組共用 Session 的下載執行緒，每個主機各自一個 TokenBucket（見模組說明）。"""
+
+    def __init__(self, headers=None, rate=1.0, burst=2, workers=4, retries=3, backoff=1.0, timeout=60):
+        self.rate, self.burst, self.workers = rate, burst, max(1, workers)
+        self.retries, self.backoff, self.timeout = retries, backoff, timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {"ok": 0, "failed": 0, "retries": 0, "bytes": 0, "waited": 0.0}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._t0 = None
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def _add(self, **counts):
+        with self._lock:
+            for k, v in counts.items():
+                self.stats[k] += v
+
+    def _delay(self, attempt, resp=None):
+        """第 attempt 次重試前要等多久：Retry-After（秒數）優先，否則指數退避加亂數。"""
+        after = resp.headers.get("Retry-After", "") if resp is not None else ""
+        if after.strip().isdigit():
+            return float(after)
+        return self.backoff * 2 ** attempt + random.uniform(0, self.backoff)
+
+    def get(self, url):
+        """下載 url 的文字內容（限速 + 重試）。重試完還是失敗就丟出最後一次的例外（requests 的例外）。"""
+        if self._t0 is None:
+            self._t0 = time.monotonic()
+        bucket = self._bucket(url)
+        for attempt in range(self.retries + 1):
+            self._add(waited=bucket.acquire())
+            resp = None
+            try:
+                resp = self.session.get(url, timeout=self.timeout)
+                if resp.status_code not in RETRY_STATUS:
+                    resp.raise_for_status()
+                    self._add(ok=1, bytes=len(resp.content))
+                    return resp.text
+                if attempt == self.retries:
+                    resp.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    self._add(failed=1)
+                    raise
+            except requests.HTTPError:
+                self._add(failed=1)
+                raise
+            self._add(retries=1)
+            time.sleep(self._delay(attempt, resp))
+
+    def map(self, urls):
+        """同時下載 urls，依完成順序產出 (url, 文字, None) 或 (url, None, 例外)。
+
+        只有下載在背景執行緒；產出之後的處理（解析、翻譯）在呼叫端的執行緒，期間其他頁照樣在下載。
+        中途不讀了（break / 例外）會取消還沒開始的下載。"""
+        ex = ThreadPoolExecutor(self.workers)
+        try:
+            futs = {ex.submit(self.get, u): u for u in urls}
+            for fut in as_completed(futs):
+                err = fut.exception()
+                yield futs[fut], (None if err else fut.result()), err
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
+
+    def summary(self):
+        s = self.stats
+        took = time.monotonic() - self._t0 if self._t0 is not None else 0.0
+        return (f"下載：成功 {s['ok']}、失敗 {s['failed']}、重試 {s['retries']}，"
+                f"{s['bytes'] / 1e6:.1f} MB，{took:.1f} 秒（限速每秒 {self.rate:g} 個、連發 {self.burst}；"
+                f"排隊等 token 共 {s['waited']:.1f} 秒）")
+
+
+def selftest():
+    """本機起一個 HTTP 伺服器：確認限速（N 頁至少要 (N - burst) / rate 秒）、503 / 斷線會重試、404 不重試。"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    state = {"requests": 0, "flaky": {"/p3": 2}, "stamps": []}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"     # keep-alive，Session 才會重複使用連線
+
+        def do_GET(self):
+            with lock:
+                state["requests"] += 1
+                state["stamps"].append(time.monotonic())
+                flaky = state["flaky"].get(self.path, 0)
+                if flaky:
+                    state["flaky"][self.path] = flaky - 1
+            if self.path == "/missing":
+                status, body = 404, b"no"
+            elif flaky:
+                status, body = 503, b"busy"
+            else:
+                status, body = 200, self.path.encode()
+            self.send_response(status)
+            if status == 503:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    try:
+        rate, burst = 20.0, 3
+        f = Fetcher(rate=rate, burst=burst, workers=6, retries=3, backoff=0.01)
+        urls = [f"{base}/p{i}" for i in range(12)] + [f"{base}/missing"]
+        t0 = time.monotonic()
+        got = {u: (text, err) for u, text, err in f.map(urls)}
+        took = time.monotonic() - t0
+        assert all(got[u][0] == "/p%d" % i for i, u in enumerate(urls[:12])), got
+        err = got[urls[-1]][1]
+        assert isinstance(err, requests.HTTPError) and err.response.status_code == 404, err
+        assert state["requests"] == 15 and f.stats["retries"] == 2, (state["requests"], f.stats)
+        floor = (state["requests"] - burst) / rate
+        assert took >= floor * 0.9, f"{took:.2f} 秒 < 限速下限 {floor:.2f} 秒"
+        gaps = sorted(b - a for a, b in zip(state["stamps"], state["stamps"][1:]))
+        print(f"selftest OK（{state['requests']} 次請求，{took:.2f} 秒，下限 {floor:.2f} 秒；"
+              f"請求間隔中位數 {gaps[len(gaps) // 2] * 1e3:.0f} ms）  {f.summary()}")
+    finally:
+        srv.shutdown()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--selftest", action="store_true", help="用本機伺服器驗證限速與重試")
+    args = ap.parse_args()
+    if args.selftest:
+        return selftest()
+    ap.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""從 Pokémon GO 官方資料重新整理 data/precomputed_pokemon_cp.js。
+"""從 Pokémon GO 官方資料重新整理 data/precomputed_pokemon_cp.js(與給 Python 端讀的 .json 副本)。
 
 一次處理三件事，全部只靠網路來源，**不需要本機的 pogo_assets clone**，所以可以掛在 CI 上跑：
   1. CP 與基礎數值  ← GAME_MASTER（Niantic 調平衡時會自動跟上）
@@ -20,7 +20,13 @@
 
 用法:python scripts/refresh_cp_data.py [--dry-run]
 """
-import argparse, ast, json, math, os, re, sys, urllib.request
+import argparse, hashlib, json, os, re, sys, time, urllib.error, urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import game_master, http_cache
+from cp_engine import cp_iv, half_levels, pick
+from data_snapshot import CP_JSON, CpData, load_cp_data, write_cp_json
+from sprite_index import SpriteIndex
 
 try:
     sys.stdout.reconfigure(encoding="utf-8")
@@ -29,13 +35,16 @@ except Exception:
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SRC = os.path.join(ROOT, "data", "precomputed_pokemon_cp.js")
-GM_URL = "https://raw.githubusercontent.com/PokeMiners/game_masters/master/latest/latest.json"
+CHANGES = os.path.join(ROOT, "data", "cp_changes.json")   # 這次更新的結構化差異,見 change_report()
 I18N_URL = ("https://raw.githubusercontent.com/PokeMiners/pogo_assets/master/"
             "Texts/Latest%20APK/JSON/i18n_chinesetraditional.json")
 SPRITE_DIR = "Images/Pokemon - 256x256/Addressable Assets"
 SPRITE_BASE = ("https://raw.githubusercontent.com/PokeMiners/pogo_assets/master/"
                "Images/Pokemon%20-%20256x256/Addressable%20Assets/")
 MAX_LEVEL, BEST_BUDDY_LEVEL = 50, 51
+KEY_LEVELS = (15, 20, 25)   # 資料列存的 cp15/cp20/cp25,也是 CP 反查用的三個等級
+# 下載的逾時:單一請求(連線/每次讀取)與三個一起抓的總時限,單位秒
+FETCH_TIMEOUT, FETCH_DEADLINE = 180, 300
 
 # 遊戲 APK 自己就沒有中文的形態，只能自己補。
 # 這幾個是人工翻的，跟官方用語若有出入請直接改這裡（改完重跑就會生效）。
@@ -82,26 +91,137 @@ DEFAULT_FORMS = ("NORMAL", "STANDARD", "INCARNATE", "SPRING", "SHIELD", "ORDINAR
                  "MALE")
 
 
-def get_json(url, token=None):
+def _headers(token=None):
     h = {"User-Agent": "Mozilla/5.0 refresh-cp", "Accept": "application/vnd.github+json"}
     if token:
         h["Authorization"] = "Bearer " + token
-    return json.loads(urllib.request.urlopen(urllib.request.Request(url, headers=h), timeout=180)
-                      .read().decode("utf-8", "ignore"))
+    return h
+
+
+def get_json(url, token=None, timeout=FETCH_TIMEOUT):
+    return http_cache.get_json(url, _headers(token), timeout=timeout)   # 沒變的檔(語系檔、trees)伺服器回 304
+
+
+def load_gm():
+    """GAME_MASTER → game_master.GameMaster(邊下載邊解析,只留寶可夢與等級/強化設定)。"""
+    return game_master.fetch(game_master.GM_URL, _headers(), FETCH_TIMEOUT)
 
 
 def sprite_filenames(token=None):
-    """用 GitHub trees API 列出 sprite 檔名(3700 多個，實測不會被 truncate)。"""
+    """用 GitHub trees API 列出 sprite 檔名(3700 多個，實測不會被 truncate)→ SpriteIndex。
+
+    trees API 接受 `master:<路徑>` 當 tree-ish,一次請求就拿到 sprite 目錄;
+    不支援(404/422)時才退回從根目錄一層一層走(四次來回)。
+    不用 ?recursive=1:pogo_assets 整個 repo 的檔案數會被 GitHub 截斷。"""
     api = "https://api.github.com/repos/PokeMiners/pogo_assets/git/trees/"
-    node = get_json(api + "master", token)
-    for part in SPRITE_DIR.split("/"):
-        nxt = next((x for x in node["tree"] if x["path"] == part), None)
-        if not nxt:
-            raise RuntimeError("找不到 sprite 目錄:" + part)
-        node = get_json(api + nxt["sha"], token)
+    try:
+        node = get_json(api + "master:" + urllib.parse.quote(SPRITE_DIR), token)
+    except urllib.error.HTTPError as e:
+        if e.code not in (404, 422):
+            raise
+        node = get_json(api + "master", token)
+        for part in SPRITE_DIR.split("/"):
+            nxt = next((x for x in node["tree"] if x["path"] == part), None)
+            if not nxt:
+                raise RuntimeError("找不到 sprite 目錄:" + part)
+            node = get_json(api + nxt["sha"], token)
     if node.get("truncated"):
         raise RuntimeError("sprite 清單被 GitHub 截斷了，需要改用分頁抓取")
-    return {x["path"] for x in node["tree"] if x["path"].endswith(".icon.png")}
+    return SpriteIndex(x["path"] for x in node["tree"] if x["path"].endswith(".icon.png"))
+
+
+def power_up_costs(up, max_level=MAX_LEVEL):
+    """GAME_MASTER 的 POKEMON_UPGRADE_SETTINGS → 從 Lv1 強化到各半等級的累計花費。
+
+    GM 的 stardustCost / candyCost 是「每個整數等級」一格(index = 等級-1),
+    同一等級的兩次強化(L→L+0.5、L+0.5→L+1)花費相同。maxNormalUpgradeLevel(Lv40)之後改收 XL 糖果;
+    xlCandyCost 若比 stardustCost 短,就是從 Lv40 起算的那一段。
+    回傳 {"stardust": [...], "candy": [...], "xlCandy": [...]},index 與 CP_MULTIPLIER_HALF 相同,到 max_level 為止。"""
+    dust, candy, xl = up.get("stardustCost") or [], up.get("candyCost") or [], up.get("xlCandyCost") or []
+    xl_from = up.get("maxNormalUpgradeLevel") or 40
+    xl_off = 0 if len(xl) >= len(dust) else xl_from - 1
+    get = lambda arr, j: arr[j] if 0 <= j < len(arr) else 0
+    out = {"stardust": [0], "candy": [0], "xlCandy": [0]}
+    for k in range((max_level - 1) * 2):          # 第 k 次強化:Lv(1 + k/2) → Lv(1 + (k+1)/2)
+        i = k // 2                                   # 所在整數等級 - 1
+        c, x = (0, get(xl, i - xl_off)) if i + 1 >= xl_from else (get(candy, i), 0)
+        out["stardust"].append(out["stardust"][-1] + get(dust, i))
+        out["candy"].append(out["candy"][-1] + c)
+        out["xlCandy"].append(out["xlCandy"][-1] + x)
+    return out
+
+
+def ambiguity_report(rows, by_fp, guessed):
+    """CP 反查分不出來的組合:同一隻(dex)有好幾個 GM 條目的 cp15/cp20/cp25 完全一樣。
+
+    只列跟 POKEMON_CP_DATA 有關的組(至少一個條目被某列用到);未知圖騰、彩粉蝶這種
+    全部形態都一樣、本來就只收一筆的不列。已經被 GM_OVERRIDE / EXTRA_FORMS 明講的標 ✓,
+    沒標的就是這次全靠「GM 裡排前面」猜的,值得人工看一眼。"""
+    used = {p.get("gm") for p in rows}
+    pinned = set(GM_OVERRIDE.values()) | set(EXTRA_FORMS)
+    groups = [g for g in by_fp.values() if len(g) > 1 and any(r["tid"] in used for r in g)]
+    print(f"CP 反查有歧義的組合:{len(groups)}(同 dex、cp15/20/25 相同)")
+    for g in groups:
+        tids = [r["tid"] for r in g]
+        mark = "✓" if pinned & set(tids) else " "
+        print(f"   {mark} #{g[0]['dex']} cp{'/'.join(str(v) for v in g[0]['cp'].values())}: "
+              + "、".join(t + ("*" if t in used else "") for t in tids))
+    for name, tid, others in guessed:
+        print(f"   ⚠ {name} 靠 CP 反查對到 {tid},同指紋的還有 {'、'.join(others)};"
+              f"若不對請加進 GM_OVERRIDE")
+
+
+def change_report(before, rows, lost):
+    """這次更新改了什麼,給 CI 的後續步驟(sitemap、靜態頁、OG 圖)只處理受影響的寶可夢。
+
+    before 是更新前每一列的副本({id(列): dict});key 一律用 gm templateId(沒有 gm 的列用名稱):
+        changed  {tid: {"name": 新名稱, "fields": {欄位: [舊值, 新值]}}}
+        added    {tid: 新的整列}         removed  {tid: 原本的整列}
+        lost     [{"id", "name"}]        對不到 GAME_MASTER、保留原值的列
+        names    受影響的名稱(新舊名都列),排序過
+    只走一遍 rows,每列用 id() 對回更新前的副本。"""
+    changed, added, seen = {}, {}, set()
+    for p in rows:
+        key = p.get("gm") or p["name"]
+        old = before.get(id(p))
+        if old is None:
+            added[key] = dict(p)
+            continue
+        seen.add(id(p))
+        fields = {k: [old.get(k), p.get(k)] for k in sorted(old.keys() | p.keys()) if old.get(k) != p.get(k)}
+        if fields:
+            changed[key] = {"name": p["name"], "fields": fields}
+    removed = {o.get("gm") or o["name"]: o for i, o in before.items() if i not in seen}
+    names = {c["name"] for c in changed.values()} | {c["fields"]["name"][0] for c in changed.values()
+                                                     if "name" in c["fields"]}
+    names |= {p["name"] for p in added.values()} | {p["name"] for p in removed.values()}
+    return {"changed": changed, "added": added, "removed": removed,
+            "lost": [{"id": i, "name": n} for i, n in lost], "names": sorted(names)}
+
+
+def fetch_all(token=None, deadline=FETCH_DEADLINE):
+    """GAME_MASTER、APK 語系檔、sprite 清單三個互不相依,用執行緒一起抓 → (GameMaster, i18n 的 data 陣列, SpriteIndex)。
+
+    總時間約等於最慢的那一個。任一個失敗就照原樣丟出例外;超過 deadline 還沒抓完就結束程式。"""
+    jobs = {"GAME_MASTER": load_gm,
+            "APK 中文語系": lambda: get_json(I18N_URL)["data"],
+            "PokeMiners 圖示清單": lambda: sprite_filenames(token)}
+    print(f"同時抓 {'、'.join(jobs)}…", flush=True)
+    t0 = time.time()
+    ex = ThreadPoolExecutor(len(jobs))
+    futs = {name: ex.submit(fn) for name, fn in jobs.items()}
+    done, pending = wait(futs.values(), timeout=deadline)
+    ex.shutdown(wait=False, cancel_futures=True)
+    if pending:
+        late = [name for name, f in futs.items() if f in pending]
+        print(f"下載超過 {deadline} 秒還沒完成:{'、'.join(late)}", file=sys.stderr, flush=True)
+        # 卡住的下載還在 worker 執行緒裡;sys.exit() 會在直譯器結束時等它們 join,等於沒有期限。
+        # 這時還沒寫過任何檔,直接結束行程。
+        sys.stdout.flush()
+        os._exit(1)
+    out = [f.result() for f in futs.values()]   # 有例外的話在這裡丟出
+    print(f"  下載完成,{time.time() - t0:.1f} 秒")
+    return out
 
 
 def main():
@@ -110,45 +230,42 @@ def main():
     args = ap.parse_args()
     token = os.environ.get("GITHUB_TOKEN")
 
-    print("抓 GAME_MASTER…", flush=True)
-    gm = get_json(GM_URL)
-    cpm = None
-    by_tid, by_dex = {}, {}
-    for e in gm:
-        tid = e.get("templateId", "")
-        if tid == "PLAYER_LEVEL_SETTINGS":
-            cpm = [round(x, 8) for x in e["data"]["playerLevel"]["cpMultiplier"][:BEST_BUDDY_LEVEL]]
-        m = re.match(r"V(\d+)_POKEMON_", tid)
-        ps = e.get("data", {}).get("pokemonSettings")
-        if not (m and ps):
-            continue
-        st = ps.get("stats") or {}
-        a, d, s = st.get("baseAttack"), st.get("baseDefense"), st.get("baseStamina")
-        if None in (a, d, s):
-            continue
-        species = ps.get("pokemonId", "")
-        raw_form = ps.get("form") or ""
-        code = raw_form[len(species) + 1:] if raw_form.startswith(species + "_") else (raw_form or None)
-        rec = {"tid": tid, "dex": int(m.group(1)), "species": species, "form": code,
-               "raw_form": raw_form or None,   # sprite 檔名有時保留物種前綴,見 image_url()
-               "atk": a, "def": d, "sta": s}
-        by_tid[tid] = rec
-        by_dex.setdefault(rec["dex"], []).append(rec)
+    gm, i18n_raw, sprites = fetch_all(token)
+    cpm = cpm_half = costs = None
+    if gm.cp_multiplier:
+        raw = gm.cp_multiplier[:BEST_BUDDY_LEVEL]
+        cpm = [round(x, 8) for x in raw]
+        # 半等級從 GM 原始值內插再四捨五入,整數等級那幾格會跟 cpm 完全一樣
+        cpm_half = [round(float(x), 8) for x in half_levels(raw)]
+    if gm.upgrades is not None:
+        costs = power_up_costs(gm.upgrades)
+    # raw_form:sprite 檔名有時保留物種前綴,見 image_url()
+    by_tid = {rec["tid"]: rec for rec in gm.pokemon if None not in (rec["atk"], rec["def"], rec["sta"])}
     if not cpm:
         sys.exit("GAME_MASTER 缺 PLAYER_LEVEL_SETTINGS.cpMultiplier")
+    if not costs:
+        print("⚠ GAME_MASTER 缺 POKEMON_UPGRADE_SETTINGS,這次不輸出強化花費表")
+
+    # 全部 GM 記錄的滿 IV CP(Lv15/20/25)用 cp_engine 一次批次算好,反查與寫回都只是查表
+    recs = list(by_tid.values())
+    for r, row in zip(recs, cp_iv(recs, pick(cpm, KEY_LEVELS), 15, 15, 15).tolist()):
+        r["cp"] = dict(zip(KEY_LEVELS, row))
+
+    def cp_at(r, level):
+        return r["cp"][level]
 
-    def cp_at(r, level, iv=15):
-        return max(10, int((r["atk"] + iv) * math.sqrt(r["def"] + iv) * math.sqrt(r["sta"] + iv)
-                           * cpm[level - 1] ** 2 / 10))
+    # 反查用的兩個索引,一次建好:(dex, cp15, cp20, cp25) 與 (dex, 攻, 防, 耐) → GM 記錄(維持 GM 裡的順序)。
+    # 同一個 key 底下不只一筆,就是 CP 反查分不出來的組合(酋雷姆焰白/闇黑、奈克洛茲瑪、達摩狒狒…)。
+    by_fp, by_stats = {}, {}
+    for r in recs:
+        by_fp.setdefault((r["dex"],) + tuple(cp_at(r, L) for L in KEY_LEVELS), []).append(r)
+        by_stats.setdefault((r["dex"], r["atk"], r["def"], r["sta"]), []).append(r)
 
-    print("抓 APK 中文語系…", flush=True)
-    d = get_json(I18N_URL)["data"]
-    i18n = {d[i]: d[i + 1] for i in range(0, len(d) - 1, 2)}
+    i18n = {i18n_raw[i]: i18n_raw[i + 1] for i in range(0, len(i18n_raw) - 1, 2)}
     has_han = lambda s: bool(re.search(r"[一-鿿]", s or ""))
 
-    print("列出 PokeMiners 圖示…", flush=True)
-    sprites = sprite_filenames(token)
     print(f"  {len(sprites)} 個圖示檔")
+    print(http_cache.summary())
 
     def zh_name(p, rec):
         """只修名稱裡的**英文**，其餘一律不動，回傳 None 表示維持原樣。
@@ -191,39 +308,39 @@ def main():
 
     def image_url(rec):
         """挑這個形態的 GO 圖示。排除異色(.s.)、雌性(.g2.)、造型(.c…)。"""
-        def ok(fn):
-            return fn in sprites
         ov = IMAGE_OVERRIDES.get(rec["tid"])
-        if ov and ok(ov):
+        if ov and ov in sprites:
             return SPRITE_BASE + ov
+        plain = sprites.plain(rec["dex"])         # {form 代碼: 檔名},None 是無 form 的基本圖
         # 檔名的 form 代碼有兩種寫法:多數是剝掉物種前綴的(pm800.fDUSK_MANE)，
         # 但有些保留了(pm413.fWORMADAM_PLANT、pm412.fBURMY_TRASH)。兩種都要試，
         # 只試剝掉的版本會讓結草兒/結草貴婦這類整族退回別的形態的圖(實測草木與垃圾會撞同一張)。
         for code in (rec["form"], rec.get("raw_form")):
-            if code and ok(f"pm{rec['dex']}.f{code}.icon.png"):
-                return SPRITE_BASE + f"pm{rec['dex']}.f{code}.icon.png"
-        if ok(f"pm{rec['dex']}.icon.png"):
-            return SPRITE_BASE + f"pm{rec['dex']}.icon.png"
+            if code and code in plain:
+                return SPRITE_BASE + plain[code]
+        if None in plain:
+            return SPRITE_BASE + plain[None]
         # 連基本圖都帶 form 代碼 → 從該 dex 的純型態圖裡挑一個代表
-        plain = sorted(fn for fn in sprites
-                       if re.fullmatch(rf"pm{rec['dex']}\.f[A-Z0-9_]+\.icon\.png", fn))
         for pref in DEFAULT_FORMS:
-            want = f"pm{rec['dex']}.f{pref}.icon.png"
-            if want in plain:
-                return SPRITE_BASE + want
-        return SPRITE_BASE + plain[0] if plain else None
+            if pref in plain:
+                return SPRITE_BASE + plain[pref]
+        forms = sorted(k for k in plain if k)
+        return SPRITE_BASE + plain[forms[0]] if forms else None
 
-    text = open(SRC, encoding="utf-8").read()
-    rows = ast.literal_eval(text[text.index("["):text.index("];") + 1])
+    rows = load_cp_data().rows
+    snapshot = {id(p): dict(p) for p in rows}   # 更新前的樣子,給 change_report() 比對
 
-    stat_chg, name_chg, img_chg, lost = [], [], [], []
+    stat_chg, name_chg, img_chg, lost, guessed = [], [], [], [], []
     for p in rows:
         if p["name"] in GM_OVERRIDE:          # 明列的修正優先於既有的 gm 與 CP 反查
             p["gm"] = GM_OVERRIDE[p["name"]]
         rec = by_tid.get(p.get("gm")) if p.get("gm") else None
-        if rec is None:   # 第一次跑(或 GM 改了 templateId):用 CP 反查認人
-            rec = next((r for r in by_dex.get(p["id"], [])
-                        if all(cp_at(r, L) == p.get("cp%d" % L) for L in (15, 20, 25))), None)
+        if rec is None:   # 第一次跑(或 GM 改了 templateId):用 CP 反查認人,再退回基礎數值
+            cands = (by_fp.get((p["id"],) + tuple(p.get("cp%d" % L) for L in KEY_LEVELS))
+                     or by_stats.get((p["id"], p.get("atk"), p.get("def"), p.get("sta"))) or [])
+            rec = cands[0] if cands else None
+            if len(cands) > 1:
+                guessed.append((p["name"], rec["tid"], [r["tid"] for r in cands[1:]]))
         if rec is None:
             lost.append((p["id"], p["name"]))
             continue
@@ -232,7 +349,7 @@ def main():
         if before != (rec["atk"], rec["def"], rec["sta"]) and before != (None, None, None):
             stat_chg.append((p["name"], before, (rec["atk"], rec["def"], rec["sta"])))
         p["atk"], p["def"], p["sta"] = rec["atk"], rec["def"], rec["sta"]
-        for L in (15, 20, 25):
+        for L in KEY_LEVELS:
             p["cp%d" % L] = cp_at(rec, L)
 
         nm = zh_name(p, rec)
@@ -284,6 +401,10 @@ def main():
     print(f"名稱仍含英文:{len(still_en)}" + (f"  {still_en[:10]}" if still_en else ""))
     if lost:
         print(f"⚠ 對不到 GAME_MASTER 的 {len(lost)} 筆(保留原值):{lost[:10]}")
+    ambiguity_report(rows, by_fp, guessed)
+    report = change_report(snapshot, rows, lost)
+    print(f"變動報告:修改 {len(report['changed'])}、新增 {len(report['added'])}、"
+          f"移除 {len(report['removed'])}、失聯 {len(report['lost'])}")
 
     if args.dry_run:
         print("\n--dry-run:沒有寫檔")
@@ -294,9 +415,24 @@ def main():
     out = (f"const POKEMON_CP_DATA = [{body}];\n"
            f"// 等級 → CP 倍率(GAME_MASTER PLAYER_LEVEL_SETTINGS.cpMultiplier,index = 等級-1)\n"
            f"// 索引 {MAX_LEVEL} 是最佳夥伴的 Lv{BEST_BUDDY_LEVEL}\n"
-           f"const CP_MULTIPLIER = {json.dumps(cpm)};\n")
+           f"const CP_MULTIPLIER = {json.dumps(cpm)};\n"
+           f"// 含半等級的 CP 倍率(index = (等級-1)×2,Lv1、Lv1.5 … Lv{BEST_BUDDY_LEVEL})\n"
+           f"// 半等級用遊戲的內插公式 √((cpm(L)² + cpm(L+1)²) / 2) 由 GAME_MASTER 原始值算出\n"
+           f"const CP_MULTIPLIER_HALF = {json.dumps(cpm_half)};\n")
+    if costs:
+        out += (f"// 從 Lv1 強化到各半等級的累計花費(index 同 CP_MULTIPLIER_HALF,到 Lv{MAX_LEVEL} 為止)\n"
+                f"// 來源:GAME_MASTER POKEMON_UPGRADE_SETTINGS;Lv40 起收 XL 糖果\n"
+                f"const POWER_UP_COST = {json.dumps(costs)};\n")
     open(SRC, "w", encoding="utf-8", newline="\n").write(out)
     print(f"\n已寫回 {os.path.relpath(SRC, ROOT)}  ({len(out)//1024} KB)")
+    # 同一份資料的 JSON 副本給 Python 端(data_snapshot.load_cp_data)讀,不必解析上面那段 JS
+    write_cp_json(CpData(rows, cpm, cpm_half, costs), hashlib.sha1(out.encode("utf-8")).hexdigest())
+    print(f"已寫入 {os.path.relpath(CP_JSON, ROOT)}")
+    report["source_sha1"] = hashlib.sha1(out.encode("utf-8")).hexdigest()   # 對應哪一版的 JS
+    with open(CHANGES, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    print(f"已寫入 {os.path.relpath(CHANGES, ROOT)}")
 
 
 if __name__ == "__main__":
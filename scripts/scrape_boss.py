@@ -1,11 +1,11 @@
 import requests
 import json
-import re
 import os
 import pytz
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from datetime import datetime
+from translator import translate_many
 # import locale
 # locale.setlocale(locale.LC_CTYPE, 'chinese')
 # ==================== 常數與設定區塊 START ====================
@@ -26,80 +26,15 @@ OUTPUT_FILENAME_PRETTY = os.path.join(OUTPUT_DIR, "raids.json")
 OUTPUT_FILENAME_MIN = os.path.join(OUTPUT_DIR, "raids.min.json")
 
 
-# ==================== 翻譯資料區塊 START ====================
-# (沿用您範本中的翻譯邏輯)
+# 寶可夢名稱的翻譯（官方文本、暗影 / 超級進化 / 形態規則、手動字典）在 translator.py，所有爬蟲共用。
 
-# 定義特殊形態的翻譯字典
-FORM_TRANSLATIONS = {
-    'Alolan': '阿羅拉', 'Galarian': '伽勒爾', 'Hisuian': '洗翠', 'Origin': '起源',
-    'Altered': '別種', 'Attack': '攻擊', 'Defense': '防禦', 'Speed': '速度',
-    'Sunny': '太陽', 'Rainy': '雨水', 'Snowy': '雪雲', 'Overcast': '陰天',
-    'Incarnate': '化身', 'Therian': '靈獸', 'Black': '闇黑', 'White': '焰白',
-    'Plant': '草木', 'Sandy': '砂土', 'Trash': '垃圾', 'Confined': '懲戒', 'Unbound': '解放',
-    'Aria': '歌聲', 'Pirouette': '舞步', 'Fan': '電風扇', 'Frost': '結冰', 'Heat': '加熱', 'Mow': '割草', 'Wash': '清洗',
-    'Dusk': '黃昏', 'Midday': '白晝', 'Midnight': '黑夜', 'School': '魚群', 'Solo': '單獨', 'Dawn Wings': '日蝕奈克洛茲瑪', 'Ultra': '究極',
-    'Hero': '百戰勇者', 'White Striped': '白條紋', 'Mega': '超級', 'Primal': '原始', "Farfetch'd": "大蔥鸭",
-    'Shadow': '暗影'
-}
-
-def load_translations():
-    """載入寶可夢名稱翻譯檔"""
-    translation_file = os.path.join(OUTPUT_DIR, "pokemon_translation_map.json")
-    try:
-        with open(translation_file, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"❌ 警告：找不到翻譯檔 {translation_file}，部分名稱可能無法翻譯。")
-        return {} # 回傳空字典以避免程式中斷
-    except json.JSONDecodeError:
-        print(f"❌ 錯誤：{translation_file} 格式有誤。")
-        return None
-
-def translate_name(eng_name, name_map, form_map):
-    """將英文名稱翻譯成中文，能處理地區形態、超級進化和特殊名稱"""
-    if not eng_name:
-        return ""
-
-    # 處理暗影，例如 "Shadow Palkia"、"Shadow Necrozma (Dusk Mane)"
-    # 先剝掉 "Shadow " 前綴，把剩下的部分照常翻譯，再冠上「暗影」
-    if eng_name.startswith("Shadow "):
-        rest = eng_name[len("Shadow "):]
-        return f"{form_map.get('Shadow', '暗影')} {translate_name(rest, name_map, form_map)}"
-
-    # 處理超級進化，例如 "Mega Charizard X"
-    if eng_name.startswith("Mega ") or eng_name.startswith("Primal "):
-        parts = eng_name.split(" ", 1)
-        form_type = parts[0] # "Mega" 或 "Primal"
-        base_name = parts[1]
-        
-        translated_base = name_map.get(base_name, base_name)
-        translated_form = form_map.get(form_type, form_type)
-        return f"{translated_form} {translated_base}"
-
-    # 處理括號內的特殊形態, e.g., "Basculin (White Striped)"
-    match = re.match(r'(.+?)\s*\((.+?)\)', eng_name)
-    if match:
-        base_name, form_name = match.groups()
-        base_name = base_name.strip()
-        form_name = form_name.strip()
-        if base_name in name_map and form_name in form_map:
-            return f"{name_map[base_name]} ({form_map[form_name]})"
-
-    # 處理地區形態, e.g., "Alolan Meowth"
-    parts = eng_name.split()
-    if len(parts) > 1 and parts[0] in form_map:
-        form_name, base_name = parts[0], " ".join(parts[1:])
-        if base_name in name_map:
-            return f"{form_map[form_name]} {name_map[base_name]}"
-
-    # 處理一般名稱
-    if eng_name in name_map:
-        return name_map[eng_name]
-
-    print(f"  > 翻譯警告：在字典中找不到 '{eng_name}'，將使用原文。")
-    return eng_name
-
-# ==================== 翻譯資料區塊 END ======================
+def _translate_bosses(bosses):
+    """把每隻頭目的 englishName 一起翻譯，填回 name。"""
+    names = translate_many("name", [b["englishName"] for b in bosses])
+    for boss in bosses:
+        boss["name"], source = names[boss["englishName"]]
+        if source == "missing":
+            print(f"  > 翻譯警告：在字典中找不到 '{boss['englishName']}'，將使用原文。")
 
 
 def scrape_raid_data():
@@ -108,11 +43,6 @@ def scrape_raid_data():
     # 建立輸出資料夾 (如果不存在)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    # 載入翻譯資料
-    name_translation_map = load_translations()
-    if name_translation_map is None: # 僅在JSON格式錯誤時停止
-        return
-        
     bosses = []
     
     try:
@@ -139,13 +69,12 @@ def scrape_raid_data():
 
             # 找到這個 tier 內所有的頭目卡片
             for card in tier_div.find_all("div", class_="card"):
-                # 抓取英文名稱並翻譯
+                # 抓取英文名稱（全部解析完再一起翻譯）
                 name_tag = card.find("p", class_="name")
                 if not name_tag:
                     continue
                 eng_name = name_tag.get_text(strip=True)
-                translated_boss_name = translate_name(eng_name, name_translation_map, FORM_TRANSLATIONS)
-                print(f"  - 找到頭目: {translated_boss_name} ({eng_name})")
+                print(f"  - 找到頭目: {eng_name}")
 
                 # 小工具：把 "CP 1957 - 2042" 解析成 (min, max)，失敗回傳 (0, 0)
                 def parse_cp(tag):
@@ -192,7 +121,7 @@ def scrape_raid_data():
 
                 # 組合最終的 JSON 物件
                 boss_data = {
-                    "name": translated_boss_name,
+                    "name": eng_name,
                     "englishName": eng_name,
                     "tier": current_tier,
                     "canBeShiny": card.find("svg", class_="shiny-icon") is not None,
@@ -205,6 +134,7 @@ def scrape_raid_data():
                     "image": image_url
                 }
                 bosses.append(boss_data)
+        _translate_bosses(bosses)
 
     except (requests.exceptions.RequestException, ValueError) as e:
         # --- 備份抓取邏輯 (Fallback) ---
@@ -221,9 +151,8 @@ def scrape_raid_data():
             # 備份資料也需要翻譯
             for boss in boss_list_from_fallback:
                 if 'name' in boss:
-                    original_name = boss['name']
-                    boss['englishName'] = original_name
-                    boss['name'] = translate_name(original_name, name_translation_map, FORM_TRANSLATIONS)
+                    boss['englishName'] = boss['name']
+            _translate_bosses([b for b in boss_list_from_fallback if 'name' in b])
             
             bosses = boss_list_from_fallback
 
@@ -5,66 +5,10 @@ import pytz
 from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from translator import translate_many
 # import locale
 # locale.setlocale(locale.LC_CTYPE, 'chinese')
-# ==================== 翻譯資料區塊 START ====================
-
-# 定義特殊形態的翻譯字典
-FORM_TRANSLATIONS = {
-    'Alolan': '阿羅拉', 'Galarian': '伽勒爾', 'Hisuian': '洗翠', 'Origin': '起源',
-    'Altered': '別種', 'Attack': '攻擊', 'Defense': '防禦', 'Speed': '速度',
-    'Sunny': '太陽', 'Rainy': '雨水', 'Snowy': '雪雲', 'Overcast': '陰天',
-    'Incarnate': '化身', 'Therian': '靈獸', 'Black': '闇黑', 'White': '焰白',
-    'Plant': '草木', 'Sandy': '砂土', 'Trash': '垃圾', 'Confined': '懲戒', 'Unbound': '解放',
-    'Aria': '歌聲', 'Pirouette': '舞步', 'Fan': '電風扇', 'Frost': '結冰', 'Heat': '加熱', 'Mow': '割草', 'Wash': '清洗',
-    'Dusk': '黃昏', 'Midday': '白晝', 'Midnight': '黑夜', 'School': '魚群', 'Solo': '單獨', 'Dawn Wings': '日蝕奈克洛茲瑪', 'Ultra': '究極',
-    'Hero': '百戰勇者', 'White Striped': '白條紋',
-    'Male': '雄性', 'Female': '雌性' # 處理像 Indeedee (Male/Female) 的情況
-}
-
-def load_translations():
-    """載入寶可夢名稱翻譯檔"""
-    try:
-        # 假設翻譯檔在 data 資料夾下
-        with open("./data/pokemon_translation_map.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("❌ 錯誤：找不到 pokemon_translation_map.json 檔案。")
-        return None
-    except json.JSONDecodeError:
-        print("❌ 錯誤：pokemon_translation_map.json 格式有誤。")
-        return None
-
-def translate_name(eng_name, name_map, form_map):
-    """將英文名稱翻譯成中文，能處理地區形態和特殊名稱"""
-    if not eng_name:
-        return ""
-
-    # 處理括號內的特殊形態, e.g., "Basculin (White Striped)" -> "Basculin", "White Striped"
-    form_in_parentheses_match = re.match(r'(.+?)\s*\((.+?)\)', eng_name)
-    if form_in_parentheses_match:
-        base_name = form_in_parentheses_match.group(1).strip()
-        form_name = form_in_parentheses_match.group(2).strip()
-        if base_name in name_map and form_name in form_map:
-            return f"{name_map[base_name]} ({form_map[form_name]})"
-
-    # 處理地區形態, e.g., "Alolan Meowth" -> "Alolan", "Meowth"
-    parts = eng_name.split()
-    if len(parts) > 1 and parts[0] in form_map:
-        form_name = parts[0]
-        base_name = " ".join(parts[1:])
-        if base_name in name_map:
-            return f"{form_map[form_name]} {name_map[base_name]}"
-
-    # 處理一般名稱
-    if eng_name in name_map:
-        return name_map[eng_name]
-
-    # 如果都找不到，回傳原文並印出警告
-    print(f"  > 翻譯警告：在字典中找不到 '{eng_name}'，將使用原文。")
-    return eng_name
-
-# ==================== 翻譯資料區塊 END ======================
+# 寶可夢名稱的翻譯（官方文本、形態規則、手動字典）在 translator.py，所有爬蟲共用。
 
 URL = "https://leekduck.com/eggs/"
 BASE_URL = "https://leekduck.com/"
@@ -73,11 +17,6 @@ HEADERS = {
 }
 
 def scrape_egg_data():
-    # 在爬蟲開始前，先載入翻譯資料
-    name_translation_map = load_translations()
-    if name_translation_map is None:
-        return # 如果翻譯檔載入失敗，則停止執行
-
     try:
         print("正在從 LeekDuck 抓取資料...")
         response = requests.get(URL, headers=HEADERS)
@@ -121,9 +60,8 @@ def scrape_egg_data():
                 name_tag = item.find("span", class_="name")
                 
                 if name_tag:
-                    english_name = name_tag.text.strip()
-                    chinese_name = translate_name(english_name, name_translation_map, FORM_TRANSLATIONS)
-                    pokemon_info["name"] = chinese_name
+                    # 先存英文，整頁解析完再一起翻譯
+                    pokemon_info["name"] = name_tag.text.strip()
                 
                 # 【修改點 4】CP tag 的 class 改為 'cp-range' 且只抓取單一數值
                 cp_tag = item.find("div", class_="cp-range")
@@ -150,6 +88,12 @@ def scrape_egg_data():
                 else:
                     print(f"  > 警告：跳過一筆不完整的資料 (名稱或圖片網址缺失)。")
         
+        names = translate_many("name", [p["name"] for p in all_pokemon_data])
+        for p in all_pokemon_data:
+            p["name"], source = names[p["name"]]
+            if source == "missing":
+                print(f"  > 翻譯警告：在字典中找不到 '{p['name']}'，將使用原文。")
+
         taipei_tz = pytz.timezone('Asia/Taipei')
         now_taipei = datetime.now(pytz.utc).astimezone(taipei_tz)
         output_data = {
@@ -5,22 +5,25 @@
 #
 # 增量策略：已存在於 data/special_research.json 的條目原樣保留（不重抓、
 # 不重翻），只抓索引頁上新增的調查，對 Serebii 也比較友善。
-# 翻譯：重用 scrape_research.py 的官方在地化文本引擎（官方優先），
+# 下載：polite_fetch.Fetcher 同時抓多頁，對 Serebii 限速（--rate 每秒幾個請求、
+# --burst 可連發幾個），失敗退避重試；一頁抓完就在主執行緒解析、翻譯，其他頁照樣在下載。
+# 翻譯：重用 translator.py 的官方在地化文本引擎（官方優先），
 # 翻不到的字串寫入 scripts/untranslated_report_special.json 供人工檢查。
 # ============================================================================
 
+import argparse
 import os
 import sys
 import json
 import re
-import time
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from scrape_research import (
-    HEADERS,
+import translation_cache
+from polite_fetch import Fetcher
+from scrape_research import HEADERS
+from translator import (
     GENERAL_TRANSLATIONS,
     POKEMON_TYPES_ZH,
     CITIES_ZH,
@@ -31,6 +34,9 @@ from scrape_research import (
     translate_item_resource,
     translate_task_description,
     record_untranslated,
+    Rule,
+    RuleTable,
+    write_rule_report,
     _UNTRANSLATED,
 )
 
@@ -38,6 +44,7 @@ INDEX_URL = "https://www.serebii.net/pokemongo/specialresearch.shtml"
 BASE_URL = "https://www.serebii.net/"
 OUTPUT = "./data/special_research.json"
 REPORT = "./scripts/untranslated_report_special.json"
+RULE_REPORT = "./scripts/translation_rules_report.json"
 
 MONTHS = {
     "January": 1, "February": 2, "March": 3, "April": 4, "May": 5, "June": 6,
@@ -86,6 +93,40 @@ def extract_release_date(tab_table):
 
 MANUAL_MAP = {}   # main() 載入 task_translation_map.json 後填入，供獎勵/標題查詢
 
+def _official_or_self(fmt):
+    def build(m, pokemon_map):
+        return fmt.format(official_translate(m.group(1)) or m.group(1))
+    return build
+
+def _type_medal(m, pokemon_map):
+    t = POKEMON_TYPES_ZH.get(m.group(1).capitalize())
+    return f"{t}屬性獎牌" if t else None
+
+def _candy(m, pokemon_map):
+    # 名字部分翻得出來才視為寶可夢糖果
+    # （'Rare Candy' 這種道具會在這裡翻不出名字，交給後面的道具翻譯）
+    name = official_translate(m.group(1)) or pokemon_map.get(m.group(1))
+    if name:
+        return f"{name} 的糖果XL" if m.group(2) else f"{name} 的糖果"
+    return None
+
+# 獎勵字串（去掉數量後）的規則，依獎勵種類的最後一個字分派
+REWARD_RULES = RuleTable("reward", [
+    # 活動限定獎勵的參數化句型：貼圖 / T恤 / 屬性獎牌 / 姿勢
+    Rule("sticker", "sticker", re.compile(r"^(.*)\s+Sticker$"), _official_or_self("{}貼圖")),
+    Rule("t_shirt", "t-shirt", re.compile(r"^(.*)\s+T-Shirt$"), _official_or_self("{} T恤")),
+    Rule("type_medal", "medal", re.compile(r"^([A-Za-z]+)\s+Medal$"), _type_medal),
+    Rule("pose", "pose", re.compile(r"^(.*)\s+Pose$"), _official_or_self("{} 姿勢")),
+    # "500 XP" 原樣保留（"500XP" 最後一個字不是 XP，所以每次都試）
+    Rule("xp", None, re.compile(r"^[\d,]+\s*XP$", re.IGNORECASE), lambda m, pokemon_map: m.group()),
+    # "{Pokemon} Encounter"
+    Rule("encounter", "encounter", re.compile(r"^(.*?)\s+Encounter$"),
+         lambda m, pokemon_map: f"{translate_name(m.group(1), pokemon_map, GENERAL_TRANSLATIONS)} 遭遇"),
+    # "{Pokemon} (XL )Candy"
+    Rule("pokemon_candy", "candy", re.compile(r"^(.*?)\s+(XL\s+)?Candy$", re.IGNORECASE), _candy),
+], last_word=True)
+
+@translation_cache.memoize("reward", record_untranslated, extra=lambda: (MANUAL_MAP,))
 def translate_reward_text(text, pokemon_map):
     """翻譯獎勵文字，維持既有資料的格式：
        '{名} 遭遇'、'{名} 的糖果 * N'、'{道具} * N'、'500 XP'"""
@@ -108,40 +149,10 @@ def translate_reward_text(text, pokemon_map):
     def with_qty(s):
         return f"{s} * {qty}" if qty else s
 
-    # 活動限定獎勵的參數化句型：貼圖 / T恤 / 屬性獎牌 / 姿勢
-    m = re.match(r"^(.*)\s+Sticker$", t)
-    if m:
-        base = official_translate(m.group(1)) or m.group(1)
-        return with_qty(f"{base}貼圖")
-    m = re.match(r"^(.*)\s+T-Shirt$", t)
-    if m:
-        base = official_translate(m.group(1)) or m.group(1)
-        return with_qty(f"{base} T恤")
-    m = re.match(r"^([A-Za-z]+)\s+Medal$", t)
-    if m and m.group(1).capitalize() in POKEMON_TYPES_ZH:
-        return with_qty(f"{POKEMON_TYPES_ZH[m.group(1).capitalize()]}屬性獎牌")
-    m = re.match(r"^(.*)\s+Pose$", t)
-    if m:
-        base = official_translate(m.group(1)) or m.group(1)
-        return with_qty(f"{base} 姿勢")
-
-    # "500 XP" 原樣保留
-    if re.match(r"^[\d,]+\s*XP$", t, re.IGNORECASE):
-        return with_qty(t)
-
-    # "{Pokemon} Encounter"
-    m = re.match(r"^(.*?)\s+Encounter$", t)
-    if m:
-        return with_qty(f"{translate_name(m.group(1), pokemon_map, GENERAL_TRANSLATIONS)} 遭遇")
-
-    # "{Pokemon} (XL )Candy"：名字部分翻得出來才視為寶可夢糖果
-    # （'Rare Candy' 這種道具會在這裡翻不出名字，交給下面的道具翻譯）
-    m = re.match(r"^(.*?)\s+(XL\s+)?Candy$", t, re.IGNORECASE)
-    if m:
-        name = official_translate(m.group(1)) or pokemon_map.get(m.group(1))
-        if name:
-            suffix = " 的糖果XL" if m.group(2) else " 的糖果"
-            return with_qty(f"{name}{suffix}")
+    # 貼圖 / T恤 / 獎牌 / 姿勢 / XP / 遭遇 / 糖果（REWARD_RULES）
+    out = REWARD_RULES.apply(t, pokemon_map)
+    if out is not None:
+        return with_qty(out)
 
     # 其餘視為道具/資源（官方文本優先 → 手動字典 → 回報）
     return with_qty(translate_item_resource(t, GENERAL_TRANSLATIONS, pokemon_map))
@@ -176,10 +187,9 @@ def parse_total_reward_cell(td, pokemon_map):
             })
     return rewards
 
-def scrape_one(url, pokemon_map, task_map):
-    resp = requests.get(url, headers=HEADERS, timeout=60)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "lxml")
+def parse_page(url, html, pokemon_map, task_map):
+    """一頁特殊調查的 HTML → 條目（標題、日期、各關任務與獎勵都翻好）"""
+    soup = BeautifulSoup(html, "lxml")
 
     tab = soup.find("table", class_="tab")
     title_eng = tab.find("tr").get_text(" ", strip=True) if tab else ""
@@ -232,6 +242,13 @@ def scrape_one(url, pokemon_map, task_map):
     }
 
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rate", type=float, default=1.0, help="對 Serebii 每秒最多幾個請求（預設 1）")
+    ap.add_argument("--burst", type=int, default=2, help="閒置後可以連發幾個請求（預設 2）")
+    ap.add_argument("--workers", type=int, default=4, help="同時下載幾頁（預設 4）")
+    args = ap.parse_args()
+    fetcher = Fetcher(HEADERS, rate=args.rate, burst=args.burst, workers=args.workers)
+
     pokemon_map = load_json_map("./data/pokemon_translation_map.json")
     task_map = load_json_map("./scripts/task_translation_map.json")
     MANUAL_MAP.update(task_map)   # 獎勵/標題字串也可放在同一個手動字典
@@ -246,9 +263,7 @@ def main():
     known = {e["source_url"].split("/")[-1].lower() for e in existing}
 
     print("⏳ 抓取 Serebii 特殊調查索引…")
-    resp = requests.get(INDEX_URL, headers=HEADERS, timeout=60)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "lxml")
+    soup = BeautifulSoup(fetcher.get(INDEX_URL), "lxml")
     hrefs = []
     for a in soup.find_all("a", href=True):
         href = a["href"]
@@ -262,24 +277,31 @@ def main():
     new_urls = [u for u in urls if u.split("/")[-1].lower() not in known]
     print(f"✅ 索引共 {len(urls)} 條，本地已有 {len(existing)} 條，需新增 {len(new_urls)} 條")
 
-    added = 0
-    for i, url in enumerate(new_urls, 1):
+    # 依完成順序解析；寫檔時照索引頁順序附加，跟一頁一頁抓的結果一樣
+    entries = {}
+    for i, (url, html, err) in enumerate(fetcher.map(new_urls), 1):
         name = url.split("/")[-1]
         try:
-            entry = scrape_one(url, pokemon_map, task_map)
+            if err:
+                raise err
+            entry = parse_page(url, html, pokemon_map, task_map)
             if entry["steps"]:
-                existing.append(entry)
-                added += 1
+                entries[url] = entry
                 print(f"  [{i}/{len(new_urls)}] ✅ {entry['title']}（{entry['release_date']}）")
             else:
                 print(f"  [{i}/{len(new_urls)}] ⚠️ {name} 解析不到任何關卡，略過")
         except Exception as e:
             print(f"  [{i}/{len(new_urls)}] ❌ {name} 失敗：{e}")
-        time.sleep(1)   # 對 Serebii 友善一點
+    existing.extend(entries[u] for u in new_urls if u in entries)
+    added = len(entries)
+    print(fetcher.summary())
 
     with open(OUTPUT, "w", encoding="utf-8") as f:
         json.dump(existing, f, indent=2, ensure_ascii=False)
     print(f"\n🎉 完成！新增 {added} 條，總計 {len(existing)} 條 → {OUTPUT}")
+    translation_cache.save()
+    print(translation_cache.summary())
+    write_rule_report(RULE_REPORT)   # 各組合規則的命中次數與耗時（累加），調整規則順序用
 
     if _UNTRANSLATED:
         with open(REPORT, "w", encoding="utf-8") as f:
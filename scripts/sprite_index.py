@@ -0,0 +1,87 @@
+"""PokeMiners GO 圖示檔名的解析與索引,refresh_cp_data.py、build_pokedex_manifest.py、trade-list/build_data.py 共用。
+
+檔名規則:pm{全國編號}[.f{造型}][.c{服裝}][.g{性別}][.s].icon.png
+    pm25.icon.png             皮卡丘(基本圖)
+    pm800.fDUSK_MANE.icon.png 奈克洛茲瑪 黃昏之鬃
+    pm25.cHOLIDAY_2016.s.icon.png  聖誕帽皮卡丘 異色
+    pm521.g2.icon.png         雌性
+
+原本三支腳本各自解析一次;refresh_cp_data.py 找不到指定圖時,還要對 3700 多個檔名整個跑一輪 re.fullmatch。
+SpriteIndex 一次整理成 dex → 變體,之後每次查詢都是查 dict。
+"""
+import re
+
+_PM = re.compile(r"pm(\d+)")
+
+
+def parse_sprite(fn):
+    """檔名 → dict(dex, form, costume, gender, shiny, file, extra);不是 pm 開頭的圖示檔回傳 None。
+
+    extra 是認不得的片段(正常的檔名是空 list),要不要收由呼叫端決定。"""
+    if not fn.endswith(".icon.png"):
+        return None
+    toks = fn[:-len(".icon.png")].split(".")
+    m = _PM.fullmatch(toks[0])
+    if not m:
+        return None
+    v = {"dex": int(m.group(1)), "form": None, "costume": None, "gender": None, "shiny": False,
+         "file": fn, "extra": []}
+    for t in toks[1:]:
+        if t == "s":
+            v["shiny"] = True
+        elif re.fullmatch(r"g\d", t):
+            v["gender"] = int(t[1:])
+        elif t.startswith("f") and len(t) > 1:
+            v["form"] = t[1:]
+        elif t.startswith("c") and len(t) > 1:
+            v["costume"] = t[1:]
+        else:
+            v["extra"].append(t)
+    return v
+
+
+class SpriteIndex:
+    """一批圖示檔名的索引。
+
+    idx.plain(dex)     → {造型代碼: 檔名},只收「非異色、無性別、無服裝」的圖;None 這個 key 是無造型的基本圖
+    idx.variants(dex)  → 該 dex 全部檔案的 parse_sprite() 結果(依檔名排序)
+    idx.flags(dex)     → {"base", "shiny", "gender", "costume"}:有沒有基本圖/異色/性別差異/服裝
+    fn in idx          → 檔名是否存在
+    """
+
+    def __init__(self, filenames):
+        self.files = set(filenames)
+        self._by_dex = {}
+        for fn in sorted(self.files):
+            v = parse_sprite(fn)
+            if v:
+                self._by_dex.setdefault(v["dex"], []).append(v)
+        self._plain = {
+            dex: {v["form"]: v["file"] for v in vs
+                  if not (v["shiny"] or v["gender"] or v["costume"] or v["extra"])}
+            for dex, vs in self._by_dex.items()}
+
+    def __contains__(self, fn):
+        return fn in self.files
+
+    def __len__(self):
+        return len(self.files)
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def dexes(self):
+        return sorted(self._by_dex)
+
+    def variants(self, dex):
+        return self._by_dex.get(dex, [])
+
+    def plain(self, dex):
+        return self._plain.get(dex, {})
+
+    def flags(self, dex):
+        vs = self.variants(dex)
+        return {"base": None in self.plain(dex),
+                "shiny": any(v["shiny"] for v in vs),
+                "gender": any(v["gender"] for v in vs),
+                "costume": any(v["costume"] for v in vs)}
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""翻譯函式的記憶層：行程內的 LRU + 跨次執行、跨爬蟲共用的磁碟快取。
+
+"Catch 5 Pokémon"、"Stardust ×500"、寶可夢名這些字串，一次執行裡會翻上百次，下一次執行又從頭翻一遍；
+每次都要走官方精確對照 → 寬鬆比對 → 句型模板 → 手動字典 → 規則。這裡在
+translator.py 的 name / item / task 與 scrape_special_research.py 的 translate_reward_text 前面加一層：
+
+    @translation_cache.memoize("task", record_untranslated)
+    def _translate_task_description(task_text, task_map): ...
+
+快取 key = 種類 + 字串 + 傳進來的字典（task_map、pokemon_map…）的內容指紋，
+所以 task_translation_map.json 這些手動字典一改，舊的翻譯自動不再命中。
+整份快取另有一個範圍：官方對照庫的版本（translation_db.DB_KEY）+ 翻譯相關原始碼（SOURCES）的 sha1，
+上游文字更新或翻譯規則改了就整份作廢重來。
+
+翻不出來的字串原本會順手 record_untranslated() 進報告；命中快取時函式本體不會跑，
+所以每筆快取也記下當初回報過哪些字串，命中時照樣回報一次，報告內容跟沒快取時一樣。
+
+    python scripts/translation_cache.py          # 快取檔資訊
+    python scripts/translation_cache.py --clear  # 刪掉快取檔
+"""
+import argparse, functools, hashlib, json, os, sys, time
+from collections import Counter, OrderedDict
+
+import translation_db
+from data_snapshot import CACHE_DIR
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(CACHE_DIR, "translations.json")
+CACHE_VERSION = 2
+# 內容會影響翻譯結果的原始碼（規則、GENERAL_TRANSLATIONS 這些寫在程式裡的字典）
+SOURCES = ("translation_db.py", "translation_cache.py", "translator.py", "scrape_special_research.py")
+LRU_SIZE = 20000
+KEEP_DAYS = 30          # 這麼久沒用到的磁碟快取存檔時丟掉
+
+STATS = {}              # 種類 → Counter(memo=行程內命中, disk=磁碟命中, miss=實際翻譯)
+_lru = OrderedDict()    # (種類, 字典指紋, 字串) → (譯文, 回報過的未翻譯字串)
+_disk = {"scope": None, "db_key": None, "entries": {}, "dirty": False}
+_frames = []            # 正在實際翻譯（沒命中）的呼叫，各自收集過程中回報的未翻譯字串
+_map_fps = {}           # id(字典) → (長度, 指紋)
+
+
+def _sha1(*parts):
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else str(p).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _sources_sha1():
+    parts = []
+    for fn in SOURCES:
+        try:
+            with open(os.path.join(HERE, fn), "rb") as f:
+                parts.append(f.read())
+        except OSError:
+            parts.append(b"")
+    return _sha1(*parts)
+
+
+def _scope():
+    return _sha1(CACHE_VERSION, translation_db.DB_KEY, _sources_sha1())
+
+
+def _map_fp(m):
+    """字典的內容指紋（依 id 記住；長度變了才重算 —— 手動字典都是載入後一次填好）。"""
+    got = _map_fps.get(id(m))
+    if got and got[0] == len(m):
+        return got[1]
+    fp = _sha1(json.dumps(m, sort_keys=True, ensure_ascii=False))[:12]
+    _map_fps[id(m)] = (len(m), fp)
+    return fp
+
+
+def _ensure_scope():
+    """對照庫換版（或第一次用）時換掉記憶體裡的快取，並載入同範圍的磁碟快取。"""
+    if _disk["db_key"] == translation_db.DB_KEY and _disk["scope"]:
+        return
+    scope = _scope()
+    _lru.clear()
+    entries = {}
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("scope") == scope:
+            entries = saved["entries"]
+    except (OSError, ValueError, KeyError):
+        pass
+    _disk.update(scope=scope, db_key=translation_db.DB_KEY, entries=entries, dirty=False)
+
+
+def note_untranslated(text):
+    """record_untranslated() 呼叫這個，讓正在翻譯的每一層記下這個字串（命中時要重播）。"""
+    for frame in _frames:
+        frame.append(text)
+
+
+def memoize(kind, record, extra=lambda: ()):
+    """把 fn(text, *字典) 包上記憶層。record 是命中時重播未翻譯字串用的 record_untranslated；
+    extra() 回傳函式另外讀的全域字典（如 MANUAL_MAP），一起算進指紋。"""
+    stats = STATS.setdefault(kind, Counter())
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        def cached(text, *maps):
+            if not isinstance(text, str) or not text:
+                return fn(text, *maps)
+            _ensure_scope()
+            key = (kind, ",".join(_map_fp(m) for m in maps + tuple(extra())), text)
+            hit = _lru.get(key)
+            if hit is not None:
+                _lru.move_to_end(key)
+                stats["memo"] += 1
+            else:
+                disk_key = "\x1f".join(key)
+                saved = _disk["entries"].get(disk_key)
+                if saved is None:
+                    stats["miss"] += 1
+                    _frames.append([])
+                    try:
+                        out = fn(text, *maps)
+                    finally:
+                        reported = _frames.pop()
+                    _remember(key, (out, tuple(reported)))
+                    _disk["entries"][disk_key] = [out, reported, _today()]
+                    _disk["dirty"] = True
+                    return out        # 函式本體已經回報過未翻譯字串了
+                stats["disk"] += 1
+                out = saved[0]
+                hit = (tuple(out) if isinstance(out, list) else out, tuple(saved[1]))   # JSON 把 tuple 存成 list
+                _remember(key, hit)
+                if saved[2] != _today():
+                    saved[2] = _today()
+                    _disk["dirty"] = True
+            for t in hit[1]:
+                record(t)
+            return hit[0]
+
+        cached.uncached = fn
+        return cached
+    return wrap
+
+
+def _remember(key, value):
+    _lru[key] = value
+    if len(_lru) > LRU_SIZE:
+        _lru.popitem(last=False)
+
+
+def _today():
+    return time.strftime("%Y-%m-%d")
+
+
+def save():
+    """把這次新翻的寫回磁碟（丟掉 KEEP_DAYS 天沒用到的）。寫不進去就算了，下次重翻。"""
+    if not _disk["dirty"]:
+        return
+    cutoff = time.strftime("%Y-%m-%d", time.localtime(time.time() - KEEP_DAYS * 86400))
+    entries = {k: v for k, v in _disk["entries"].items() if v[2] >= cutoff}
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"scope": _disk["scope"], "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp, CACHE_FILE)
+        _disk["dirty"] = False
+    except OSError:
+        pass
+
+
+def summary():
+    parts = []
+    for kind, s in STATS.items():
+        total = s["memo"] + s["disk"] + s["miss"]
+        if total:
+            parts.append(f"{kind} {total} 次（記憶體 {s['memo'] / total:.0%}、磁碟 {s['disk'] / total:.0%}）")
+    return "翻譯快取：" + ("、".join(parts) if parts else "沒有用到")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clear", action="store_true", help="刪掉磁碟上的翻譯快取")
+    args = ap.parse_args()
+    if args.clear:
+        try:
+            os.remove(CACHE_FILE)
+            print(f"已刪除 {CACHE_FILE}")
+        except FileNotFoundError:
+            print("本來就沒有翻譯快取")
+        return
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        print(f"沒有翻譯快取（{CACHE_FILE}）")
+        return
+    kinds = Counter(k.split("\x1f", 1)[0] for k in saved["entries"])
+    print(f"{CACHE_FILE}：{os.path.getsize(CACHE_FILE) / 1e3:.0f} KB，範圍 {saved['scope'][:12]}")
+    print("、".join(f"{k} {n} 筆" for k, n in sorted(kinds.items())))
+
+
+if __name__ == "__main__":
+    main()
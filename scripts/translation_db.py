@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""官方英繁對照庫：下載 holoholo-text 的英文／繁中遊戲文字，建成精確、寬鬆、句型模板三層對照表，
+供 official_translate() 與 translator.py 使用。
+
+建表要解析兩份各十幾 MB 的文字、整理十幾萬個 key，兩支爬蟲每次跑都各做一次。
+建好的表會 pickle 到快取目錄（POGO_CACHE_DIR，同 data_snapshot.py），key 是「格式版本 + 來源文字的 sha1」：
+上游文字沒變（http_cache 多半回 304）就直接讀快照，有變才重建。建表邏輯改了就把 DB_VERSION 加一。
+
+    python scripts/translation_db.py              # 快照資訊，並用 data/special_research.json 量各層命中率
+    python scripts/translation_db.py --corpus a.json b.json
+    python scripts/translation_db.py --rebuild    # 不管快照，重新建表
+"""
+import argparse, functools, hashlib, json, os, pickle, re, sys, time
+from collections import Counter
+
+import http_cache
+from data_snapshot import CACHE_DIR
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT = os.path.join(CACHE_DIR, "translation_db.pickle")
+DB_VERSION = 2
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
+
+# 文字來源（依序載入合併，後面的來源覆蓋前面）：
+#   holoholo-text：最完整的官方遊戲文字 dump（含活動/特殊調查字串），持續更新。
+#   格式標記：'txt' = PokeMiners 的 RESOURCE ID/TEXT 格式；'json' = {"data": [k,v,k,v,…]}
+POGO_TEXT_SOURCES = [
+    ("json",
+     "https://raw.githubusercontent.com/sora10pls/holoholo-text/refs/heads/main/Release/English/en-us_raw.json",
+     "https://raw.githubusercontent.com/sora10pls/holoholo-text/refs/heads/main/Release/Traditional%20Chinese/zh-tw_raw.json"),
+    # Remote＝遠端下發的活動字串（活動限定的特殊調查標題/任務常只在這裡）
+    ("json",
+     "https://raw.githubusercontent.com/sora10pls/holoholo-text/refs/heads/main/Remote/English/en-us_raw.json",
+     "https://raw.githubusercontent.com/sora10pls/holoholo-text/refs/heads/main/Remote/Traditional%20Chinese/zh-tw_raw.json"),
+]
+
+class _TemplateIndex:
+    """句型模板的索引：依模板開頭（或結尾）的字面文字分桶，查詢時只試可能配得上的幾個模板。
+
+    模板是 ^…$ 整句比對，開頭有字面文字的模板，配得上的輸入一定以那段文字開頭（不分大小寫），
+    所以取字面前綴的前 KEY_LEN 個字當 key，查詢時拿輸入的前 1…KEY_LEN 個字去查；
+    開頭就是佔位符的改用結尾的字面文字；頭尾都是佔位符的（很少）每次都試，但先確認中間的字面文字有出現。
+    候選依模板在清單裡的位置排序，「長模板優先」的順序與逐一比對完全相同。"""
+    KEY_LEN = 8
+
+    def __init__(self, templates=()):
+        self.templates = list(templates)
+        self.head, self.tail, self.floating = {}, {}, []
+        for i, t in enumerate(self.templates):
+            parts = [p.lower() for p in re.split(r"\{\d+\}", t[4])]
+            if parts[0]:
+                self.head.setdefault(parts[0][:self.KEY_LEN], []).append(i)
+            elif parts[-1]:
+                self.tail.setdefault(parts[-1][-self.KEY_LEN:], []).append(i)
+            else:
+                self.floating.append((i, max(parts, key=len)))
+        self.head_lens = sorted({len(k) for k in self.head})
+        self.tail_lens = sorted({len(k) for k in self.tail})
+
+    def candidates(self, text):
+        """可能配得上 text 的模板（依優先順序）。"""
+        low = text.lower()
+        hits = [i for n in self.head_lens if n <= len(low) for i in self.head.get(low[:n], ())]
+        hits += [i for n in self.tail_lens if n <= len(low) for i in self.tail.get(low[-n:], ())]
+        hits += [i for i, chunk in self.floating if chunk in low]
+        return [self.templates[i] for i in sorted(hits)]
+
+
+# templates：(正則字串, 中文模板, 佔位符順序, 英文長度, 英文原文)，長模板在前；index 是它的 _TemplateIndex。
+# 正則存字串、用到才編譯（_template_re），快照才能直接 pickle，載入時也不必先編譯上千個模板。
+_OFFICIAL = {"exact": {}, "loose": {}, "templates": [], "index": _TemplateIndex()}
+# official_translate() 各層的命中次數：exact / loose / template / miss
+STATS = Counter()
+# 目前載入的對照庫是哪一版（格式版本:來源 sha1）；還沒建表是 None。translation_cache.py 拿它當快取範圍的一部分
+DB_KEY = None
+
+
+@functools.lru_cache(maxsize=None)
+def _template_re(pattern):
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _parse_pogo_text(raw):
+    """解析 PokeMiners 的文字格式：RESOURCE ID: / TEXT: 交替出現，支援多行文本"""
+    data = {}
+    key = None
+    last_key = None
+    for line in raw.splitlines():
+        if line.startswith("RESOURCE ID: "):
+            key = line[13:].strip()
+            last_key = None
+        elif line.startswith("TEXT: ") and key:
+            data[key] = line[6:].strip()
+            last_key = key
+            key = None
+        elif last_key and line.strip():
+            data[last_key] += " " + line.strip()  # 多行文本的後續行
+    return data
+
+def _normalize_text(s):
+    """統一彎引號/不換行空格等差異，讓 LeekDuck 文字能對上官方文本"""
+    return s.replace(" ", " ").replace("’", "'").replace("‘", "'").strip()
+
+def _parse_pogo_json(raw):
+    """解析 holoholo-text 的 JSON 格式：{"data": [key, value, key, value, …]}"""
+    data = json.loads(raw)["data"]
+    return dict(zip(data[0::2], data[1::2]))
+
+def _download_sources():
+    """下載全部來源 → [(格式, 英文原文, 中文原文)]；下載失敗的來源略過（印出警告）。"""
+    raw = []
+    for fmt, en_url, zht_url in POGO_TEXT_SOURCES:
+        try:
+            raw.append((fmt, http_cache.get_text(en_url, HEADERS, timeout=60, errors="replace"),
+                        http_cache.get_text(zht_url, HEADERS, timeout=60, errors="replace")))
+        except Exception as e:
+            print(f"⚠️ 無法下載官方文本 {en_url.split('/')[-1]}（{e}），略過此來源。")
+    print(http_cache.summary())
+    return raw
+
+
+def _source_key(raw):
+    """快照的 key：格式版本 + 全部來源文字的 sha1。上游文字沒變，key 就不變。"""
+    h = hashlib.sha1()
+    for fmt, en, zht in raw:
+        for part in (fmt, en, zht):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+    return (DB_VERSION, h.hexdigest())
+
+
+def _load_snapshot(key):
+    try:
+        with open(SNAPSHOT, "rb") as f:
+            saved = pickle.load(f)
+    except Exception:
+        return None
+    return saved if saved.get("key") == key else None
+
+
+def load_pinned(path):
+    """直接載入一份快照檔（SNAPSHOT 的副本）當作目前的對照庫，不下載也不比對來源 → 回傳 DB_KEY。
+    benchmark 用固定的一份官方文本，不同 commit 的結果才比得起來。讀不回來或格式版本不同丟 ValueError。"""
+    global DB_KEY
+    with open(path, "rb") as f:
+        try:
+            saved = pickle.load(f)
+        except (pickle.UnpicklingError, AttributeError, ImportError, EOFError) as e:
+            raise ValueError(f"{path} 讀不回來（{type(e).__name__}: {e}），請重新 pin") from e
+    if saved["key"][0] != DB_VERSION:
+        raise ValueError(f"{path} 是第 {saved['key'][0]} 版的快照，目前是第 {DB_VERSION} 版，請重新 pin")
+    _restore(saved["db"])
+    DB_KEY = "%s:%s" % saved["key"]
+    return DB_KEY
+
+
+def _restore(db):
+    """快照裡的三層對照表 → _OFFICIAL，索引當場重建。"""
+    _OFFICIAL.update(exact=db["exact"], loose=db["loose"], templates=db["templates"])
+    _OFFICIAL["index"] = _TemplateIndex(_OFFICIAL["templates"])
+
+
+def _save_snapshot(key, built):
+    # 只存內建型別：_TemplateIndex 是類別，從 `python scripts/translation_db.py` 存的會被記成
+    # __main__._TemplateIndex，爬蟲那邊就讀不回來。索引載入時重建就好（只是把模板分桶）。
+    db = {k: _OFFICIAL[k] for k in ("exact", "loose", "templates")}
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{SNAPSHOT}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"key": key, "built": built, "db": db}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, SNAPSHOT)
+    except OSError:
+        pass
+
+
+def _build(raw):
+    """來源文字 → 填好 _OFFICIAL（精確、寬鬆、句型模板與索引）。"""
+    en_map, zht_map = {}, {}
+    for fmt, en, zht in raw:
+        parse = _parse_pogo_json if fmt == "json" else _parse_pogo_text
+        try:
+            en_map.update(parse(en))
+            zht_map.update(parse(zht))
+        except ValueError as e:
+            print(f"⚠️ 官方文本格式有誤（{e}），略過此來源。")
+    _OFFICIAL.update(exact={}, loose={}, templates=[])
+    if not en_map:
+        print("⚠️ 官方文本全數下載失敗，本次僅使用手動字典。")
+        return False
+    ph_re = re.compile(r"\{(\d+)\}")
+
+    for key, en_text in en_map.items():
+        zh_text = zht_map.get(key)
+        if not zh_text or zh_text == en_text:
+            continue  # 該鍵沒有中文翻譯
+        en_norm = _normalize_text(en_text)
+        placeholders = ph_re.findall(en_norm)
+        if placeholders:
+            # 太通用的模板（如 "{0}s"、"{0} {1}"）幾乎什麼都能配到，會把
+            # 真正的未知字串誤翻，要求字面文字至少 8 字元才收錄
+            if len(ph_re.sub("", en_norm)) < 8:
+                continue
+            # 帶佔位符 → 轉成正則模板；記下佔位符出現順序供代回中文
+            pattern = re.escape(en_norm)
+            for n in set(placeholders):
+                pattern = pattern.replace(re.escape("{%s}" % n), "(.+?)")
+            _OFFICIAL["templates"].append(
+                ("^" + pattern + "$", zh_text, placeholders, len(en_norm), en_norm)
+            )
+        else:
+            _OFFICIAL["exact"].setdefault(en_norm.lower(), zh_text)
+            # 寬鬆索引：去掉標點/空白，容忍來源網站與遊戲內的細微差異
+            # （如 "Chill Out, Frigibax" vs 官方 "Chill Out, Frigibax!"）。
+            # 只收較長字串，避免短字串誤配。
+            lk = re.sub(r"[^a-z0-9]", "", en_norm.lower())
+            if len(lk) >= 8:
+                _OFFICIAL["loose"].setdefault(lk, zh_text)
+
+    # 長模板優先比對（字面文字越長越精確，避免被短模板搶先誤配）
+    _OFFICIAL["templates"].sort(key=lambda t: -t[3])
+    _OFFICIAL["index"] = _TemplateIndex(_OFFICIAL["templates"])
+    return True
+
+
+def build_official_translation_db(force=False):
+    """下載並建立官方英繁對照庫。下載失敗時退回純手動字典模式。
+
+    來源文字跟上次建表時一樣（sha1 相同）就直接讀快照；force=True 一律重建。"""
+    global DB_KEY
+    t0 = time.time()
+    raw = _download_sources()
+    key = _source_key(raw)
+    DB_KEY = "%s:%s" % key
+    saved = None if force else _load_snapshot(key)
+    if saved:
+        _restore(saved["db"])
+        how = "快照"
+    elif _build(raw):
+        _save_snapshot(key, time.time())
+        how = "重新建表"
+    else:
+        return
+    print(f"✅ 官方文本載入完成（{how}，{time.time() - t0:.2f} 秒）："
+          f"{len(_OFFICIAL['exact'])} 條精確對照、{len(_OFFICIAL['templates'])} 個句型模板")
+
+
+def official_translate(text):
+    """用官方文本翻譯，找不到回傳 None"""
+    if not text:
+        return None
+    t = _normalize_text(text)
+    hit = _OFFICIAL["exact"].get(t.lower())
+    if hit:
+        STATS["exact"] += 1
+        return hit
+    # 寬鬆比對：去標點/空白後再試，並容忍尾端複數 s 的差異
+    lk = re.sub(r"[^a-z0-9]", "", t.lower())
+    if len(lk) >= 8:
+        hit = _OFFICIAL["loose"].get(lk) \
+            or (_OFFICIAL["loose"].get(lk[:-1]) if lk.endswith("s") else _OFFICIAL["loose"].get(lk + "s"))
+        if hit:
+            STATS["loose"] += 1
+            return hit
+    # 只試索引挑出來的候選（原本是上千個模板逐一 re.match）
+    for pattern, zh_tmpl, placeholders, _, _ in _OFFICIAL["index"].candidates(t):
+        m = _template_re(pattern).match(t)
+        if m:
+            out = zh_tmpl
+            for i, n in enumerate(placeholders):
+                val = m.group(i + 1)
+                # 代入值本身可能還是英文（如 "Charizard Mega Energy" 捕到 "Charizard"），
+                # 先查一次精確對照把它翻成中文；數字等查不到就原樣代入
+                val = _OFFICIAL["exact"].get(_normalize_text(val).lower(), val)
+                out = out.replace("{%s}" % n, val)
+            STATS["template"] += 1
+            return out
+    STATS["miss"] += 1
+    return None
+
+
+def corpus_strings(paths):
+    """JSON 檔裡所有顯示用的字串（不含網址），去重後依出現順序。"""
+    out = {}
+
+    def walk(x, key=None):
+        if isinstance(x, dict):
+            for k, v in x.items():
+                walk(v, k)
+        elif isinstance(x, list):
+            for v in x:
+                walk(v, key)
+        elif isinstance(x, str) and x and not (key or "").endswith(("url", "urls")):
+            out.setdefault(x, None)
+
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            walk(json.load(f))
+    return list(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rebuild", action="store_true", help="不管快照，重新下載並建表")
+    ap.add_argument("--corpus", nargs="*", metavar="JSON",
+                    default=[os.path.join(ROOT, "data", "special_research.json")],
+                    help="量命中率用的 JSON 檔（預設 data/special_research.json）")
+    args = ap.parse_args()
+
+    build_official_translation_db(force=args.rebuild)
+    try:
+        with open(SNAPSHOT, "rb") as f:
+            saved = pickle.load(f)
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(saved["built"]))
+        print(f"快照：{os.path.relpath(SNAPSHOT, ROOT)}（{os.path.getsize(SNAPSHOT) / 1e6:.1f} MB，"
+              f"版本 {saved['key'][0]}，來源 sha1 {saved['key'][1][:12]}，建於 {when}）")
+    except Exception:
+        print("快照：沒有（快取目錄無法寫入，或官方文本下載失敗）")
+    idx = _OFFICIAL["index"]
+    print(f"模板索引：開頭 {len(idx.head)} 桶、結尾 {len(idx.tail)} 桶、每次都試 {len(idx.floating)} 個")
+
+    strings = corpus_strings(args.corpus) if args.corpus else []
+    if strings:
+        STATS.clear()
+        for s in strings:
+            official_translate(s)
+        print(f"命中率（{len(strings)} 句）：" + "、".join(
+            f"{k} {STATS[k]}（{STATS[k] / len(strings):.0%}）" for k in ("exact", "loose", "template", "miss")))
+
+
+if __name__ == "__main__":
+    main()
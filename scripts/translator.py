@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""寶可夢名稱、道具、任務句的英→繁翻譯，所有爬蟲共用（scrape_research / scrape_special_research / scrape_eggs / scrape_boss）。
+
+原本三支爬蟲各有一份 translate_name 和形態字典，行為各不相同：只有田野調查查官方文本，
+只有團體戰處理暗影 / 超級進化。這裡合成一份，優先順序一律是：官方文本 → 組合規則 → 手動字典。
+
+    names = translator.translate_many("name", ["Shadow Palkia", "Alolan Meowth", "Pikachu"])
+    names["Pikachu"]   # → ("皮卡丘", "official")
+
+translate_many() 先去重，每個字串只翻一次，回傳 {英文: (中文, 來源)}。
+來源是 official（官方文本）、rule（組合規則）、manual（手動字典）或 missing（查不到，保留英文）。
+種類：name（寶可夢名）、item（道具 / 資源）、task（任務句）。字典沒指定就用預設的：
+data/pokemon_translation_map.json、scripts/task_translation_map.json（每個檔只讀一次），
+官方對照庫也是第一次用到才載入。
+
+個別的 translate_name / translate_item_resource / translate_task_description 照舊只回傳中文，
+前面都有 translation_cache.py 的記憶層。
+"""
+import functools
+import json
+import os
+import re
+import time
+from typing import Callable, NamedTuple, Optional
+
+import translation_cache
+import translation_db
+from translation_db import build_official_translation_db, official_translate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POKEMON_MAP = os.path.join(ROOT, "data", "pokemon_translation_map.json")
+TASK_MAP = os.path.join(ROOT, "scripts", "task_translation_map.json")
+
+# ==================== 翻譯資料區塊 START ====================
+
+# 【修改點 1】擴充翻譯字典，並更名為更通用的 GENERAL_TRANSLATIONS
+# (此區塊保持不變)
+GENERAL_TRANSLATIONS = {
+    # 寶可夢形態
+    'Alolan': '阿羅拉', 'Galarian': '伽勒爾', 'Hisuian': '洗翠', 'Origin': '起源',
+    'Altered': '別種', 'Attack': '攻擊', 'Defense': '防禦', 'Speed': '速度',
+    'Sunny': '太陽', 'Rainy': '雨水', 'Snowy': '雪雲', 'Overcast': '陰天',
+    'Incarnate': '化身', 'Therian': '靈獸', 'Black': '闇黑', 'White': '焰白',
+    'Plant': '草木', 'Sandy': '砂土', 'Trash': '垃圾', 'Confined': '懲戒', 'Unbound': '解放',
+    'Aria': '歌聲', 'Pirouette': '舞步', 'Fan': '電風扇', 'Frost': '結冰', 'Heat': '加熱', 'Mow': '割草', 'Wash': '清洗',
+    'Dusk': '黃昏', 'Midday': '白晝', 'Midnight': '黑夜', 'School': '魚群', 'Solo': '單獨', 'Dawn Wings': '日蝕奈克洛茲瑪', 'Ultra': '究極',
+    'Hero': '百戰勇者', 'White Striped': '白條紋','Paldean':'帕底亞',
+    
+    # 道具 & 資源
+    'Stardust': '星星沙子',
+    'Rare Candy': '神奇糖果',
+    'Rare Candy XL': '神奇糖果XL',
+    'Golden Razz Berry': '金莓果',
+    'Razz Berry': '蔓莓果',
+    'Poffin': '寶芬',
+    'Silver Pinap Berry': '銀色凰梨果',
+    'Pinap Berry': '凰梨果',
+    'Ultra Ball': '高級球',
+    'Great Ball': '超級球',
+    'Poké Ball': '精靈球',
+    'Sinnoh Stone': '神奧之石',
+    'Unova Stone': '合眾之石',
+    'Mega Energy': '超級能量', # 用於組合，例如 "妙蛙花 超級能量"
+            'Stardust': '星星沙子', 'XP': 'XP', 'Poke Ball': '精靈球',
+        'Great Ball': '超級球', 'Ultra Ball': '高級球', 'Egg Incubator': '孵化器',
+        'Super Incubator': '超級孵化器', 'Lure Module': '誘餌模組',
+        'Star Piece': '星星碎片','Star piece': '星星碎片', 'Premium Raid Pass': '特級對戰入場券',
+        'Lucky Egg': '幸運蛋', 'Revive': '活力碎片', 'Rare Candy': '神奇糖果',
+        'Kings Rock': '王者之證', 'Metal Coat': '金屬膜',
+        'Up-Grade': '升級資料', 'Dragon Scale': '龍之鱗片',
+        'Silver Pinap Berry': '銀色凰梨果', 'Encounter': '遭遇', 'Candy': '的糖果',
+        'Kanto': '關都地區', 'Johto': '城都地區', 'Hoenn': '豐緣地區', 'Sinnoh': '神奧地區',
+        'Unova Stone': '合眾之石', 'Shiny':'異色','Sinnoh Stone': '神奧之石',
+        'Unova': '合眾地區', 'Kalos': '卡洛斯地區', 'Alola': '阿羅拉地區', 'Galar': '伽勒爾地區',
+        'silver': '銀牌', 'gold': '金牌', 'platinum': '白金獎牌',
+        'Gold Unova Medal': '合眾地區金牌', 'Platinum Kanto Medal': '關都地區白金獎牌',
+        'Platinum Idol Medal': '白金偶像獎牌', 'Bronze Showcase Star Medal': '選秀會新星銅牌',
+        'Arlo': '亞洛', 'Cliff': '克里夫', 'Sierra': '希爾拉',
+        'Team GO Rocket Grunts': 'GO火箭隊手下', 'Team GO Rocket Grunt': 'GO火箭隊手下',
+        'Team GO Rocket members': 'GO火箭隊手下', 'Team GO Rocket member': 'GO火箭隊手下',
+        'Team GO Rocket Leader': 'GO火箭隊幹部', 'Team GO Rocket Boss': 'GO火箭隊老大',
+        'Team GO Rocekt Leader Arlo': 'GO火箭隊幹部亞洛', 'Team GO Rocekt Leader Cliff': 'GO火箭隊幹部克里夫',
+        'Team GO Rocekt Leader Sierra': 'GO火箭隊幹部希爾拉',
+        'Team GO Rocket Leader Arlo/Cliff/Sierra': 'GO火箭隊幹部亞洛、克里夫或希爾拉',
+        'Jessie or James': '潔西或詹姆斯', 'Nice': 'Nice', 'Great': 'Great',
+        'Excellent': 'Excellent', 'Curveball': '曲球', 'Day': '白天', 'night': '晚上',
+        'Sun Stone': '日之石', 'Incense': '薰香', 'Daily Adventure Incense': '每日冒險薰香',
+        'Berries': '莓果', 'Berry': '莓果', 'Pinap Berries': '凰梨果', 'Pinap Berry': '凰梨果',
+        'Razz Berries': '蔓莓果', 'Razz Berry': '蔓莓果', 'Golden Razz Berries': '金色蔓莓果',
+        'Golden Razz Berry': '金色蔓莓果', 'Fast TM': '一般招式學習器','Elite Fast TM':'厲害一般招式學習器','Elite Charged TM': '厲害特殊招式學習器',
+        'Charged TM': '特殊招式學習器', 'Charge TM': '特殊招式學習器', 'Great League': '超級聯盟',
+        'Ultra League': '高級聯盟', 'Master League': '大師聯盟', 'GO Battle League': 'GO對戰聯盟',
+        'Primal Reversion': '原始回歸', 'Primal Raid': '原始團體戰', 'Mega Evolve': '超級進化',
+        'Mega Raid': '超級團體戰', 'Routes': '路線', 'Route': '路線',
+        'Zygarde Cell': '基格爾德・細胞', 'Mateo': 'マテオ', 'Max Move': '極巨招式',
+        'Max Particles': '究極能量', 'Max Battle': '極巨化對戰', 'Shadow Raids': '暗影團體戰',
+        'Shadow Raid': '暗影團體戰', 'Party Challenges': '小隊挑戰',
+        'Diamond Badge': '鑽石徽章', 'Pearl Badge': '珍珠徽章','Super Rocket Radar':'超級火箭隊雷達','Max Revive': '活力塊','Rocket Radar': '火箭隊雷達','Upgrade': '升級資料',
+        'Mossy':'香草', 'Glacial':'冰寒', 'Magnetic':'磁鐵', 'Rainy':'雨露','Sticker': '貼圖', 'and': '和','Premium Battle Pass': '特級對戰入場券','Pose' : '姿勢',
+        'Hyper Potion':'厲害傷藥','Super Potion':'好傷藥','Max Potion':'全滿藥','Potion':'傷藥','Mega Energy':'超級能量','Mysterious Component':'神秘零件',
+        'Meteorite': '隕石','Poffin': '寶芬','Apex Shadow':'暗影至尊','Shadow':'暗影','Dynamax':'極巨化','Nanab berry': '蕉香果','Nanab Berry': '蕉香果',
+        'Max Particle Pack':'極巨粒子組合','Max Particle':'極巨粒子','Crowned Sword Energy':'劍王能量','Crowned Shield Energy':'盾王能量','Max Mushroom': '極巨菇菇',
+        'Blaze Fusion Energy':"火焰能量",'Volt Fusion Energy':'電壓能量','Poke ball':'精靈球','Flabébé':'花蓓蓓','Origin Dialga':'起源帝牙盧卡','Origin Palkia':'起源帕路奇亞',
+        'Origin Giratina':'起源騎拉帝納','GreatBall':'超級球','Primal Energy':'原始能量','Master Ball':'大師球','star Piece':'星星碎片',
+        'Solar Fusion Energy':'太陽能量','Lunar Fusion Energy':'月亮能量',
+}
+
+
+# 寶可夢形態（scrape_eggs / scrape_boss 原本各有一份，這裡是兩份的聯集）
+FORM_TRANSLATIONS = {
+    'Alolan': '阿羅拉', 'Galarian': '伽勒爾', 'Hisuian': '洗翠', 'Origin': '起源',
+    'Altered': '別種', 'Attack': '攻擊', 'Defense': '防禦', 'Speed': '速度',
+    'Sunny': '太陽', 'Rainy': '雨水', 'Snowy': '雪雲', 'Overcast': '陰天',
+    'Incarnate': '化身', 'Therian': '靈獸', 'Black': '闇黑', 'White': '焰白',
+    'Plant': '草木', 'Sandy': '砂土', 'Trash': '垃圾', 'Confined': '懲戒', 'Unbound': '解放',
+    'Aria': '歌聲', 'Pirouette': '舞步', 'Fan': '電風扇', 'Frost': '結冰', 'Heat': '加熱', 'Mow': '割草', 'Wash': '清洗',
+    'Dusk': '黃昏', 'Midday': '白晝', 'Midnight': '黑夜', 'School': '魚群', 'Solo': '單獨', 'Dawn Wings': '日蝕奈克洛茲瑪', 'Ultra': '究極',
+    'Hero': '百戰勇者', 'White Striped': '白條紋', 'Mega': '超級', 'Primal': '原始', "Farfetch'd": "大蔥鸭",
+    'Shadow': '暗影',
+    'Male': '雄性', 'Female': '雌性' # 處理像 Indeedee (Male/Female) 的情況
+}
+
+# ==================== 官方在地化文本（主要翻譯來源）====================
+# 一勞永逸的關鍵：Pokémon GO 遊戲本身就有官方繁中翻譯。
+# PokeMiners 每日 dump 遊戲文字資源，這裡下載「英文 ↔ 繁體中文」對照，
+# 自動翻譯任務句型、道具與寶可夢名稱：
+#   - 精確對照：沒有佔位符的字串（道具名、寶可夢名、單數任務句）
+#   - 句型模板：帶 {0} 佔位符的任務句（如 "Catch {0} Pokémon" → "捕捉 {0} 隻寶可夢"）
+# 【優先順序】官方文本優先；上方的手動字典只在官方查不到時後援
+# （例如 LeekDuck 自創的造型寶可夢描述名）。
+# 兩邊都查不到的字串會寫入 scripts/untranslated_report.json 供人工檢查。
+
+# 下載、建表、快照與 official_translate() 在 translation_db.py。
+
+_UNTRANSLATED = set()
+
+def record_untranslated(text):
+    _UNTRANSLATED.add(text)
+    translation_cache.note_untranslated(text)
+    return text
+
+# 組合式翻譯規則：官方文本沒有的「參數化句型」（活動限定字串常見），
+# 把屬性/地區/寶可夢名當參數代換，一條規則涵蓋一整族句子。
+POKEMON_TYPES_ZH = {
+    'Normal': '一般', 'Fire': '火', 'Water': '水', 'Grass': '草', 'Electric': '電',
+    'Ice': '冰', 'Fighting': '格鬥', 'Poison': '毒', 'Ground': '地面', 'Flying': '飛行',
+    'Psychic': '超能力', 'Bug': '蟲', 'Rock': '岩石', 'Ghost': '幽靈', 'Dragon': '龍',
+    'Dark': '惡', 'Steel': '鋼', 'Fairy': '妖精',
+}
+REGIONS_ZH = {
+    'Kanto': '關都', 'Johto': '城都', 'Hoenn': '豐緣', 'Sinnoh': '神奧', 'Unova': '合眾',
+    'Kalos': '卡洛斯', 'Alola': '阿羅拉', 'Galar': '伽勒爾', 'Hisui': '洗翠', 'Paldea': '帕底亞',
+}
+CITIES_ZH = {
+    'Amsterdam': '阿姆斯特丹', 'Bangkok': '曼谷', 'Buenos Aires': '布宜諾斯艾利斯',
+    'Cancun': '坎昆', 'Miami': '邁阿密', 'Sydney': '雪梨', 'Valencia': '瓦倫西亞',
+    'Vancouver': '溫哥華', 'Tokyo': '東京', 'Chicago': '芝加哥', 'Copenhagen': '哥本哈根',
+    'Nagasaki': '長崎', 'Taipei': '台北', 'New Taipei City': '新北', 'Seoul': '首爾',
+    'Barcelona': '巴塞隆納', 'Mexico City': '墨西哥城', 'Singapore': '新加坡',
+}
+
+class Rule(NamedTuple):
+    name: str                # 報告裡的名字
+    key: Optional[str]       # 字串的第一個（或最後一個）字 casefold 後要等於它才試；None = 每次都試
+    regex: re.Pattern        # 預先編譯
+    build: Callable          # (match, *ctx) → 譯文；回傳 None = 這條不算，繼續試下一條
+
+class RuleTable:
+    """依序試的一串翻譯規則（第一條翻得出來的勝出），改成宣告式的表。
+
+    每條規則的正則都以固定的英文字開頭（或結尾），輸入的那個字對不上就不可能配到，
+    所以先取輸入的第一個（或最後一個）字查表，只試 key 相同和 key 為 None 的規則，順序照表上的。
+    key 用 casefold 比，IGNORECASE 的正則配得上的輸入，casefold 後也一定相同。
+    每條規則記錄試了幾次、命中幾次、花了多少時間（write_rule_report() 匯出）。"""
+
+    def __init__(self, name, rules, last_word=False):
+        self.name, self.rules, self.last_word = name, list(rules), last_word
+        self.reset()
+        self._always = tuple(i for i, r in enumerate(self.rules) if r.key is None)
+        self._by_key = {}
+        for i, r in enumerate(self.rules):
+            if r.key is not None:
+                self._by_key.setdefault(r.key, []).append(i)
+        self._by_key = {k: tuple(sorted(v + list(self._always))) for k, v in self._by_key.items()}
+        RULE_TABLES.append(self)
+
+    def candidates(self, text):
+        words = text.split()
+        if not words:
+            return self._always
+        return self._by_key.get((words[-1] if self.last_word else words[0]).casefold(), self._always)
+
+    def apply(self, text, *ctx):
+        """第一條翻得出來的規則的譯文；都不行回傳 None。"""
+        for i in self.candidates(text):
+            t0 = time.perf_counter_ns()
+            m = self.rules[i].regex.match(text)
+            out = self.rules[i].build(m, *ctx) if m else None
+            self.ns[i] += time.perf_counter_ns() - t0
+            self.tried[i] += 1
+            if out is not None:
+                self.hits[i] += 1
+                return out
+        return None
+
+    def reset(self):
+        self.tried = [0] * len(self.rules)
+        self.hits = [0] * len(self.rules)
+        self.ns = [0] * len(self.rules)
+
+    def report(self):
+        return {r.name: {"key": r.key, "tried": self.tried[i], "hits": self.hits[i], "ns": self.ns[i]}
+                for i, r in enumerate(self.rules)}
+
+RULE_TABLES = []   # 所有 RuleTable（建立時自動登記），write_rule_report() 用
+
+def write_rule_report(path):
+    """各規則的試用 / 命中次數與耗時，累加進 path（JSON）；表上已經沒有的規則會被拿掉。
+    只算實際翻譯的次數 —— 命中 translation_cache 的字串不會跑到規則。寫完計數歸零，重複呼叫不會重複累加。"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            old = json.load(f)
+    except (OSError, ValueError):
+        old = {}
+    out = {}
+    for table in RULE_TABLES:
+        prev = old.get(table.name, {})
+        rows = {}
+        for name, cur in table.report().items():
+            row = {k: cur[k] + prev.get(name, {}).get(k, 0) for k in ("tried", "hits", "ns")}
+            row["hit_rate"] = round(row["hits"] / row["tried"], 4) if row["tried"] else None
+            row["us_per_try"] = round(row["ns"] / row["tried"] / 1e3, 2) if row["tried"] else None
+            rows[name] = {"key": cur["key"], **row}
+        out[table.name] = rows
+    for name, rows in old.items():
+        if name not in out:
+            out[name] = rows   # 這次沒載入的表（例如另一支爬蟲的）原樣保留
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=1, ensure_ascii=False)
+    for table in RULE_TABLES:
+        table.reset()
+
+def _count_zh(s):
+    return '1' if s.lower() in ('a', 'an') else s
+
+def _curveball(m):
+    count_part = m.group(1) or '1 '
+    throw_type = m.group(2) or ''
+    is_curveball = m.group(3) is not None
+    in_a_row = 'in a row' in m.string
+
+    count = count_part.replace('an ', '1 ').replace('a ', '1 ').strip()
+    translated_throw_type = throw_type.strip()
+    if is_curveball:
+        translated_throw_type = f"{translated_throw_type} 曲球".strip()
+
+    if in_a_row:
+        return f"連續投出 {count} 次 {translated_throw_type}".replace('  ', ' ').strip()
+    return f"投出 {count} 次 {translated_throw_type}".replace('  ', ' ').strip()
+
+def _type_rule(fmt, type_group):
+    """屬性名在第 type_group 組的規則：屬性認得才成立"""
+    def build(m):
+        t = POKEMON_TYPES_ZH.get(m.group(type_group).capitalize())
+        return fmt.format(*m.groups(), t=t) if t else None
+    return build
+
+def _catch_named(m):
+    name = official_translate(m.group(2))
+    return f'捕捉 {_count_zh(m.group(1))} 隻{name}' if name else None
+
+def _catch_region(m):
+    r = REGIONS_ZH.get(m.group(2).capitalize())
+    return f'捕捉 {_count_zh(m.group(1))} 隻最初發現於{r}地區的寶可夢' if r else None
+
+def _city_rule(fmt):
+    def build(m):
+        return fmt.format(CITIES_ZH[m.group(1)]) if m.group(1) in CITIES_ZH else None
+    return build
+
+_I = re.IGNORECASE
+TASK_RULES = RuleTable("task", [
+    # 投球任務（Nice / Great / Excellent、曲球、連續）
+    Rule("throws", "make", re.compile(r'^Make (an? |\d+ )?(Nice|Great|Excellent)? ?(Curveball )?Throws(?: in a row)?$'),
+         _curveball),
+    Rule("hearts_type_buddy", "earn", re.compile(r'^Earn (\d+) hearts? with an? ([A-Za-z]+)-type buddy$', _I),
+         _type_rule('將{t}屬性的寶可夢設成夥伴，並和牠獲得{0}顆心心', 2)),
+    Rule("catch_region", "catch",
+         re.compile(r'^Catch (an?|\d+) Pokémon originally discovered in the ([A-Za-z]+) region$', _I), _catch_region),
+    # "Catch a Scatterbug" / "Catch 3 Scatterbug"：後半段翻得出寶可夢名才成立
+    Rule("catch_named", "catch", re.compile(r'^Catch (an?|\d+) (.+)$'), _catch_named),
+    # "Explore 2km"（官方模板要求 km 前有空格，這裡容忍無空格寫法）
+    Rule("explore_km", "explore", re.compile(r'^Explore (\d+)\s*km$', _I), lambda m: f'探索 {m.group(1)} 公里'),
+    Rule("charged_attack_type", "use", re.compile(r'^Use an? ([A-Za-z]+)-type Charged Attack in (\d+) battles?$', _I),
+         _type_rule('在 {1} 場對戰中使出{t}屬性的特殊招式', 1)),
+    Rule("candy_type_buddy", "earn", re.compile(r'^Earn a Candy exploring with an? ([A-Za-z]+) type as your buddy$', _I),
+         _type_rule('和{t}屬性的夥伴寶可夢一起走路獲得 1 顆糖果', 1)),
+    Rule("power_up_type", "power", re.compile(r'^Power up ([A-Za-z]+) Pokémon (\d+) times$', _I),
+         _type_rule('強化{t}屬性的寶可夢 {1} 次', 1)),
+    # City Safari 城市限定任務
+    Rule("spin_city", "spin", re.compile(r'^Spin an? PokéStops? or Gyms? in (.+)$', _I),
+         _city_rule('在{}轉動補給站或道館的轉盤')),
+    Rule("snapshot_eevee_city", "take", re.compile(r'^Take a Snapshot of your Eevee in (.+)$', _I),
+         _city_rule('在{}為你的伊布拍攝 1 張 GO Snapshot 照片')),
+])
+
+def compose_translate(task_text):
+    """規則組合翻譯（TASK_RULES），翻不出來回傳 None"""
+    return TASK_RULES.apply(task_text)
+
+# ==================== 官方在地化文本 END ====================
+
+@functools.lru_cache(maxsize=None)
+def _load_json_map(filename):
+    """通用函式，用於載入 JSON 格式的翻譯檔"""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"📄 提示：找不到可選的翻譯檔 {filename}。")
+        return {}
+    except json.JSONDecodeError:
+        print(f"❌ 錯誤：{filename} 格式有誤。")
+        return {}
+
+def load_json_map(filename):
+    """載入 JSON 翻譯檔；同一個檔一次執行只讀一次，大家拿到的是同一個 dict（唯讀，別改它）"""
+    return _load_json_map(os.path.abspath(filename))
+
+@translation_cache.memoize("name", record_untranslated)
+def _translate_name(eng_name, name_map, form_map):
+    """translate_name() 的本體 → (中文, 來源)"""
+    # 官方文本優先（涵蓋所有寶可夢的官方繁中名）
+    official = official_translate(eng_name)
+    if official:
+        return official, "official"
+
+    # 暗影，例如 "Shadow Palkia"、"Shadow Necrozma (Dusk Mane)"
+    # 先剝掉 "Shadow " 前綴，把剩下的部分照常翻譯，再冠上「暗影」
+    if eng_name.startswith("Shadow "):
+        rest, source = _translate_name(eng_name[len("Shadow "):], name_map, form_map)
+        shadow = form_map.get('Shadow') or FORM_TRANSLATIONS['Shadow']
+        return f"{shadow} {rest}", "rule" if source != "missing" else source
+
+    # 超級進化 / 原始回歸，例如 "Mega Charizard X"
+    if eng_name.startswith("Mega ") or eng_name.startswith("Primal "):
+        form_type, base_name = eng_name.split(" ", 1)
+        form = form_map.get(form_type) or FORM_TRANSLATIONS[form_type]
+        base = official_translate(base_name) or name_map.get(base_name)
+        if base:
+            return f"{form} {base}", "rule"
+        return f"{form} {record_untranslated(base_name)}", "missing"   # 至少把「超級」翻出來
+
+    form_in_parentheses_match = re.match(r'(.+?)\s*\((.+?)\)', eng_name)
+    if form_in_parentheses_match:
+        base_name, form_name = form_in_parentheses_match.groups()
+        base_name, form_name = base_name.strip(), form_name.strip()
+        if base_name in name_map and form_name in form_map:
+            return f"{name_map[base_name]} ({form_map[form_name]})", "rule"
+
+    parts = eng_name.split()
+    if len(parts) == 2 and parts[0] == 'Spinda' and parts[1].isdigit():
+        return f"晃晃斑 {parts[1]} 號", "rule"
+
+    if len(parts) > 1 and parts[0] in form_map:
+        form_name = parts[0]
+        base_name = " ".join(parts[1:])
+        if base_name in name_map:
+            return f"{form_map[form_name]} {name_map[base_name]}", "rule"
+
+    if eng_name in name_map:
+        return name_map[eng_name], "manual"
+
+    return record_untranslated(eng_name), "missing"
+
+def translate_name(eng_name, name_map, form_map):
+    """將寶可夢英文名稱翻譯成中文：官方文本優先，暗影 / 超級進化 / 形態規則與手動字典後援"""
+    if not eng_name:
+        return eng_name
+    return _translate_name(eng_name, name_map, form_map)[0]
+
+_PREFIX_RES = {}   # id(字典) → (鍵數, 正則)
+
+def _item_prefix_re(general_map):
+    """字典全部鍵組成的前綴正則，每個字典只建一次（鍵數變了才重建）。
+    鍵依長度降序排進 alternation，re 取第一個配得上的分支 → 就是最長的那個鍵；
+    等長的兩個鍵不可能同時是同一個字串的開頭，所以結果與逐一 startswith 完全相同。"""
+    got = _PREFIX_RES.get(id(general_map))
+    if got and got[0] == len(general_map):
+        return got[1]
+    keys = sorted(general_map, key=len, reverse=True)
+    regex = re.compile("|".join(map(re.escape, keys)) or "(?!)")
+    _PREFIX_RES[id(general_map)] = (len(general_map), regex)
+    return regex
+
+@translation_cache.memoize("item", record_untranslated)
+def _translate_item_resource(eng_name, general_map, pokemon_map):
+    """translate_item_resource() 的本體 → (中文, 來源)"""
+    # 官方文本優先：先試完整字串，再試剝掉尾端數量（例如 " ×1500"）
+    official = official_translate(eng_name)
+    if official:
+        return official, "official"
+    qty_match = re.match(r"^(.*?)\s*([×x]\s*[\d,]+)$", eng_name)
+    if qty_match:
+        base, qty = qty_match.groups()
+        official = official_translate(base.strip())
+        if official:
+            return f"{official} {qty}", "official"
+
+    # 超級能量組合字，例如 "Venusaur Mega Energy"（官方沒有這種合成字串）
+    mega_energy_match = re.match(r'(.+?)\s+Mega Energy', eng_name)
+    if mega_energy_match:
+        pokemon_name = mega_energy_match.group(1).strip()
+        translated_pokemon = official_translate(pokemon_name) or pokemon_map.get(pokemon_name, pokemon_name)
+        translated_mega_energy = general_map.get('Mega Energy', 'Mega Energy')
+        return f"{translated_pokemon} {translated_mega_energy}", "rule"
+
+    # 找字典裡「是英文名開頭」的最長鍵（道具名），
+    # 例如，確保 "Golden Razz Berry" 比 "Razz Berry" 先被匹配
+    m = _item_prefix_re(general_map).match(eng_name)
+    if m:
+        item_key = m.group()
+        # 取得道具名稱後面的剩餘部分（通常是數量，例如 " ×1500"）
+        remaining_part = eng_name[len(item_key):].strip()
+
+        # 將翻譯後的道具名稱與剩餘的數量部分重新組合
+        return f"{general_map[item_key]} {remaining_part}".strip(), "manual"
+
+    # 官方與手動字典都查不到，記錄下來供人工檢查
+    return record_untranslated(eng_name), "missing"
+
+def translate_item_resource(eng_name, general_map, pokemon_map):
+    """翻譯道具、資源：官方文本優先，手動字典後援。"""
+    return _translate_item_resource(eng_name, general_map, pokemon_map)[0]
+
+@translation_cache.memoize("task", record_untranslated)
+def _translate_task_description(task_text, task_map):
+    """translate_task_description() 的本體 → (中文, 來源)"""
+    official = official_translate(task_text)
+    if official:
+        return official, "official"
+
+    if task_text in task_map:
+        return task_map[task_text], "manual"
+
+    composed = compose_translate(task_text)
+    if composed:
+        return composed, "rule"
+
+    return record_untranslated(task_text), "missing"
+
+def translate_task_description(task_text, task_map):
+    """翻譯田野調查任務：官方句型模板優先，手動字典與規則後援。"""
+    return _translate_task_description(task_text, task_map)[0]
+
+# ==================== 翻譯資料區塊 END ======================
+
+# translate_many() 的種類 → (本體, 預設字典)
+_KINDS = {
+    "name": (_translate_name, lambda: (load_json_map(POKEMON_MAP), FORM_TRANSLATIONS)),
+    "item": (_translate_item_resource, lambda: (GENERAL_TRANSLATIONS, load_json_map(POKEMON_MAP))),
+    "task": (_translate_task_description, lambda: (load_json_map(TASK_MAP),)),
+}
+
+def translate_many(kind, strings, maps=None):
+    """一批字串一起翻 → {英文: (中文, 來源)}（依第一次出現的順序，重複的只翻一次）。
+
+    kind 是 name / item / task；maps 不給就用 _KINDS 的預設字典。官方對照庫還沒載入的話先載入。"""
+    fn, default_maps = _KINDS[kind]
+    maps = tuple(maps) if maps is not None else default_maps()
+    if translation_db.DB_KEY is None:
+        build_official_translation_db()
+    out = {}
+    for s in strings:
+        if s not in out:
+            out[s] = fn(s, *maps) if s else (s, "missing")
+    return out
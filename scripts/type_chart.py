@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""屬性相剋表:18×18 單屬性倍率矩陣,加上全部 171 種單/雙屬性防守方的弱點、抗性預先算好。
+
+原本 build_cp_static.py 的 matchups() 每頁都把 18 個攻擊屬性 × 防守屬性各算一次;
+全部頁面產生下來,同樣的 171 種屬性組合被重複算了上千次。這裡在 import 時一次算完,
+matchups() / weathers_of() 只剩查表。
+
+同一份表也輸出成 data/type_chart.json 給前端用(格式見 to_json()):
+    python scripts/type_chart.py
+"""
+import itertools, json, math, os
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT = os.path.join(ROOT, "data", "type_chart.json")
+
+TYPE_ZH = {"normal": "一般", "fire": "火", "water": "水", "electric": "電", "grass": "草", "ice": "冰",
+           "fighting": "格鬥", "poison": "毒", "ground": "地面", "flying": "飛行", "psychic": "超能力",
+           "bug": "蟲", "rock": "岩石", "ghost": "幽靈", "dragon": "龍", "dark": "惡", "steel": "鋼", "fairy": "妖精"}
+TYPE_COLOR = {"normal": "#9099a1", "fire": "#ff9d55", "water": "#4d90d5", "electric": "#f4d23c",
+              "grass": "#63bc5a", "ice": "#73cec0", "fighting": "#ce4069", "poison": "#ab6ac8",
+              "ground": "#d97845", "flying": "#8fa8dd", "psychic": "#f97176", "bug": "#90c12c",
+              "rock": "#c7b78b", "ghost": "#5269ad", "dragon": "#0b6dc3", "dark": "#5a5465",
+              "steel": "#5a8ea1", "fairy": "#ec8fe6"}
+# 每個「防守屬性」被哪些屬性 剋 / 抵抗 / 免疫（標準第六世代相剋表；PoGo 免疫＝×0.390625）
+TYPE_DEF = {
+    "normal":   (["fighting"], [], ["ghost"]),
+    "fire":     (["water", "ground", "rock"], ["fire", "grass", "ice", "bug", "steel", "fairy"], []),
+    "water":    (["electric", "grass"], ["fire", "water", "ice", "steel"], []),
+    "electric": (["ground"], ["electric", "flying", "steel"], []),
+    "grass":    (["fire", "ice", "poison", "flying", "bug"], ["water", "electric", "grass", "ground"], []),
+    "ice":      (["fire", "fighting", "rock", "steel"], ["ice"], []),
+    "fighting": (["flying", "psychic", "fairy"], ["bug", "rock", "dark"], []),
+    "poison":   (["ground", "psychic"], ["grass", "fighting", "poison", "bug", "fairy"], []),
+    "ground":   (["water", "grass", "ice"], ["poison", "rock"], ["electric"]),
+    "flying":   (["electric", "ice", "rock"], ["grass", "fighting", "bug"], ["ground"]),
+    "psychic":  (["bug", "ghost", "dark"], ["fighting", "psychic"], []),
+    "bug":      (["fire", "flying", "rock"], ["grass", "fighting", "ground"], []),
+    "rock":     (["water", "grass", "fighting", "ground", "steel"], ["normal", "fire", "poison", "flying"], []),
+    "ghost":    (["ghost", "dark"], ["poison", "bug"], ["normal", "fighting"]),
+    "dragon":   (["ice", "dragon", "fairy"], ["fire", "water", "grass", "electric"], []),
+    "dark":     (["fighting", "bug", "fairy"], ["ghost", "dark"], ["psychic"]),
+    "steel":    (["fire", "fighting", "ground"], ["normal", "grass", "ice", "flying", "psychic", "bug", "rock", "dragon", "steel", "fairy"], ["poison"]),
+    "fairy":    (["poison", "steel"], ["fighting", "bug", "dark"], ["dragon"]),
+}
+WEATHER_ZH = {"clear": "晴朗", "rain": "下雨", "partlycloudy": "多雲", "cloudy": "陰天",
+              "windy": "刮風", "snow": "下雪", "fog": "濃霧"}
+TYPE_WEATHER = {"grass": "clear", "fire": "clear", "ground": "clear", "water": "rain", "electric": "rain",
+                "bug": "rain", "normal": "partlycloudy", "rock": "partlycloudy", "fairy": "cloudy",
+                "fighting": "cloudy", "poison": "cloudy", "dragon": "windy", "flying": "windy",
+                "psychic": "windy", "ice": "snow", "steel": "snow", "dark": "fog", "ghost": "fog"}
+
+TYPES = tuple(TYPE_DEF)
+TYPE_INDEX = {t: i for i, t in enumerate(TYPES)}
+
+
+def _single_mult(atk, deft):
+    weak, resist, immune = TYPE_DEF[deft]
+    if atk in weak:   return 1.6
+    if atk in resist: return 0.625
+    if atk in immune: return 0.390625
+    return 1.0
+
+
+# MATRIX[攻擊屬性, 防守屬性] = 單屬性倍率
+MATRIX = np.array([[_single_mult(a, d) for d in TYPES] for a in TYPES])
+
+
+def _fmt_mult(m):
+    q = math.floor(m * 100 + 0.5) / 100   # 四捨五入到小數兩位（0.625→0.63，不用銀行家捨入）
+    return "×" + f"{q:.2f}".rstrip("0").rstrip(".")
+
+
+def _key(types):
+    """防守屬性組合的 key:依 TYPES 順序排好的 tuple,雙屬性前後順序不影響倍率。"""
+    return tuple(sorted(types, key=TYPE_INDEX.__getitem__))
+
+
+def _defender(types):
+    """一種防守屬性組合 → 各攻擊屬性的倍率、弱點與抗性(排序規則同原本的 matchups())。"""
+    mult = [1.0] * len(TYPES)
+    for dt in types:
+        col = MATRIX[:, TYPE_INDEX[dt]]
+        mult = [m * float(c) for m, c in zip(mult, col)]
+    weak, resist = [], []
+    for atk, m in zip(TYPES, mult):
+        if m > 1.0001:
+            weak.append((atk, m))
+        elif m < 0.9999:
+            resist.append((atk, m))
+    weak.sort(key=lambda x: -x[1])
+    resist.sort(key=lambda x: x[1])
+    return {"mult": mult,
+            "weak": [(TYPE_ZH[t], _fmt_mult(m), m >= 2.5) for t, m in weak],
+            "resist": [(TYPE_ZH[t], _fmt_mult(m)) for t, m in resist],
+            "weak_types": [t for t, _ in weak], "resist_types": [t for t, _ in resist]}
+
+
+# 全部 18 種單屬性 + 153 種雙屬性 = 171 種防守方
+DEFENDERS = {_key(c): _defender(c)
+             for n in (1, 2) for c in itertools.combinations(TYPES, n)}
+
+
+def _weathers(types):
+    seen, out = set(), []
+    for t in types:
+        w = TYPE_WEATHER.get(t)
+        if w and w not in seen:
+            seen.add(w); out.append(WEATHER_ZH[w])
+    return "、".join(out)
+
+
+# 天氣加成的順序跟著屬性的列出順序走(「晴朗、下雨」與「下雨、晴朗」不同),所以 key 保留順序
+WEATHERS = {c: _weathers(c) for n in (1, 2) for c in itertools.permutations(TYPES, n)}
+
+
+def matchups(types):
+    """回傳 (weaknesses, resistances)：weak=[(zh, mult_str, is_double)]、resist=[(zh, mult_str)]。"""
+    d = DEFENDERS[_key(types)]
+    return d["weak"], d["resist"]
+
+
+def weathers_of(types):
+    return WEATHERS.get(tuple(types)) or _weathers(types)
+
+
+def to_json():
+    """前端用的 JSON:
+    {"types": [18 個英文代號], "zh": {代號: 中文}, "weather": {代號: 天氣},
+     "matrix": [[攻擊×防守 單屬性倍率]],
+     "defenders": {"dragon/flying": {"mult": [18 個倍率], "weak": [...代號], "resist": [...代號], "double": [...代號]}}}
+    defenders 的 key 是依 types 順序排好、用 / 連接的防守屬性;weak / resist 已依倍率排序。"""
+    return {
+        "types": list(TYPES), "zh": TYPE_ZH, "weather": TYPE_WEATHER,
+        "matrix": MATRIX.tolist(),
+        "defenders": {"/".join(k): {"mult": d["mult"], "weak": d["weak_types"], "resist": d["resist_types"],
+                                    "double": [t for t in d["weak_types"] if d["mult"][TYPE_INDEX[t]] >= 2.5]}
+                      for k, d in DEFENDERS.items()},
+    }
+
+
+def main():
+    with open(OUT, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+    print(f"已寫入 {os.path.relpath(OUT, ROOT)}（{len(DEFENDERS)} 種防守屬性組合）")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,10 @@
 import json, re, os, sys, time, urllib.request, urllib.parse
 import cloudscraper
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from sprite_index import parse_sprite   # PokeMiners 圖示檔名規則,與 scripts/ 的產生器共用
+import game_master                      # GAME_MASTER 串流解析,與 scripts/refresh_cp_data.py 共用
+
 try:                                    # Windows 主控台預設 cp950,吐中文/符號會炸
     sys.stdout.reconfigure(encoding="utf-8"); sys.stderr.reconfigure(encoding="utf-8")
 except Exception:
@@ -50,39 +54,19 @@ for code, fname in LANG_FILES.items():
 name2dex = {v.upper().replace(" ", "_"): d for d, v in en_names.items()}
 
 # ---- GM:可否極巨化 + 哪些 form 其實是「造型」----
-gm = get_json("https://raw.githubusercontent.com/PokeMiners/game_masters/master/latest/latest.json")
+gm = game_master.fetch(headers=UA, timeout=90)
 lego_dex = set()
-gm_tradable = {}    # dex → {form 代碼(基本型為 None): True/False/None};None=GM 沒講,見 _trad()/tradable()
+gm_tradable = {}    # dex → {form 代碼(基本型為 None): True/False/None};None=GM 沒講,見 game_master._tradable()/tradable()
 # 近年的造型(WCS_2024、GOTOUR_2026_A、ROCK_STAR…)在檔名裡是寫成 form 而非 costume,
 # 只有 GAME_MASTER 的 formSettings.isCostume 分得出來。抓下來,parse() 時把它們歸回 costume。
 gm_costume = {}; gm_real = {}
 
-def _trad(ps):
-    """單一型態的 isTradable。GM 對某些型態根本沒寫這個欄位,不能一律當成 False ——
-    王之劍蒼響 / 王之盾藏瑪然特就是這樣(欄位缺席,但 isTransferable 是 true),實際遊戲裡可以交換。
-    真正鎖住的合體型態(黑白酋雷姆、基格爾德、奈克洛茲瑪合體、無極汰那)是「兩個欄位一起缺席」。
-    → 缺席但可轉移 = GM 只是沒重寫,回 None 讓 tradable() 退回該 dex 基本型的值。"""
-    t = ps.get("isTradable")
-    if t is not None: return bool(t)
-    return None if ps.get("isTransferable") else False
-
-for e in gm:
-    tid = e.get("templateId", "")
-    m = re.match(r"V(\d+)_POKEMON_", tid)
-    ps = e.get("data", {}).get("pokemonSettings")
-    if m and ps:
-        dex = int(m.group(1))
-        if ps.get("pokemonClass") in ("POKEMON_CLASS_LEGENDARY", "POKEMON_CLASS_MYTHIC", "POKEMON_CLASS_ULTRA_BEAST"): lego_dex.add(dex)
-        sp, f = ps.get("pokemonId", ""), ps.get("form") or ""
-        gm_tradable.setdefault(dex, {})[f[len(sp) + 1:] if f.startswith(sp + "_") else (f or None)] = _trad(ps)
-    fm = re.fullmatch(r"FORMS_V(\d+)_POKEMON_(.+)", tid)
-    fs = e.get("data", {}).get("formSettings")
-    if fm and fs:
-        dex, species = int(fm.group(1)), fs.get("pokemon", "")
-        for f in fs.get("forms", []):
-            code = f["form"]
-            if code.startswith(species + "_"): code = code[len(species) + 1:]
-            (gm_costume if f.get("isCostume") else gm_real).setdefault(dex, set()).add(code)
+for rec in gm.pokemon:
+    if rec["class"] in ("POKEMON_CLASS_LEGENDARY", "POKEMON_CLASS_MYTHIC", "POKEMON_CLASS_ULTRA_BEAST"): lego_dex.add(rec["dex"])
+    gm_tradable.setdefault(rec["dex"], {})[rec["form"]] = rec["tradable"]
+for rec in gm.forms:
+    for code, costume in rec["forms"].items():
+        (gm_costume if costume else gm_real).setdefault(rec["dex"], set()).add(code)
 
 # 可極巨化名單:用 Bulbapedia「Dynamax (GO)」實際開放清單。
 # (GM 的 breadTierGroup 幾乎每隻都有,是預設層級,不代表真的能極巨化,不可用)
@@ -98,7 +82,7 @@ except Exception as ex:
 # ---- 可否交換(GM pokemonSettings.isTradable,權威來源,不用自己維護名單)----
 # 不可交換的:幻之寶可夢(夢幻→薩戮德;美錄坦/美錄梅塔/桃歹郎是例外,GM 標 true)
 #   以及合體/究極型態:黑白酋雷姆、基格爾德(全型態)、奈克洛茲瑪合體、無極汰那。
-#   王之劍/王之盾不在此列(GM 只是漏寫 isTradable,見 _trad())。
+#   王之劍/王之盾不在此列(GM 只是漏寫 isTradable,見 game_master._tradable())。
 # 交換清單放這些等於讓人做出無效的清單 → 與 Mega/Primal 同政策,sprite 與背卡一律不列。
 # 注意:實際的排除放在最後(見「拿掉不可交換的變體」),不能在這裡就從 pokemon 裡刪掉——
 #   背卡的型態解析要靠完整的 form 清單才對得到「0646B → BLACK」,先刪會讓它退回 wiki 原圖、
@@ -113,16 +97,11 @@ def tradable(dex, form=None):
 
 # ---- sprite 變體(本機 PokeMiners)----
 def parse(fn):
-    toks = fn[:-len(".icon.png")].split(".")
-    m = re.fullmatch(r"pm(\d+)", toks[0])
-    if not m: return None
-    v = {"dex": int(m.group(1)), "form": None, "costume": None, "female": False, "shiny": False, "gmax": False}
-    for t in toks[1:]:
-        if t == "s": v["shiny"] = True
-        elif t == "g2": v["female"] = True
-        elif t == "fGIGANTAMAX": v["gmax"] = True
-        elif t.startswith("f"): v["form"] = t[1:]
-        elif t.startswith("c"): v["costume"] = t[1:]
+    s = parse_sprite(fn)
+    if not s: return None
+    gmax = s["form"] == "GIGANTAMAX"
+    v = {"dex": s["dex"], "form": None if gmax else s["form"], "costume": s["costume"],
+         "female": s["gender"] == 2, "shiny": s["shiny"], "gmax": gmax}
     # 檔名寫成 form、但 GM 標了 isCostume 的(WCS_2024、GOTOUR_2026_A…)→ 歸回 costume
     if v["form"] and v["form"] in gm_costume.get(v["dex"], ()):
         v["costume"], v["form"] = v["form"], None